@@ -0,0 +1,11 @@
+"""
+This module contains the EventReducer, which applies events to messages and state.
+"""
+
+from ag_ui.apply.untruncate import untruncate_json
+from ag_ui.apply.reducer import EventReducer
+
+__all__ = [
+    "untruncate_json",
+    "EventReducer",
+]
@@ -0,0 +1,252 @@
+"""
+This module contains the EventReducer class, a port of `defaultApplyEvents`
+from `typescript-sdk/packages/client/src/apply/default.ts`.
+"""
+
+import json
+import logging
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple
+
+from ag_ui.core.events import (
+    BaseEvent,
+    CustomEvent,
+    MessagesSnapshotEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    StepFinishedEvent,
+    TextMessageChunkEvent,
+    TextMessageContentEvent,
+    TextMessageStartEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.core.types import AssistantMessage, FunctionCall, Message, RunAgentInput, ToolCall
+from ag_ui.apply.untruncate import untruncate_json
+from ag_ui.state.patch import JsonPatchError
+from ag_ui.state.store import StateStore
+
+logger = logging.getLogger(__name__)
+
+
+class EventReducer:
+    """
+    Applies events to the messages and state of a run.
+
+    Text and tool call argument deltas are collected in lists and only joined
+    when the messages are read, so streaming a long answer costs time in
+    proportion to its length. Nothing is copied or emitted per event: read
+    `messages` and `state`, or call `take_update` for what changed since the
+    previous call, whenever the consumer needs them. Message objects and
+    states that were handed out are never changed afterwards.
+
+    Like the TypeScript client, `PredictState` custom events make the
+    arguments of the named tools stream into the state, until the step ends.
+    """
+
+    def __init__(self, messages: Iterable[Message] = (), state: Any = None):
+        self._messages: List[Message] = list(messages)
+        self._store = StateStore(state)
+        # message index -> content chunks not yet joined into the message
+        self._content: Dict[int, List[str]] = {}
+        # (message index, tool call index) -> argument chunks not yet joined
+        self._arguments: Dict[Tuple[int, int], List[str]] = {}
+        self._predict_state: Optional[List[Dict[str, Any]]] = None
+        self._messages_changed = False
+        self._state_changed = False
+
+    @classmethod
+    def from_input(cls, run_input: RunAgentInput) -> "EventReducer":
+        """
+        Creates a reducer that starts from the messages and state of a run's input.
+        """
+        return cls(run_input.messages, run_input.state)
+
+    @property
+    def messages(self) -> List[Message]:
+        """
+        The current messages.
+        """
+        self._join_deltas()
+        return list(self._messages)
+
+    @property
+    def state(self) -> Any:
+        """
+        The current state.
+        """
+        return self._store.state
+
+    def take_update(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns what changed since the previous call, as a dict with the keys
+        `messages` and/or `state`, or None if nothing changed.
+        """
+        update: Dict[str, Any] = {}
+        if self._messages_changed:
+            update["messages"] = self.messages
+        if self._state_changed:
+            update["state"] = self.state
+        self._messages_changed = False
+        self._state_changed = False
+        return update or None
+
+    def apply(self, event: BaseEvent) -> bool:
+        """
+        Applies an event. Returns True if it changed the messages or state.
+        Raises ValueError for chunk events, which have to be transformed into
+        start, content and end events first.
+        """
+        handler = _HANDLERS.get(type(event))
+        if handler is None:
+            if isinstance(event, (TextMessageChunkEvent, ToolCallChunkEvent)):
+                raise ValueError(f"{event.type.value} must be transformed before being applied")
+            return False
+        return handler(self, event)
+
+    def apply_all(self, events: Iterable[BaseEvent]) -> None:
+        """
+        Applies a synchronous stream of events.
+        """
+        for event in events:
+            self.apply(event)
+
+    async def apply_async(self, events: AsyncIterable[BaseEvent]) -> None:
+        """
+        Applies an asynchronous stream of events.
+        """
+        async for event in events:
+            self.apply(event)
+
+    def _on_text_message_start(self, event: TextMessageStartEvent) -> bool:
+        self._messages.append(AssistantMessage(id=event.message_id, role=event.role, content=""))
+        return self._changed_messages()
+
+    def _on_text_message_content(self, event: TextMessageContentEvent) -> bool:
+        index = len(self._messages) - 1
+        chunks = self._content.get(index)
+        if chunks is None:
+            chunks = self._content[index] = [self._messages[index].content or ""]
+        chunks.append(event.delta)
+        return self._changed_messages()
+
+    def _on_tool_call_start(self, event: ToolCallStartEvent) -> bool:
+        last = self._messages[-1] if self._messages else None
+        if (
+            event.parent_message_id
+            and isinstance(last, AssistantMessage)
+            and last.id == event.parent_message_id
+        ):
+            index = len(self._messages) - 1
+            tool_calls = list(last.tool_calls or [])
+        else:
+            last = AssistantMessage(id=event.parent_message_id or event.tool_call_id, role="assistant")
+            self._messages.append(last)
+            index = len(self._messages) - 1
+            tool_calls = []
+        tool_calls.append(ToolCall(
+            id=event.tool_call_id,
+            type="function",
+            function=FunctionCall(name=event.tool_call_name, arguments="")
+        ))
+        self._messages[index] = last.model_copy(update={"tool_calls": tool_calls})
+        return self._changed_messages()
+
+    def _on_tool_call_args(self, event: ToolCallArgsEvent) -> bool:
+        index = len(self._messages) - 1
+        tool_calls = self._messages[index].tool_calls
+        key = (index, len(tool_calls) - 1)
+        chunks = self._arguments.get(key)
+        if chunks is None:
+            chunks = self._arguments[key] = [tool_calls[-1].function.arguments]
+        chunks.append(event.delta)
+        self._changed_messages()
+
+        if self._predict_state:
+            name = tool_calls[-1].function.name
+            config = next((config for config in self._predict_state if config.get("tool") == name), None)
+            if config is not None:
+                self._predict(config, chunks)
+        return True
+
+    def _predict(self, config: Dict[str, Any], chunks: List[str]) -> None:
+        """
+        Copies the partial arguments of a tool call into the state.
+        """
+        arguments = "".join(chunks)
+        # keep the joined arguments, so the next delta does not join them again
+        chunks[:] = [arguments]
+        try:
+            value = json.loads(untruncate_json(arguments))
+        except ValueError:
+            return
+        tool_argument = config.get("tool_argument")
+        if tool_argument and isinstance(value, dict) and tool_argument in value:
+            value = value[tool_argument]
+        state = self._store.state
+        self._store.set_state({**(state if isinstance(state, dict) else {}), config["state_key"]: value})
+        self._state_changed = True
+
+    def _on_state_snapshot(self, event: StateSnapshotEvent) -> bool:
+        self._store.set_state(event.snapshot)
+        self._state_changed = True
+        return True
+
+    def _on_state_delta(self, event: StateDeltaEvent) -> bool:
+        try:
+            self._store.apply_delta(event.delta)
+        except JsonPatchError as exc:
+            logger.warning("Failed to apply state patch %s: %s", json.dumps(event.delta), exc)
+            return False
+        self._state_changed = True
+        return True
+
+    def _on_messages_snapshot(self, event: MessagesSnapshotEvent) -> bool:
+        self._messages = list(event.messages)
+        self._content.clear()
+        self._arguments.clear()
+        return self._changed_messages()
+
+    def _on_custom(self, event: CustomEvent) -> bool:
+        if event.name == "PredictState":
+            self._predict_state = event.value
+        return False
+
+    def _on_step_finished(self, event: StepFinishedEvent) -> bool:  # pylint: disable=unused-argument
+        # reset predictive state after step is finished
+        self._predict_state = None
+        return False
+
+    def _changed_messages(self) -> bool:
+        self._messages_changed = True
+        return True
+
+    def _join_deltas(self) -> None:
+        """
+        Joins the collected deltas into new message objects.
+        """
+        for index, chunks in self._content.items():
+            self._messages[index] = self._messages[index].model_copy(update={"content": "".join(chunks)})
+        self._content.clear()
+
+        for (index, call_index), chunks in self._arguments.items():
+            message = self._messages[index]
+            tool_calls = list(message.tool_calls)
+            call = tool_calls[call_index]
+            function = call.function.model_copy(update={"arguments": "".join(chunks)})
+            tool_calls[call_index] = call.model_copy(update={"function": function})
+            self._messages[index] = message.model_copy(update={"tool_calls": tool_calls})
+        self._arguments.clear()
+
+
+_HANDLERS = {
+    TextMessageStartEvent: EventReducer._on_text_message_start,  # pylint: disable=protected-access
+    TextMessageContentEvent: EventReducer._on_text_message_content,  # pylint: disable=protected-access
+    ToolCallStartEvent: EventReducer._on_tool_call_start,  # pylint: disable=protected-access
+    ToolCallArgsEvent: EventReducer._on_tool_call_args,  # pylint: disable=protected-access
+    StateSnapshotEvent: EventReducer._on_state_snapshot,  # pylint: disable=protected-access
+    StateDeltaEvent: EventReducer._on_state_delta,  # pylint: disable=protected-access
+    MessagesSnapshotEvent: EventReducer._on_messages_snapshot,  # pylint: disable=protected-access
+    CustomEvent: EventReducer._on_custom,  # pylint: disable=protected-access
+    StepFinishedEvent: EventReducer._on_step_finished,  # pylint: disable=protected-access
+}
@@ -0,0 +1,105 @@
+"""
+This module contains untruncate_json, which completes a JSON document that
+was cut off while streaming, like the `untruncate-json` package used by the
+TypeScript client.
+"""
+
+import re
+from typing import List, Sequence
+
+_WHITESPACE = " \t\r\n"
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+# the end of a number that was cut off, e.g. "1." or "1e-"
+_PARTIAL_NUMBER_END = re.compile(r"(?:\.|[eE][+-]?)$")
+_PARTIAL_NUMBER = re.compile(r"-$")
+# a \u escape that was cut off, with the backslashes before it
+_PARTIAL_UNICODE_ESCAPE = re.compile(r"(\\+)u[0-9a-fA-F]{0,3}$")
+_LITERALS = ("true", "false", "null")
+
+
+def untruncate_json(text: str) -> str:
+    """
+    Completes JSON that was cut off, so that it can be parsed.
+
+    Open arrays and objects are closed and an unterminated string value is
+    closed where it ends. An incomplete key, literal or number at the end is
+    dropped, together with the comma or colon before it. Text that is not
+    the start of a JSON document is returned unchanged.
+    """
+    stack: List[str] = []
+    expect_key = False
+    # text[:safe] followed by closing safe_stack is valid JSON
+    safe = 0
+    safe_stack: Sequence[str] = ()
+    pos = 0
+    end = len(text)
+
+    while pos < end:
+        char = text[pos]
+        if char in _WHITESPACE:
+            pos += 1
+        elif char == '"':
+            pos += 1
+            while pos < end and text[pos] != '"':
+                pos += 2 if text[pos] == "\\" else 1
+            if pos >= end:
+                if expect_key:
+                    break
+                return _close_string(text, pos > end) + _closers(stack)
+            pos += 1
+            if expect_key:
+                expect_key = False
+            else:
+                safe, safe_stack = pos, tuple(stack)
+        elif char in "{[":
+            stack.append(char)
+            pos += 1
+            expect_key = char == "{"
+            safe, safe_stack = pos, tuple(stack)
+        elif char in "}]":
+            if not stack:
+                return text
+            stack.pop()
+            pos += 1
+            expect_key = False
+            safe, safe_stack = pos, tuple(stack)
+        elif char == ",":
+            pos += 1
+            expect_key = bool(stack) and stack[-1] == "{"
+        elif char == ":":
+            pos += 1
+        else:
+            match = _NUMBER.match(text, pos)
+            if match is not None:
+                pos = match.end()
+                if _PARTIAL_NUMBER_END.fullmatch(text, pos):
+                    safe, safe_stack = pos, tuple(stack)
+                    break
+            else:
+                literal = next((word for word in _LITERALS if text.startswith(word, pos)), None)
+                if literal is None:
+                    rest = text[pos:]
+                    if _PARTIAL_NUMBER.fullmatch(rest) or any(word.startswith(rest) for word in _LITERALS):
+                        break
+                    return text
+                pos += len(literal)
+            safe, safe_stack = pos, tuple(stack)
+
+    return text[:safe] + _closers(safe_stack)
+
+
+def _close_string(text: str, split_escape: bool) -> str:
+    """
+    Closes a string value at the end of `text`, dropping an escape sequence
+    that was cut off.
+    """
+    if split_escape:
+        text = text[:-1]
+    match = _PARTIAL_UNICODE_ESCAPE.search(text)
+    if match is not None and len(match.group(1)) % 2 == 1:
+        text = text[:match.start() + len(match.group(1)) - 1]
+    return text + '"'
+
+
+def _closers(stack: Sequence[str]) -> str:
+    return "".join("}" if bracket == "{" else "]" for bracket in reversed(stack))
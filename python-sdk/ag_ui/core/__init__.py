@@ -21,7 +21,8 @@ from ag_ui.core.events import (
     RunErrorEvent,
     StepStartedEvent,
     StepFinishedEvent,
-    Event
+    Event,
+    set_trusted_validation
 )
 
 from ag_ui.core.types import (
@@ -41,6 +42,17 @@ from ag_ui.core.types import (
     State
 )
 
+from ag_ui.core.columnar import DeltaColumns
+
+from ag_ui.core.equality import json_equal
+
+from ag_ui.core.parse import (
+    parse_event,
+    parse_events,
+    parse_message,
+    parse_messages
+)
+
 __all__ = [
     # Events
     "EventType",
@@ -62,6 +74,7 @@ __all__ = [
     "StepStartedEvent",
     "StepFinishedEvent",
     "Event",
+    "set_trusted_validation",
     # Types
     "FunctionCall",
     "ToolCall",
@@ -76,5 +89,14 @@ __all__ = [
     "Context",
     "Tool",
     "RunAgentInput",
-    "State"
+    "State",
+    # Containers
+    "DeltaColumns",
+    # Helpers
+    "json_equal",
+    # Parsing
+    "parse_event",
+    "parse_events",
+    "parse_message",
+    "parse_messages"
 ]
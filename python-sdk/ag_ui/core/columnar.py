@@ -0,0 +1,152 @@
+"""
+This module contains the DeltaColumns container for runs of delta events.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Type, Union, overload
+
+from .events import BaseEvent, TextMessageContentEvent, ToolCallArgsEvent
+
+DeltaEvent = Union[TextMessageContentEvent, ToolCallArgsEvent]
+
+# type code -> (event class, name of its id field)
+_CODES: List[tuple] = [
+    (TextMessageContentEvent, "message_id"),
+    (ToolCallArgsEvent, "tool_call_id"),
+]
+_CODE_BY_CLASS: Dict[Type[BaseEvent], int] = {cls: code for code, (cls, _) in enumerate(_CODES)}
+
+# stands for a missing timestamp in the timestamp column
+_NO_TIMESTAMP = -(2 ** 63)
+
+
+class DeltaColumns:
+    """
+    Stores text message content and tool call argument events column by
+    column, for buffering whole runs with little memory.
+
+    Ids are interned, all deltas share one UTF-8 buffer addressed by offsets,
+    and the event types are kept as one byte codes. Events are converted back
+    into pydantic events when they are read. Events with a `raw_event` cannot
+    be stored.
+    """
+
+    def __init__(self, events: Iterable[DeltaEvent] = ()):
+        self._codes = array("B")
+        self._id_indices = array("I")
+        self._offsets = array("Q", [0])
+        self._text = bytearray()
+        self._timestamps: Optional[array] = None
+        self._ids: List[str] = []
+        self._id_index: Dict[str, int] = {}
+        self.extend(events)
+
+    def append(self, event: DeltaEvent) -> None:
+        """
+        Adds an event. Raises ValueError for events that cannot be stored.
+        """
+        code = _CODE_BY_CLASS.get(type(event))
+        if code is None:
+            raise ValueError(f"Cannot store {type(event).__name__} in DeltaColumns")
+        values = event.__dict__
+        if values["raw_event"] is not None:
+            raise ValueError("Cannot store events with raw_event in DeltaColumns")
+
+        event_id = values[_CODES[code][1]]
+        id_index = self._id_index.get(event_id)
+        if id_index is None:
+            id_index = len(self._ids)
+            self._ids.append(event_id)
+            self._id_index[event_id] = id_index
+
+        timestamp = values["timestamp"]
+        if timestamp is not None and self._timestamps is None:
+            self._timestamps = array("q", [_NO_TIMESTAMP]) * len(self._codes)
+
+        self._text += values["delta"].encode("utf-8")
+        self._codes.append(code)
+        self._id_indices.append(id_index)
+        self._offsets.append(len(self._text))
+        if self._timestamps is not None:
+            self._timestamps.append(_NO_TIMESTAMP if timestamp is None else timestamp)
+
+    def extend(self, events: Iterable[DeltaEvent]) -> None:
+        """
+        Adds several events.
+        """
+        for event in events:
+            self.append(event)
+
+    def to_events(self) -> List[DeltaEvent]:
+        """
+        Returns all events as pydantic events.
+        """
+        return [self._event(index) for index in range(len(self._codes))]
+
+    def text(self, event_id: str) -> str:
+        """
+        Returns the concatenated deltas of a message or tool call.
+        """
+        id_index = self._id_index.get(event_id)
+        if id_index is None:
+            return ""
+        offsets = self._offsets
+        text = self._text
+        return b"".join(
+            text[offsets[index]:offsets[index + 1]]
+            for index, current in enumerate(self._id_indices)
+            if current == id_index
+        ).decode("utf-8")
+
+    @property
+    def ids(self) -> List[str]:
+        """
+        The message and tool call ids, in order of first appearance.
+        """
+        return list(self._ids)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The approximate memory used by the columns, in bytes.
+        """
+        columns = [self._codes, self._id_indices, self._offsets]
+        if self._timestamps is not None:
+            columns.append(self._timestamps)
+        return (
+            sum(column.itemsize * len(column) for column in columns)
+            + len(self._text)
+            + sum(len(event_id) for event_id in self._ids)
+        )
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @overload
+    def __getitem__(self, index: int) -> DeltaEvent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[DeltaEvent]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._event(i) for i in range(*index.indices(len(self._codes)))]
+        if index < 0:
+            index += len(self._codes)
+        if not 0 <= index < len(self._codes):
+            raise IndexError("DeltaColumns index out of range")
+        return self._event(index)
+
+    def __iter__(self) -> Iterator[DeltaEvent]:
+        for index in range(len(self._codes)):
+            yield self._event(index)
+
+    def _event(self, index: int) -> DeltaEvent:
+        cls, id_field = _CODES[self._codes[index]]
+        fields = {
+            id_field: self._ids[self._id_indices[index]],
+            "delta": self._text[self._offsets[index]:self._offsets[index + 1]].decode("utf-8"),
+        }
+        if self._timestamps is not None and self._timestamps[index] != _NO_TIMESTAMP:
+            fields["timestamp"] = self._timestamps[index]
+        return cls.trusted(**fields)
@@ -0,0 +1,20 @@
+"""
+This module contains equality of JSON values, shared by JSON Patch and JSON
+Schema validation.
+"""
+
+from typing import Any
+
+
+def json_equal(left: Any, right: Any) -> bool:
+    """
+    Compares two JSON values. Unlike ==, JSON equality does not consider
+    true equal to 1.
+    """
+    if isinstance(left, bool) or isinstance(right, bool):
+        return type(left) is type(right) and left == right
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(json_equal(left[key], right[key]) for key in left)
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(json_equal(a, b) for a, b in zip(left, right))
+    return left == right
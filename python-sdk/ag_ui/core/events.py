@@ -2,8 +2,9 @@
 This module contains the event types for the Agent User Interaction Protocol Python SDK.
 """
 
+import os
 from enum import Enum
-from typing import Any, List, Literal, Optional, Union, Annotated
+from typing import Any, Dict, List, Literal, Optional, Type, TypeVar, Union, Annotated
 from pydantic import Field
 
 from .types import Message, State, ConfiguredBaseModel
@@ -33,6 +34,28 @@ class EventType(str, Enum):
     STEP_FINISHED = "STEP_FINISHED"
 
 
+# validate events created with `trusted`, see set_trusted_validation
+_validate_trusted = os.environ.get("AG_UI_VALIDATE_TRUSTED_EVENTS", "") not in ("", "0")
+
+# event class -> field values of a new event, before the given fields are set
+_TRUSTED_DEFAULTS: Dict[type, Dict[str, Any]] = {}
+
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+
+EventT = TypeVar("EventT", bound="BaseEvent")
+
+
+def set_trusted_validation(enabled: bool) -> None:
+    """
+    Turns validation of events created with `BaseEvent.trusted` on or off.
+    Useful in tests and while debugging an agent. Can also be turned on with
+    the AG_UI_VALIDATE_TRUSTED_EVENTS environment variable.
+    """
+    global _validate_trusted  # pylint: disable=global-statement
+    _validate_trusted = enabled
+
+
 class BaseEvent(ConfiguredBaseModel):
     """
     Base event for all events in the Agent User Interaction Protocol.
@@ -41,6 +64,47 @@ class BaseEvent(ConfiguredBaseModel):
     timestamp: Optional[int] = None
     raw_event: Optional[Any] = None
 
+    @classmethod
+    def trusted(cls: Type[EventT], **data: Any) -> EventT:
+        """
+        Creates an event from values that are known to be valid, without
+        validating them. The type is filled in and fields are given by name,
+        e.g. `TextMessageContentEvent.trusted(message_id="m", delta="Hi")`.
+
+        Meant for events produced by the agent itself. Invalid values are not
+        detected and end up in the encoded stream, unless validation is turned
+        on with set_trusted_validation.
+        """
+        defaults = _TRUSTED_DEFAULTS.get(cls)
+        if defaults is None:
+            defaults = _trusted_defaults(cls)
+        if _validate_trusted:
+            return cls(**{**defaults, **data})
+        event = _object_new(cls)
+        _object_setattr(event, "__dict__", {**defaults, **data})
+        _object_setattr(event, "__pydantic_fields_set__", {"type", *data})
+        _object_setattr(event, "__pydantic_extra__", None)
+        _object_setattr(event, "__pydantic_private__", None)
+        return event
+
+
+def _trusted_defaults(cls: type) -> Dict[str, Any]:
+    """
+    Returns the type and the default values of the optional fields of an event
+    class, in field order.
+    """
+    type_field = cls.model_fields["type"]
+    if getattr(type_field.annotation, "__origin__", None) is not Literal:
+        raise TypeError(f"{cls.__name__} is not a concrete event class")
+    defaults = {}
+    for name, field in cls.model_fields.items():
+        if name == "type":
+            defaults[name] = type_field.annotation.__args__[0]
+        elif not field.is_required():
+            defaults[name] = field.get_default(call_default_factory=True)
+    _TRUSTED_DEFAULTS[cls] = defaults
+    return defaults
+
 
 class TextMessageStartEvent(BaseEvent):
     """
@@ -0,0 +1,79 @@
+"""
+This module contains helpers for parsing events and messages.
+
+Each helper validates against a single `TypeAdapter` that is created on first
+use and reused afterwards, since building an adapter for a discriminated union
+is far more expensive than validating a value with it.
+"""
+
+from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+
+from pydantic import TypeAdapter
+
+from .events import Event
+from .types import Message
+
+T = TypeVar("T")
+
+JsonInput = Union[str, bytes, bytearray]
+
+
+class _CachedAdapter(Generic[T]):
+    """
+    A TypeAdapter that is built on first use.
+    """
+
+    def __init__(self, type_: Any):
+        self._type = type_
+        self._adapter: Optional[TypeAdapter] = None
+
+    def get(self) -> TypeAdapter:
+        """
+        Returns the adapter, building it if needed.
+        """
+        if self._adapter is None:
+            self._adapter = TypeAdapter(self._type)
+        return self._adapter
+
+    def validate(self, data: Union[JsonInput, Any]) -> T:
+        """
+        Validates JSON (str or bytes) or already decoded Python data.
+        """
+        adapter = self.get()
+        if isinstance(data, (str, bytes, bytearray)):
+            return adapter.validate_json(data)
+        return adapter.validate_python(data)
+
+
+_event_adapter: _CachedAdapter[Event] = _CachedAdapter(Event)
+_events_adapter: _CachedAdapter[List[Event]] = _CachedAdapter(List[Event])
+_message_adapter: _CachedAdapter[Message] = _CachedAdapter(Message)
+_messages_adapter: _CachedAdapter[List[Message]] = _CachedAdapter(List[Message])
+
+
+def parse_event(data: Union[JsonInput, Dict[str, Any]]) -> Event:
+    """
+    Parses a single event from JSON or a dict, picking the event class by `type`.
+    """
+    return _event_adapter.validate(data)
+
+
+def parse_events(data: Union[JsonInput, List[Dict[str, Any]]]) -> List[Event]:
+    """
+    Parses a JSON array (or a list of dicts) of events.
+    """
+    return _events_adapter.validate(data)
+
+
+def parse_message(data: Union[JsonInput, Dict[str, Any]]) -> Message:
+    """
+    Parses a single message from JSON or a dict, picking the message class by `role`.
+    """
+    return _message_adapter.validate(data)
+
+
+def parse_messages(data: Union[JsonInput, List[Dict[str, Any]]]) -> List[Message]:
+    """
+    Parses a JSON array (or a list of dicts) of messages.
+    """
+    return _messages_adapter.validate(data)
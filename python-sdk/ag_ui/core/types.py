@@ -14,7 +14,9 @@ class ConfiguredBaseModel(BaseModel):
         extra="forbid",
         alias_generator=to_camel,
         populate_by_name=True,
-        ser_json_by_alias=True
+        ser_json_by_alias=True,
+        # build validators and serializers on first use, to keep imports fast
+        defer_build=True
     )
 
 
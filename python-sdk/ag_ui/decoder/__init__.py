@@ -0,0 +1,9 @@
+"""
+This module contains decoders for Agent User Interaction event streams.
+"""
+
+from ag_ui.decoder.envelope import LazyEvent
+from ag_ui.decoder.sse import SSEDecoder
+from ag_ui.decoder.proto import ProtoDecoder
+
+__all__ = ["SSEDecoder", "ProtoDecoder", "LazyEvent"]
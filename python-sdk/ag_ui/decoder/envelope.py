@@ -0,0 +1,221 @@
+"""
+This module contains the LazyEvent class.
+"""
+
+import json
+import re
+from typing import Any, Dict, Optional, Union
+
+from ag_ui.core.events import Event, EventType
+from ag_ui.core.parse import parse_event
+from ag_ui import proto
+from ag_ui.proto.wire import Buffer
+
+JSON = "json"
+PROTO = "proto"
+
+# routing keys: field name -> camelCase JSON key
+_ROUTING_KEYS = {
+    "message_id": b"messageId",
+    "tool_call_id": b"toolCallId",
+    "thread_id": b"threadId",
+    "run_id": b"runId",
+}
+_JSON_KEYS = {b'"' + key + b'"': name for name, key in _ROUTING_KEYS.items()}
+_JSON_KEYS[b'"type"'] = "type"
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRUCTURE = re.compile(rb'["\[\]{}]')
+_SCALAR = re.compile(rb"[^,}\]\s]+")
+
+
+class LazyEvent:
+    """
+    An encoded event that is only decoded as far as needed.
+
+    The event type and the routing keys (`message_id`, `tool_call_id`,
+    `thread_id`, `run_id`) are read straight from the JSON or protobuf bytes.
+    The event is only validated when another field is accessed, and the
+    EventEncoder sends the original bytes if the format matches.
+    """
+
+    __slots__ = ("raw", "format", "_keys", "_event")
+
+    def __init__(self, raw: bytes, format: str):  # pylint: disable=redefined-builtin
+        if format not in (JSON, PROTO):
+            raise ValueError(f"Unknown event format: {format}")
+        self.raw = raw
+        self.format = format
+        self._keys: Optional[Dict[str, Any]] = None
+        self._event: Optional[Event] = None
+
+    @classmethod
+    def from_json(cls, data: Union[str, Buffer]) -> "LazyEvent":
+        """
+        Wraps a JSON encoded event.
+        """
+        if isinstance(data, str):
+            return cls(data.encode("utf-8"), JSON)
+        return cls(bytes(data), JSON)
+
+    @classmethod
+    def from_proto(cls, data: Buffer) -> "LazyEvent":
+        """
+        Wraps a protocol buffer encoded event (without length prefix).
+        """
+        return cls(bytes(data), PROTO)
+
+    @property
+    def type(self) -> EventType:
+        """
+        The event type.
+        """
+        return self._routing_keys()["type"]
+
+    @property
+    def message_id(self) -> Optional[str]:
+        """
+        The message id of text message events, None for other events.
+        """
+        return self._routing_keys().get("message_id")
+
+    @property
+    def tool_call_id(self) -> Optional[str]:
+        """
+        The tool call id of tool call events, None for other events.
+        """
+        return self._routing_keys().get("tool_call_id")
+
+    @property
+    def thread_id(self) -> Optional[str]:
+        """
+        The thread id of run lifecycle events, None for other events.
+        """
+        return self._routing_keys().get("thread_id")
+
+    @property
+    def run_id(self) -> Optional[str]:
+        """
+        The run id of run lifecycle events, None for other events.
+        """
+        return self._routing_keys().get("run_id")
+
+    @property
+    def event(self) -> Event:
+        """
+        The fully decoded and validated event.
+        """
+        if self._event is None:
+            if self.format == JSON:
+                self._event = parse_event(self.raw)
+            else:
+                self._event = proto.decode(self.raw)
+        return self._event
+
+    def to_json(self) -> bytes:
+        """
+        Returns the event as JSON, reusing the original bytes if possible.
+        """
+        if self.format == JSON:
+            return self.raw
+        event = self.event
+        return event.__pydantic_serializer__.to_json(event, by_alias=True, exclude_none=True)
+
+    def to_proto(self) -> bytes:
+        """
+        Returns the event as protobuf, reusing the original bytes if possible.
+        """
+        if self.format == PROTO:
+            return self.raw
+        return proto.encode(self.event)
+
+    def __getattr__(self, name: str) -> Any:
+        # any other field requires the full event
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.event, name)
+
+    def __repr__(self) -> str:
+        return f"LazyEvent(type={self.type.value}, format={self.format})"
+
+    def _routing_keys(self) -> Dict[str, Any]:
+        if self._keys is None:
+            if self.format == JSON:
+                self._keys = _peek_json(self.raw)
+            else:
+                event_type, keys = proto.peek(self.raw, _ROUTING_KEYS)
+                keys["type"] = event_type
+                self._keys = keys
+        return self._keys
+
+
+def _peek_json(data: bytes) -> Dict[str, Any]:
+    """
+    Reads the type and routing keys from the top level of a JSON object,
+    skipping over all other values without decoding them.
+    """
+    keys: Dict[str, Any] = {}
+    pos = _WHITESPACE.match(data).end()
+    if data[pos:pos + 1] != b"{":
+        raise ValueError("Event must be a JSON object")
+    pos = _WHITESPACE.match(data, pos + 1).end()
+    if data[pos:pos + 1] == b"}":
+        pos = len(data)
+    while pos < len(data):
+        key = _STRING.match(data, pos)
+        if key is None:
+            raise ValueError("Invalid JSON object key")
+        pos = _WHITESPACE.match(data, key.end()).end()
+        if data[pos:pos + 1] != b":":
+            raise ValueError("Invalid JSON object")
+        pos = _WHITESPACE.match(data, pos + 1).end()
+        value_end = _skip_value(data, pos)
+        name = _JSON_KEYS.get(key.group())
+        if name is not None and data[pos:pos + 1] == b'"':
+            keys[name] = json.loads(data[pos:value_end])
+        pos = _WHITESPACE.match(data, value_end).end()
+        separator = data[pos:pos + 1]
+        if separator == b"}":
+            break
+        if separator != b",":
+            raise ValueError("Invalid JSON object")
+        pos = _WHITESPACE.match(data, pos + 1).end()
+
+    if "type" not in keys:
+        raise ValueError("Event has no type")
+    keys["type"] = EventType(keys["type"])
+    return keys
+
+
+def _skip_value(data: bytes, pos: int) -> int:
+    """
+    Returns the position after the JSON value starting at `pos`.
+    """
+    first = data[pos:pos + 1]
+    if first == b'"':
+        match = _STRING.match(data, pos)
+        if match is None:
+            raise ValueError("Unterminated JSON string")
+        return match.end()
+    if first in (b"{", b"["):
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(data, pos)
+            if match is None:
+                raise ValueError("Unterminated JSON value")
+            char = match.group()
+            if char == b'"':
+                string = _STRING.match(data, match.start())
+                if string is None:
+                    raise ValueError("Unterminated JSON string")
+                pos = string.end()
+                continue
+            pos = match.end()
+            depth += 1 if char in (b"{", b"[") else -1
+            if depth == 0:
+                return pos
+    match = _SCALAR.match(data, pos)
+    if match is None:
+        raise ValueError("Invalid JSON value")
+    return match.end()
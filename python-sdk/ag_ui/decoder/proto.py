@@ -0,0 +1,131 @@
+"""
+This module contains the ProtoDecoder class.
+"""
+
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Union
+
+from ag_ui.core.events import Event
+from ag_ui.decoder.envelope import LazyEvent
+from ag_ui.proto import decode
+from ag_ui.proto.wire import Buffer
+
+_HEADER_SIZE = 4
+
+
+class ProtoDecoder:
+    """
+    Decodes a stream of length prefixed protocol buffer events: each event is a
+    4-byte big-endian length followed by an encoded `ag_ui.Event`.
+
+    Complete frames are decoded straight from the incoming chunk without
+    copying. Only a frame that is split across chunks is copied, once, into a
+    reusable buffer that grows to the largest frame seen.
+
+    With `lazy=True`, events are returned as LazyEvent envelopes that keep a
+    copy of their frame and are only decoded when needed.
+    """
+
+    def __init__(self, max_frame_size: int = 64 * 1024 * 1024, lazy: bool = False):
+        self.max_frame_size = max_frame_size
+        self.lazy = lazy
+        self._buffer = bytearray(1024)
+        self._filled = 0
+        self._frame_size = 0  # header and body of the buffered frame, 0 if unknown
+
+    def feed(self, chunk: Buffer) -> List[Event]:
+        """
+        Adds a chunk of the stream. Returns the events completed by it.
+        """
+        events: List[Event] = []
+        view = memoryview(chunk).cast("B")
+        pos = 0
+        end = len(view)
+
+        if self._filled:
+            pos = self._fill(view, pos)
+            if self._filled < _HEADER_SIZE or self._filled < self._frame_size:
+                return events
+            events.append(self._decode_buffered())
+
+        while end - pos >= _HEADER_SIZE:
+            length = self._frame_length(view[pos:pos + _HEADER_SIZE])
+            body_start = pos + _HEADER_SIZE
+            if end - body_start < length:
+                break
+            events.append(self._decode(view[body_start:body_start + length]))
+            pos = body_start + length
+
+        if pos < end:
+            self._fill(view, pos)
+        return events
+
+    def close(self) -> List[Event]:
+        """
+        Ends the stream. Raises ValueError if it ended in the middle of a frame.
+        """
+        if self._filled:
+            self._filled = 0
+            self._frame_size = 0
+            raise ValueError("Incomplete protocol buffer frame at end of stream")
+        return []
+
+    def decode(self, chunks: Iterable[Buffer]) -> Iterator[Event]:
+        """
+        Decodes a synchronous stream of chunks.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    async def decode_async(self, chunks: AsyncIterable[Buffer]) -> AsyncIterator[Event]:
+        """
+        Decodes an asynchronous stream of chunks.
+        """
+        async for chunk in chunks:
+            for event in self.feed(chunk):
+                yield event
+        for event in self.close():
+            yield event
+
+    def _fill(self, view: memoryview, pos: int) -> int:
+        """
+        Copies the bytes of the split frame from `view` into the buffer, up to
+        the end of the frame. Returns the position after the copied bytes.
+        """
+        end = len(view)
+        if self._filled < _HEADER_SIZE:
+            count = min(_HEADER_SIZE - self._filled, end - pos)
+            self._buffer[self._filled:self._filled + count] = view[pos:pos + count]
+            self._filled += count
+            pos += count
+            if self._filled < _HEADER_SIZE:
+                return pos
+            length = self._frame_length(self._buffer[:_HEADER_SIZE])
+            self._frame_size = _HEADER_SIZE + length
+            if len(self._buffer) < self._frame_size:
+                self._buffer.extend(bytes(self._frame_size - len(self._buffer)))
+
+        count = min(self._frame_size - self._filled, end - pos)
+        self._buffer[self._filled:self._filled + count] = view[pos:pos + count]
+        self._filled += count
+        return pos + count
+
+    def _decode_buffered(self) -> Event:
+        frame_size = self._frame_size
+        self._filled = 0
+        self._frame_size = 0
+        return self._decode(memoryview(self._buffer)[_HEADER_SIZE:frame_size])
+
+    def _frame_length(self, header: Buffer) -> int:
+        length = int.from_bytes(header, "big")
+        if length > self.max_frame_size:
+            raise ValueError(f"Protocol buffer frame of {length} bytes exceeds max_frame_size")
+        return length
+
+    def _decode(self, message: memoryview) -> Union[Event, LazyEvent]:
+        if self.lazy:
+            return LazyEvent.from_proto(message)
+        try:
+            return decode(message)
+        except ValueError as exc:
+            raise ValueError(f"Failed to decode protocol buffer message: {exc}") from exc
@@ -0,0 +1,151 @@
+"""
+This module contains the SSEDecoder class.
+"""
+
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional, Union
+
+from ag_ui.core.events import Event
+from ag_ui.core.parse import parse_event
+from ag_ui.decoder.envelope import LazyEvent
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+class SSEDecoder:
+    """
+    Decodes a Server-Sent Events stream of Agent User Interaction events.
+
+    Chunks can be split at arbitrary byte boundaries. Only the incomplete line
+    at the end of a chunk is buffered, so every byte is scanned once. Following
+    the SSE standard, `data` fields of one event are joined with newlines,
+    comments and unknown fields are ignored, and `id` is kept in
+    `last_event_id` for reconnecting.
+
+    With `lazy=True`, events are returned as LazyEvent envelopes that are only
+    validated when needed.
+    """
+
+    def __init__(self, lazy: bool = False):
+        self.lazy = lazy
+        self.last_event_id: Optional[str] = None
+        self._line = bytearray()
+        self._data: List[bytes] = []
+        self._skip_lf = False
+        self._started = False
+
+    def feed(self, chunk: bytes) -> List[Event]:
+        """
+        Adds a chunk of the stream. Returns the events completed by it.
+        """
+        events: List[Event] = []
+        if not chunk:
+            return events
+        if not self._started:
+            self._line += chunk
+            if len(self._line) < len(_UTF8_BOM) and _UTF8_BOM.startswith(bytes(self._line)):
+                return events
+            chunk = bytes(self._line)
+            self._line.clear()
+            self._started = True
+            if chunk.startswith(_UTF8_BOM):
+                chunk = chunk[len(_UTF8_BOM):]
+
+        pos = 0
+        end = len(chunk)
+        if self._skip_lf and pos < end:
+            # the previous chunk ended with CR, skip the LF of a CRLF
+            if chunk[0] == 0x0A:
+                pos = 1
+            self._skip_lf = False
+
+        lf = -1
+        while pos < end:
+            if lf < pos:
+                lf = chunk.find(b"\n", pos)
+                if lf == -1:
+                    lf = end
+            cr = chunk.find(b"\r", pos, lf)
+            if cr != -1:
+                line_end = cr
+                if cr + 1 < end:
+                    next_pos = cr + 2 if chunk[cr + 1] == 0x0A else cr + 1
+                else:
+                    next_pos = cr + 1
+                    self._skip_lf = True
+            elif lf != end:
+                line_end = lf
+                next_pos = lf + 1
+            else:
+                self._line += chunk[pos:]
+                break
+
+            if self._line:
+                self._line += chunk[pos:line_end]
+                line = bytes(self._line)
+                self._line.clear()
+            else:
+                line = chunk[pos:line_end]
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+            pos = next_pos
+        return events
+
+    def close(self) -> List[Event]:
+        """
+        Ends the stream. Like the TypeScript client, an event that is not
+        terminated by an empty line is still dispatched.
+        """
+        events: List[Event] = []
+        if self._line:
+            line = bytes(self._line)
+            self._line.clear()
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def decode(self, chunks: Iterable[bytes]) -> Iterator[Event]:
+        """
+        Decodes a synchronous stream of chunks.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    async def decode_async(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[Event]:
+        """
+        Decodes an asynchronous stream of chunks.
+        """
+        async for chunk in chunks:
+            for event in self.feed(chunk):
+                yield event
+        for event in self.close():
+            yield event
+
+    def _process_line(self, line: bytes) -> Optional[Event]:
+        if not line:
+            return self._dispatch()
+        if line[0] == 0x3A:  # ":" starts a comment
+            return None
+        field, colon, value = line.partition(b":")
+        if colon and value[:1] == b" ":
+            value = value[1:]
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"id":
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8")
+        return None
+
+    def _dispatch(self) -> Optional[Union[Event, LazyEvent]]:
+        if not self._data:
+            return None
+        data = self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+        self._data = []
+        if self.lazy:
+            return LazyEvent.from_json(data)
+        return parse_event(data)
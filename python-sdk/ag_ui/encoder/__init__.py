@@ -2,6 +2,20 @@
 This module contains the EventEncoder class.
 """
 
-from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE, SSE_MEDIA_TYPE
+from ag_ui.encoder.media_type import preferred_media_types, negotiate_media_type
+from ag_ui.encoder.pipeline import EventStage
+from ag_ui.encoder.coalesce import DeltaCoalescer
+from ag_ui.encoder.replay import ReplayBuffer, ReplayGapError
 
-__all__ = ["EventEncoder", "AGUI_MEDIA_TYPE"]
+__all__ = [
+    "EventEncoder",
+    "AGUI_MEDIA_TYPE",
+    "SSE_MEDIA_TYPE",
+    "preferred_media_types",
+    "negotiate_media_type",
+    "EventStage",
+    "DeltaCoalescer",
+    "ReplayBuffer",
+    "ReplayGapError",
+]
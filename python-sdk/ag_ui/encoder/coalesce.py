@@ -0,0 +1,95 @@
+"""
+This module contains the DeltaCoalescer pipeline stage.
+"""
+
+import time
+from typing import Callable, List, Optional
+
+from ag_ui.core.events import BaseEvent, TextMessageContentEvent, ToolCallArgsEvent
+from ag_ui.encoder.pipeline import EventStage
+
+
+class DeltaCoalescer(EventStage):
+    """
+    Merges consecutive `TextMessageContentEvent`s with the same `message_id`,
+    and consecutive `ToolCallArgsEvent`s with the same `tool_call_id`, into a
+    single event.
+
+    Merged deltas are released when they reach `max_bytes` (UTF-8), when
+    `max_delay` seconds have passed since the first of them arrived, or when
+    any other event comes in. Either limit can be disabled with None.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = 4096,
+        max_delay: Optional[float] = 0.05,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        super().__init__(clock)
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self._first: Optional[BaseEvent] = None
+        self._key = None
+        self._deltas: List[str] = []
+        self._size = 0
+        self._started_at = 0.0
+
+    def push(self, event: BaseEvent) -> List[BaseEvent]:
+        key = self._coalescing_key(event)
+        if key is None:
+            ready = self.flush()
+            ready.append(event)
+            return ready
+
+        ready = self.flush() if key != self._key else []
+        if self._first is None:
+            self._first = event
+            self._key = key
+            self._started_at = self.clock()
+        self._deltas.append(event.delta)
+        self._size += len(event.delta.encode("utf-8"))
+
+        if self.max_bytes is not None and self._size >= self.max_bytes:
+            ready.extend(self.flush())
+        elif self.max_delay is not None and self.clock() - self._started_at >= self.max_delay:
+            ready.extend(self.flush())
+        return ready
+
+    def flush(self) -> List[BaseEvent]:
+        if self._first is None:
+            return []
+        event = self._first
+        if len(self._deltas) > 1:
+            # the deltas were validated when the individual events were created
+            event = event.model_copy(update={"delta": "".join(self._deltas)})
+        self._first = None
+        self._key = None
+        self._deltas = []
+        self._size = 0
+        return [event]
+
+    def deadline(self) -> Optional[float]:
+        if self._first is None or self.max_delay is None:
+            return None
+        return self._started_at + self.max_delay
+
+    def poll(self) -> List[BaseEvent]:
+        deadline = self.deadline()
+        if deadline is not None and self.clock() >= deadline:
+            return self.flush()
+        return []
+
+    @staticmethod
+    def _coalescing_key(event: BaseEvent):
+        """
+        Returns the key that consecutive events must share to be merged, or None
+        if the event cannot be merged.
+        """
+        if event.raw_event is not None:
+            return None
+        if type(event) is TextMessageContentEvent:
+            return (TextMessageContentEvent, event.message_id)
+        if type(event) is ToolCallArgsEvent:
+            return (ToolCallArgsEvent, event.tool_call_id)
+        return None
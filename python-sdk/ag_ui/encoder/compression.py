@@ -0,0 +1,82 @@
+"""
+This module contains the streaming compression used by the EventEncoder.
+"""
+
+import zlib
+from functools import lru_cache
+from typing import Optional
+
+from ag_ui.encoder.media_type import ACCEPT_CACHE_SIZE
+
+# supported content codings, in order of preference
+CONTENT_ENCODINGS = ("gzip", "deflate")
+
+_WBITS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS,
+}
+
+
+@lru_cache(maxsize=ACCEPT_CACHE_SIZE)
+def negotiate_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Picks a content coding from an Accept-Encoding header. Returns None if the
+    stream should not be compressed.
+    """
+    if not accept_encoding:
+        return None
+    qualities = {}
+    wildcard_q = None
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        if name == "*":
+            wildcard_q = q
+        else:
+            qualities[name] = q
+
+    best = None
+    best_q = 0.0
+    for name in CONTENT_ENCODINGS:
+        q = qualities.get(name, wildcard_q or 0.0)
+        if q > best_q:
+            best = name
+            best_q = q
+    return best
+
+
+class StreamCompressor:
+    """
+    Compresses a stream with a single zlib compressor, so the dictionary is
+    shared across all events of the stream. Each call to `compress` ends with a
+    sync flush, so the client can decompress everything it has received so far.
+    """
+
+    def __init__(self, encoding: str, level: int = 6):
+        if encoding not in _WBITS:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+        self.encoding = encoding
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compresses data and flushes it to a byte boundary.
+        """
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """
+        Ends the compressed stream. Returns the remaining bytes, including the
+        gzip trailer.
+        """
+        return self._compressor.flush(zlib.Z_FINISH)
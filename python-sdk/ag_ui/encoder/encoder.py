@@ -2,31 +2,249 @@
 This module contains the EventEncoder class
 """
 
+import asyncio
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Union
+
 from ag_ui.core.events import BaseEvent
+from ag_ui import proto
+from ag_ui.proto import AGUI_MEDIA_TYPE
+from ag_ui.decoder.envelope import LazyEvent
+from ag_ui.encoder.serializers import SSE_PREFIX, SSE_SUFFIX, serialize_json, serialize_sse
+from ag_ui.encoder.compression import StreamCompressor, negotiate_content_encoding
+from ag_ui.encoder.media_type import ACCEPT_CACHE_SIZE, get_media_type_priority, parse_accept
+
+SSE_MEDIA_TYPE = "text/event-stream"
 
-AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+SSE_HEARTBEAT = b": ping\n\n"
 
 class EventEncoder:
     """
     Encodes Agent User Interaction events.
     """
-    def __init__(self, accept: str = None):
-        pass
+    def __init__(
+        self,
+        accept: str = None,
+        accept_encoding: str = None,
+        compression_level: int = 6,
+        event_ids: bool = False
+    ):
+        self.accepts_protobuf = _is_protobuf_accepted(accept) if accept else False
+        # id of the last SSE event, None if events are sent without ids
+        self.last_event_id: Optional[int] = 0 if event_ids else None
+        content_encoding = negotiate_content_encoding(accept_encoding)
+        self._compressor = (
+            StreamCompressor(content_encoding, compression_level) if content_encoding else None
+        )
 
     def get_content_type(self) -> str:
         """
         Returns the content type of the encoder.
         """
-        return "text/event-stream"
+        if self.accepts_protobuf:
+            return AGUI_MEDIA_TYPE
+        return SSE_MEDIA_TYPE
 
-    def encode(self, event: BaseEvent) -> str:
+    def get_content_encoding(self) -> Optional[str]:
         """
-        Encodes an event.
+        Returns the negotiated content coding ("gzip" or "deflate"), or None if
+        the stream is not compressed.
+        """
+        return self._compressor.encoding if self._compressor else None
+
+    def encode(self, event: BaseEvent) -> Union[str, bytes]:
         """
+        Encodes an event in the negotiated format: an SSE string, or bytes if
+        the client accepts protobuf or a compressed stream.
+        """
+        if self.accepts_protobuf or self._compressor:
+            return self.encode_bytes(event)
         return self._encode_sse(event)
 
+    def encode_bytes(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event in the negotiated format, returning bytes that can be
+        written to the transport as they are.
+        """
+        if self.accepts_protobuf:
+            data = self._encode_protobuf(event)
+        else:
+            data = self._encode_sse_bytes(event)
+        return self.encode_raw(data)
+
+    def encode_many(self, events: Iterable[BaseEvent]) -> bytes:
+        """
+        Encodes a batch of events in the negotiated format into one contiguous
+        buffer, so a burst of events can be sent with a single write. A
+        compressed stream is flushed once per batch.
+        """
+        data = b"".join(self._encode_parts(events))
+        if self._compressor and data:
+            return self._compressor.compress(data)
+        return data
+
+    def encode_many_views(self, events: Iterable[BaseEvent]) -> List[memoryview]:
+        """
+        Encodes a batch of events in the negotiated format into a list of buffers
+        suitable for vectored writes (`socket.sendmsg`, `os.writev`). Unlike
+        `encode_many`, the encoded events are not copied into a single buffer.
+        """
+        if self._compressor:
+            data = self.encode_many(events)
+            return [memoryview(data)] if data else []
+        return [memoryview(part) for part in self._encode_parts(events)]
+
+    async def stream(
+        self,
+        events: AsyncIterable[BaseEvent],
+        heartbeat_interval: Optional[float] = 15.0
+    ) -> AsyncIterator[bytes]:
+        """
+        Encodes an async stream of events into chunks ready to be sent, ending
+        with the bytes from `finish`.
+
+        The producer is only asked for the next event when the consumer asks for
+        the next chunk, so a slow client pauses the agent instead of piling up
+        encoded events in memory. While the producer is idle for more than
+        `heartbeat_interval` seconds, an SSE comment is sent to keep the
+        connection open. The protobuf format has no heartbeats.
+        """
+        if self.accepts_protobuf:
+            heartbeat_interval = None
+        iterator = events.__aiter__()
+        pending = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                done, _ = await asyncio.wait((pending,), timeout=heartbeat_interval)
+                if not done:
+                    yield self._encode_heartbeat()
+                    continue
+                try:
+                    event = pending.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+                yield self.encode_bytes(event)
+            tail = self.finish()
+            if tail:
+                yield tail
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.wait((pending,))
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def encode_raw(self, data: bytes) -> bytes:
+        """
+        Passes bytes that are already encoded in the negotiated format through
+        the stream, compressing them if needed. Used to send stored events
+        without serializing them again.
+        """
+        if self._compressor:
+            return self._compressor.compress(data)
+        return data
+
+    def finish(self) -> bytes:
+        """
+        Returns the bytes that end the stream. Only compressed streams need
+        this, it returns empty bytes otherwise.
+        """
+        if self._compressor:
+            return self._compressor.finish()
+        return b""
+
+    def _encode_parts(self, events: Iterable[BaseEvent]) -> List[bytes]:
+        """
+        Encodes events into a flat list of buffers which, concatenated, form the
+        encoded stream.
+        """
+        if not self.accepts_protobuf:
+            return [self._encode_sse_bytes(event) for event in events]
+
+        parts = []
+        for event in events:
+            message = _encode_proto_message(event)
+            parts.append(len(message).to_bytes(4, "big"))
+            parts.append(message)
+        return parts
+
+    def _encode_heartbeat(self) -> bytes:
+        """
+        Encodes an SSE comment that clients ignore.
+        """
+        return self.encode_raw(SSE_HEARTBEAT)
+
     def _encode_sse(self, event: BaseEvent) -> str:
         """
         Encodes an event into an SSE string.
         """
-        return f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+        if isinstance(event, LazyEvent):
+            data = f"data: {_lazy_event_json(event).decode('utf-8')}\n\n"
+        else:
+            data = f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+        if self.last_event_id is None:
+            return data
+        self.last_event_id += 1
+        return f"id: {self.last_event_id}\n{data}"
+
+    def _encode_sse_bytes(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into SSE bytes. The JSON payload is serialized straight
+        to UTF-8 and joined with the framing in a single allocation.
+        """
+        if isinstance(event, LazyEvent):
+            data = b"".join((SSE_PREFIX, _lazy_event_json(event), SSE_SUFFIX))
+        else:
+            data = serialize_sse(event)
+        if self.last_event_id is None:
+            return data
+        self.last_event_id += 1
+        return b"id: %d\n%b" % (self.last_event_id, data)
+
+    def _encode_protobuf(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event into protocol buffer bytes, prefixed with the message
+        length as a 4 byte big-endian unsigned integer.
+        """
+        message = _encode_proto_message(event)
+        return b"".join((len(message).to_bytes(4, "big"), message))
+
+
+def _lazy_event_json(event: LazyEvent) -> bytes:
+    """
+    Returns the JSON of a lazy event for an SSE `data` line. The original
+    bytes are only reused if they fit on one line, JSON received from a
+    multi-line `data` field is serialized again.
+    """
+    data = event.to_json()
+    if b"\n" in data or b"\r" in data:
+        return serialize_json(event.event)
+    return data
+
+
+def _encode_proto_message(event: BaseEvent) -> bytes:
+    """
+    Encodes an event into protocol buffer bytes. Lazy events that were received
+    as protobuf are sent as they are.
+    """
+    if isinstance(event, LazyEvent):
+        return event.to_proto()
+    return proto.encode(event)
+
+
+@lru_cache(maxsize=ACCEPT_CACHE_SIZE)
+def _is_protobuf_accepted(accept: str) -> bool:
+    """
+    Returns True if the Accept header explicitly lists the protobuf media type
+    with a quality at least as high as the one given to SSE. Wildcards alone
+    never switch a client to the binary format.
+    """
+    accepted = parse_accept(accept)
+    protobuf = get_media_type_priority(AGUI_MEDIA_TYPE, accepted, 0)
+    sse = get_media_type_priority(SSE_MEDIA_TYPE, accepted, 1)
+    return protobuf.q > 0 and bool(protobuf.s & 2) and protobuf.q >= sse.q
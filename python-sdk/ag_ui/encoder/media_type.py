@@ -0,0 +1,188 @@
+"""
+This module contains Accept header negotiation for the EventEncoder.
+
+Ported from `typescript-sdk/packages/encoder/src/media-type.ts`, which is
+modified from https://github.com/jshttp/negotiator/blob/master/lib/mediaType.js
+(MIT Licensed, Copyright(c) 2012 Isaac Z. Schlueter, Copyright(c) 2014 Federico
+Romero, Copyright(c) 2014-2015 Douglas Christopher Wilson).
+
+Parsed headers and negotiation results are kept in bounded LRU caches keyed by
+the raw header string, since clients send only a few distinct Accept headers.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+ACCEPT_CACHE_SIZE = 256
+
+_SIMPLE_MEDIA_TYPE = re.compile(r"^\s*([^\s/;]+)/([^;\s]+)\s*(?:;(.*))?$", re.DOTALL)
+_LEADING_FLOAT = re.compile(r"^\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+class MediaType(NamedTuple):
+    """
+    A media range parsed from an Accept header.
+    """
+    type: str
+    subtype: str
+    params: Dict[str, str]
+    q: float
+    i: int
+
+
+class Priority(NamedTuple):
+    """
+    How well a provided media type matches an Accept header.
+
+    `o` is the index of the matching media range in the header, `q` its
+    quality, `s` its specificity (4: type, 2: subtype, 1: parameters matched)
+    and `i` the index of the media type in the provided list.
+    """
+    o: int
+    q: float
+    s: int
+    i: int
+
+
+def preferred_media_types(accept: Optional[str] = None, provided: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Returns the provided media types acceptable to the client, most preferred
+    first. Without `provided`, returns all media types listed in the header.
+    A missing header accepts everything (RFC 2616 sec 14.2).
+    """
+    return list(_preferred_media_types(accept, None if provided is None else tuple(provided)))
+
+
+def negotiate_media_type(accept: Optional[str], provided: Sequence[str]) -> Optional[str]:
+    """
+    Returns the provided media type preferred by the client, or None if none
+    of them is acceptable.
+    """
+    preferred = _preferred_media_types(accept, tuple(provided))
+    return preferred[0] if preferred else None
+
+
+@lru_cache(maxsize=ACCEPT_CACHE_SIZE)
+def _preferred_media_types(accept: Optional[str], provided: Optional[Tuple[str, ...]]) -> Tuple[str, ...]:
+    accepts = parse_accept("*/*" if accept is None else accept)
+
+    if provided is None:
+        # sorted list of all types
+        return tuple(
+            f"{spec.type}/{spec.subtype}"
+            for spec in sorted((spec for spec in accepts if spec.q > 0), key=lambda spec: (-spec.q, spec.i))
+        )
+
+    priorities = [get_media_type_priority(media_type, accepts, index) for index, media_type in enumerate(provided)]
+
+    # sorted list of accepted types
+    return tuple(
+        provided[priority.i]
+        for priority in sorted((priority for priority in priorities if priority.q > 0), key=_spec_key)
+    )
+
+
+@lru_cache(maxsize=ACCEPT_CACHE_SIZE)
+def parse_accept(accept: str) -> Tuple[MediaType, ...]:
+    """
+    Parses an Accept header into its media ranges. Invalid ranges are skipped.
+    """
+    result = []
+    for i, media_range in enumerate(_split_quoted(accept, ",")):
+        media_type = _parse_media_type(media_range.strip(), i)
+        if media_type:
+            result.append(media_type)
+    return tuple(result)
+
+
+def get_media_type_priority(media_type: str, accepted: Sequence[MediaType], index: int) -> Priority:
+    """
+    Returns the best match of a media type in the parsed Accept header.
+    """
+    priority = Priority(o=-1, q=0.0, s=0, i=index)
+    parsed = _parse_media_type(media_type, 0)
+    if parsed is None:
+        return priority
+
+    for spec in accepted:
+        match = _specify(parsed, spec, index)
+        if match and (priority.s - match.s or priority.q - match.q or priority.o - match.o) < 0:
+            priority = match
+    return priority
+
+
+def _parse_media_type(value: str, i: int) -> Optional[MediaType]:
+    match = _SIMPLE_MEDIA_TYPE.match(value)
+    if not match:
+        return None
+
+    params: Dict[str, str] = {}
+    q = 1.0
+    if match.group(3):
+        for parameter in _split_quoted(match.group(3), ";"):
+            key, _, val = parameter.strip().partition("=")
+            key = key.lower()
+
+            # get the value, unwrapping quotes
+            if len(val) > 1 and val[0] == '"' and val[-1] == '"':
+                val = val[1:-1]
+
+            if key == "q":
+                q = _parse_quality(val)
+                break
+
+            params[key] = val
+
+    return MediaType(type=match.group(1), subtype=match.group(2), params=params, q=q, i=i)
+
+
+def _parse_quality(value: str) -> float:
+    """
+    Parses a quality value like JavaScript's parseFloat, returning 0 for
+    values that are not numbers.
+    """
+    match = _LEADING_FLOAT.match(value)
+    return float(match.group(0)) if match else 0.0
+
+
+def _specify(parsed: MediaType, spec: MediaType, index: int) -> Optional[Priority]:
+    s = 0
+    if spec.type.lower() == parsed.type.lower():
+        s |= 4
+    elif spec.type != "*":
+        return None
+
+    if spec.subtype.lower() == parsed.subtype.lower():
+        s |= 2
+    elif spec.subtype != "*":
+        return None
+
+    if spec.params:
+        if all(
+            value == "*" or value.lower() == parsed.params.get(key, "").lower()
+            for key, value in spec.params.items()
+        ):
+            s |= 1
+        else:
+            return None
+
+    return Priority(o=spec.i, q=spec.q, s=s, i=index)
+
+
+def _spec_key(priority: Priority):
+    return (-priority.q, -priority.s, priority.o, priority.i)
+
+
+def _split_quoted(value: str, separator: str) -> List[str]:
+    """
+    Splits a header value on a separator, except inside quoted strings.
+    """
+    parts = value.split(separator)
+    result = [parts[0]]
+    for part in parts[1:]:
+        if result[-1].count('"') % 2 == 0:
+            result.append(part)
+        else:
+            result[-1] += separator + part
+    return result
@@ -0,0 +1,92 @@
+"""
+This module contains the EventStage base class for stages in front of the EventEncoder.
+"""
+
+import asyncio
+import time
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List, Optional
+
+from ag_ui.core.events import BaseEvent
+
+
+class EventStage:
+    """
+    Base class for pipeline stages that transform a stream of events before it
+    is encoded, for example by merging or dropping events.
+
+    Subclasses implement `push`, and `flush` if they hold back events. Stages
+    with time windows also implement `deadline` and `poll`, so that held back
+    events are released while the producer is idle.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+
+    def push(self, event: BaseEvent) -> List[BaseEvent]:
+        """
+        Adds an event to the stage. Returns the events that are ready to be sent.
+        """
+        raise NotImplementedError
+
+    def flush(self) -> List[BaseEvent]:
+        """
+        Returns all events held back by the stage.
+        """
+        return []
+
+    def deadline(self) -> Optional[float]:
+        """
+        Returns the clock time at which `poll` needs to be called, or None if
+        the stage is not waiting for a time window to end.
+        """
+        return None
+
+    def poll(self) -> List[BaseEvent]:
+        """
+        Returns the events whose time window has ended.
+        """
+        return []
+
+    def process(self, events: Iterable[BaseEvent]) -> Iterator[BaseEvent]:
+        """
+        Runs a synchronous stream of events through the stage.
+        """
+        for event in events:
+            yield from self.push(event)
+        yield from self.flush()
+
+    async def stream(self, events: AsyncIterable[BaseEvent]) -> AsyncIterator[BaseEvent]:
+        """
+        Runs an asynchronous stream of events through the stage, releasing held
+        back events when their time window ends even if no new event arrives.
+        """
+        iterator = events.__aiter__()
+        pending = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                deadline = self.deadline()
+                timeout = None if deadline is None else max(deadline - self.clock(), 0)
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    for ready in self.poll():
+                        yield ready
+                    continue
+                try:
+                    event = pending.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+                for ready in self.push(event):
+                    yield ready
+            for ready in self.flush():
+                yield ready
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.wait((pending,))
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
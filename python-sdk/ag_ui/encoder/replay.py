@@ -0,0 +1,139 @@
+"""
+This module contains the ReplayBuffer class for resumable SSE streams.
+"""
+
+import asyncio
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Deque, List, Optional, Union
+
+from ag_ui.core.events import BaseEvent
+from ag_ui.encoder.encoder import EventEncoder
+
+
+class ReplayGapError(LookupError):
+    """
+    Raised when a client resumes after an event that is no longer buffered.
+    The run cannot be resumed and has to be restarted.
+    """
+
+
+class ReplayBuffer:
+    """
+    Keeps the last `max_events` SSE frames of a run so that clients can
+    reconnect with `Last-Event-ID` and continue where they left off.
+
+    Events are encoded once, with monotonically increasing ids, when they are
+    appended. Subscribers get the stored frames, first the ones after their
+    last event id and then live ones as they are appended.
+    """
+
+    def __init__(self, max_events: int = 1024):
+        if max_events < 1:
+            raise ValueError("max_events must be at least 1")
+        self._encoder = EventEncoder(event_ids=True)
+        self._frames: Deque[bytes] = deque(maxlen=max_events)
+        self._closed = False
+        self._changed: Optional[asyncio.Event] = None
+
+    @property
+    def last_event_id(self) -> int:
+        """
+        The id of the last appended event, 0 if there is none.
+        """
+        return self._encoder.last_event_id
+
+    @property
+    def first_event_id(self) -> int:
+        """
+        The id of the oldest buffered event.
+        """
+        return self.last_event_id - len(self._frames) + 1
+
+    @property
+    def closed(self) -> bool:
+        """
+        True once the run has ended.
+        """
+        return self._closed
+
+    def append(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event, stores it and wakes up subscribers. Returns the SSE
+        frame, including its id.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot append to a closed replay buffer")
+        frame = self._encoder.encode_bytes(event)
+        self._frames.append(frame)
+        self._notify()
+        return frame
+
+    def close(self) -> None:
+        """
+        Marks the end of the run. Subscribers finish after the last event.
+        """
+        self._closed = True
+        self._notify()
+
+    async def feed(self, events: AsyncIterable[BaseEvent]) -> None:
+        """
+        Appends all events of an async stream and closes the buffer.
+        """
+        try:
+            async for event in events:
+                self.append(event)
+        finally:
+            self.close()
+
+    def frames_after(self, last_event_id: Union[int, str, None] = None) -> List[bytes]:
+        """
+        Returns the buffered frames after `last_event_id` (all frames if None).
+        Raises ReplayGapError if some of the requested events were dropped.
+        """
+        start = self._start_index(last_event_id)
+        return [self._frames[index] for index in range(start, len(self._frames))]
+
+    async def subscribe(self, last_event_id: Union[int, str, None] = None) -> AsyncIterator[bytes]:
+        """
+        Yields the frames after `last_event_id` and then live frames until the
+        run ends. `last_event_id` is usually the `Last-Event-ID` header of the
+        reconnecting client.
+        """
+        next_id = self._parse_event_id(last_event_id) + 1
+        while True:
+            changed = self._wait_handle()
+            if next_id <= self.last_event_id:
+                frames = self.frames_after(next_id - 1)
+                next_id = self.last_event_id + 1
+                for frame in frames:
+                    yield frame
+                continue
+            if self._closed:
+                return
+            await changed.wait()
+
+    def _start_index(self, last_event_id: Union[int, str, None]) -> int:
+        next_id = self._parse_event_id(last_event_id) + 1
+        if next_id < self.first_event_id:
+            raise ReplayGapError(
+                f"Event {next_id} is no longer buffered, the oldest buffered event is {self.first_event_id}"
+            )
+        return next_id - self.first_event_id
+
+    def _parse_event_id(self, last_event_id: Union[int, str, None]) -> int:
+        if last_event_id is None or last_event_id == "":
+            return 0
+        event_id = int(last_event_id)
+        if event_id < 0 or event_id > self.last_event_id:
+            raise ValueError(f"Unknown event id: {last_event_id}")
+        return event_id
+
+    def _wait_handle(self) -> asyncio.Event:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
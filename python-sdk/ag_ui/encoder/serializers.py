@@ -0,0 +1,115 @@
+"""
+This module contains the JSON serializers used by the EventEncoder.
+
+Fixed-shape events that make up most of a stream (text message content and
+tool call arguments) are serialized from precompiled templates instead of going
+through pydantic. The output is byte-identical to the generic path, which is
+used for every other event and whenever an event does not fit its template.
+"""
+
+from json.encoder import encode_basestring
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from ag_ui.core.events import (
+    BaseEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+)
+
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+
+FastSerializer = Callable[[BaseEvent], Optional[str]]
+
+# event class -> names of its (required, string) fields after the base fields
+_FIXED_SHAPE_EVENTS: Dict[Type[BaseEvent], Tuple[str, ...]] = {
+    TextMessageContentEvent: ("message_id", "delta"),
+    ToolCallArgsEvent: ("tool_call_id", "delta"),
+    TextMessageEndEvent: ("message_id",),
+    ToolCallEndEvent: ("tool_call_id",),
+}
+
+
+def _compile(cls: Type[BaseEvent], fields: Tuple[str, ...], framing: Tuple[str, str]) -> FastSerializer:
+    """
+    Compiles a serializer for an event class whose own fields are all strings.
+
+    The serializer returns None if the event does not fit the template, for
+    example because it carries a `raw_event`.
+    """
+    event_type = cls.model_fields["type"].annotation.__args__[0].value
+    prefix, suffix = framing
+    body = "".join(f',"{cls.model_fields[name].alias}":%s' for name in fields) + "}" + suffix
+    head = prefix + f'{{"type":"{event_type}"'
+    template = head + body
+    timestamp_template = head + ',"timestamp":%d' + body
+
+    def serialize(event: BaseEvent) -> Optional[str]:
+        values = event.__dict__
+        if values["raw_event"] is not None:
+            return None
+        strings = tuple(values[name] for name in fields)
+        for value in strings:
+            if type(value) is not str:
+                return None
+        escaped = tuple(map(encode_basestring, strings))
+        timestamp = values["timestamp"]
+        if timestamp is None:
+            return template % escaped
+        if type(timestamp) is not int:
+            return None
+        return timestamp_template % ((timestamp,) + escaped)
+
+    return serialize
+
+
+_JSON_SERIALIZERS: Dict[Type[BaseEvent], FastSerializer] = {
+    cls: _compile(cls, fields, ("", "")) for cls, fields in _FIXED_SHAPE_EVENTS.items()
+}
+
+_SSE_SERIALIZERS: Dict[Type[BaseEvent], FastSerializer] = {
+    cls: _compile(cls, fields, ("data: ", "\n\n")) for cls, fields in _FIXED_SHAPE_EVENTS.items()
+}
+
+
+def _fast(serializers: Dict[Type[BaseEvent], FastSerializer], event: BaseEvent) -> Optional[bytes]:
+    serializer = serializers.get(type(event))
+    if serializer is None:
+        return None
+    result = serializer(event)
+    if result is None:
+        return None
+    try:
+        return result.encode("utf-8")
+    except UnicodeEncodeError:
+        # lone surrogates, let the generic path report the error
+        return None
+
+
+def serialize_json_generic(event: BaseEvent) -> bytes:
+    """
+    Serializes an event to JSON bytes using pydantic.
+    """
+    return event.__pydantic_serializer__.to_json(event, by_alias=True, exclude_none=True)
+
+
+def serialize_json(event: BaseEvent) -> bytes:
+    """
+    Serializes an event to JSON bytes, in camelCase and without null fields.
+    """
+    result = _fast(_JSON_SERIALIZERS, event)
+    if result is None:
+        return serialize_json_generic(event)
+    return result
+
+
+def serialize_sse(event: BaseEvent) -> bytes:
+    """
+    Serializes an event to a complete SSE frame (`data: {json}\\n\\n`).
+    """
+    result = _fast(_SSE_SERIALIZERS, event)
+    if result is None:
+        return b"".join((SSE_PREFIX, serialize_json_generic(event), SSE_SUFFIX))
+    return result
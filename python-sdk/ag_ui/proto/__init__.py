@@ -0,0 +1,7 @@
+"""
+This module contains the protocol buffer encoding for the Agent User Interaction Protocol.
+"""
+
+from ag_ui.proto.proto import encode, decode, peek, AGUI_MEDIA_TYPE
+
+__all__ = ["encode", "decode", "peek", "AGUI_MEDIA_TYPE"]
@@ -0,0 +1,521 @@
+"""
+This module contains the protocol buffer encoding of Agent User Interaction events.
+
+The wire format follows the schema in `typescript-sdk/packages/proto/src/proto`
+(`events.proto`, `patch.proto` and `types.proto`), so events encoded here can be
+decoded by `@ag-ui/proto` and vice versa.
+"""
+
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, Type
+
+from ag_ui.core.events import (
+    EventType,
+    BaseEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+)
+from ag_ui.proto.wire import (
+    Buffer,
+    WIRE_VARINT,
+    iter_fields,
+    read_double,
+    to_int64,
+    write_double,
+    write_length_delimited,
+    write_string,
+    write_tag,
+    write_varint,
+)
+
+AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+
+# Field kinds used in the schema tables below
+STRING = "string"                    # proto3 string, omitted when empty
+OPTIONAL_STRING = "optional_string"  # `optional string`, written whenever set
+VALUE = "value"                      # google.protobuf.Value
+MESSAGES = "messages"                # repeated ag_ui.Message
+PATCH = "patch"                      # repeated ag_ui.JsonPatchOperation
+
+# ag_ui.EventType enum values used in BaseEvent.type
+_PROTO_EVENT_TYPES = {
+    EventType.TEXT_MESSAGE_START: 0,
+    EventType.TEXT_MESSAGE_CONTENT: 1,
+    EventType.TEXT_MESSAGE_END: 2,
+    EventType.TOOL_CALL_START: 3,
+    EventType.TOOL_CALL_ARGS: 4,
+    EventType.TOOL_CALL_END: 5,
+    EventType.STATE_SNAPSHOT: 6,
+    EventType.STATE_DELTA: 7,
+    EventType.MESSAGES_SNAPSHOT: 8,
+    EventType.RAW: 9,
+    EventType.CUSTOM: 10,
+    EventType.RUN_STARTED: 11,
+    EventType.RUN_FINISHED: 12,
+    EventType.RUN_ERROR: 13,
+    EventType.STEP_STARTED: 14,
+    EventType.STEP_FINISHED: 15,
+}
+
+# ag_ui.JsonPatchOperationType
+_PATCH_OPS = ["add", "remove", "replace", "move", "copy", "test"]
+_PATCH_OP_VALUES = {op: index for index, op in enumerate(_PATCH_OPS)}
+
+# event type -> (field number in the ag_ui.Event oneof, event class, fields)
+# fields are (field number, field name, kind); field 1 is always base_event.
+_SCHEMA = {
+    EventType.TEXT_MESSAGE_START: (1, TextMessageStartEvent, (
+        (2, "message_id", STRING),
+        (3, "role", OPTIONAL_STRING),
+    )),
+    EventType.TEXT_MESSAGE_CONTENT: (2, TextMessageContentEvent, (
+        (2, "message_id", STRING),
+        (3, "delta", STRING),
+    )),
+    EventType.TEXT_MESSAGE_END: (3, TextMessageEndEvent, (
+        (2, "message_id", STRING),
+    )),
+    EventType.TOOL_CALL_START: (4, ToolCallStartEvent, (
+        (2, "tool_call_id", STRING),
+        (3, "tool_call_name", STRING),
+        (4, "parent_message_id", OPTIONAL_STRING),
+    )),
+    EventType.TOOL_CALL_ARGS: (5, ToolCallArgsEvent, (
+        (2, "tool_call_id", STRING),
+        (3, "delta", STRING),
+    )),
+    EventType.TOOL_CALL_END: (6, ToolCallEndEvent, (
+        (2, "tool_call_id", STRING),
+    )),
+    EventType.STATE_SNAPSHOT: (7, StateSnapshotEvent, (
+        (2, "snapshot", VALUE),
+    )),
+    EventType.STATE_DELTA: (8, StateDeltaEvent, (
+        (2, "delta", PATCH),
+    )),
+    EventType.MESSAGES_SNAPSHOT: (9, MessagesSnapshotEvent, (
+        (2, "messages", MESSAGES),
+    )),
+    EventType.RAW: (10, RawEvent, (
+        (2, "event", VALUE),
+        (3, "source", OPTIONAL_STRING),
+    )),
+    EventType.CUSTOM: (11, CustomEvent, (
+        (2, "name", STRING),
+        (3, "value", VALUE),
+    )),
+    EventType.RUN_STARTED: (12, RunStartedEvent, (
+        (2, "thread_id", STRING),
+        (3, "run_id", STRING),
+    )),
+    EventType.RUN_FINISHED: (13, RunFinishedEvent, (
+        (2, "thread_id", STRING),
+        (3, "run_id", STRING),
+    )),
+    EventType.RUN_ERROR: (14, RunErrorEvent, (
+        (2, "code", OPTIONAL_STRING),
+        (3, "message", STRING),
+    )),
+    EventType.STEP_STARTED: (15, StepStartedEvent, (
+        (2, "step_name", STRING),
+    )),
+    EventType.STEP_FINISHED: (16, StepFinishedEvent, (
+        (2, "step_name", STRING),
+    )),
+    EventType.TEXT_MESSAGE_CHUNK: (17, TextMessageChunkEvent, (
+        (2, "message_id", OPTIONAL_STRING),
+        (3, "role", OPTIONAL_STRING),
+        (4, "delta", OPTIONAL_STRING),
+    )),
+    EventType.TOOL_CALL_CHUNK: (18, ToolCallChunkEvent, (
+        (2, "tool_call_id", OPTIONAL_STRING),
+        (3, "tool_call_name", OPTIONAL_STRING),
+        (4, "parent_message_id", OPTIONAL_STRING),
+        (5, "delta", OPTIONAL_STRING),
+    )),
+}
+
+_ONEOF_FIELDS = {
+    oneof_field: (event_type, cls, {number: (name, kind) for number, name, kind in fields})
+    for event_type, (oneof_field, cls, fields) in _SCHEMA.items()
+}
+
+
+def encode(event: BaseEvent) -> bytes:
+    """
+    Encodes an event to the protocol buffer binary format (without length prefix).
+    """
+    fast_encoder = _FAST_ENCODERS.get(type(event))
+    if fast_encoder is not None:
+        result = fast_encoder(event)
+        if result is not None:
+            return result
+    return _encode_generic(event)
+
+
+def _encode_generic(event: BaseEvent) -> bytes:
+    """
+    Encodes any event by walking its JSON compatible dump.
+    """
+    data = event.model_dump(mode="json", exclude_none=True)
+    event_type = EventType(data["type"])
+    oneof_field, _, fields = _SCHEMA[event_type]
+
+    base_event = bytearray()
+    proto_type = _PROTO_EVENT_TYPES.get(event_type, 0)
+    if proto_type:
+        write_tag(base_event, 1, WIRE_VARINT)
+        write_varint(base_event, proto_type)
+    if "timestamp" in data:
+        write_tag(base_event, 2, WIRE_VARINT)
+        write_varint(base_event, data["timestamp"])
+    if "raw_event" in data:
+        write_length_delimited(base_event, 3, _encode_value(data["raw_event"]))
+
+    body = bytearray()
+    write_length_delimited(body, 1, base_event)
+    for number, name, kind in fields:
+        if name not in data:
+            continue
+        value = data[name]
+        if kind == STRING:
+            if value:
+                write_string(body, number, value)
+        elif kind == OPTIONAL_STRING:
+            write_string(body, number, value)
+        elif kind == VALUE:
+            write_length_delimited(body, number, _encode_value(value))
+        elif kind == MESSAGES:
+            for message in value:
+                write_length_delimited(body, number, _encode_message(message))
+        elif kind == PATCH:
+            for operation in value:
+                write_length_delimited(body, number, _encode_patch_operation(operation))
+
+    result = bytearray()
+    write_length_delimited(result, oneof_field, body)
+    return bytes(result)
+
+
+def _compile_fixed_shape(cls: Type[BaseEvent], fields: Tuple[str, ...]) -> Callable[[BaseEvent], Optional[bytes]]:
+    """
+    Compiles an encoder for an event class whose own fields are all required
+    strings, skipping the pydantic dump. Returns None for events that do not
+    fit, which are then encoded by the generic path.
+    """
+    event_type = cls.model_fields["type"].annotation.__args__[0]
+    oneof_field, _, schema_fields = _SCHEMA[event_type]
+    numbers = {name: number for number, name, _ in schema_fields}
+    string_fields = tuple((numbers[name], name) for name in fields)
+    base_type = bytearray()
+    proto_type = _PROTO_EVENT_TYPES.get(event_type, 0)
+    if proto_type:
+        write_tag(base_type, 1, WIRE_VARINT)
+        write_varint(base_type, proto_type)
+    base_type = bytes(base_type)
+
+    def encode_fixed_shape(event: BaseEvent) -> Optional[bytes]:
+        values = event.__dict__
+        if values["raw_event"] is not None:
+            return None
+        base_event = base_type
+        timestamp = values["timestamp"]
+        if timestamp is not None:
+            if type(timestamp) is not int:
+                return None
+            base_event = bytearray(base_type)
+            write_tag(base_event, 2, WIRE_VARINT)
+            write_varint(base_event, timestamp)
+        body = bytearray()
+        write_length_delimited(body, 1, base_event)
+        for number, name in string_fields:
+            value = values[name]
+            if type(value) is not str:
+                return None
+            if value:
+                try:
+                    write_string(body, number, value)
+                except UnicodeEncodeError:
+                    return None
+        result = bytearray()
+        write_length_delimited(result, oneof_field, body)
+        return bytes(result)
+
+    return encode_fixed_shape
+
+
+_FAST_ENCODERS = {
+    cls: _compile_fixed_shape(cls, fields)
+    for cls, fields in (
+        (TextMessageContentEvent, ("message_id", "delta")),
+        (ToolCallArgsEvent, ("tool_call_id", "delta")),
+        (TextMessageEndEvent, ("message_id",)),
+        (ToolCallEndEvent, ("tool_call_id",)),
+    )
+}
+
+
+def decode(data: Buffer) -> BaseEvent:
+    """
+    Decodes an event from the protocol buffer binary format (without length prefix).
+    """
+    view = memoryview(data)
+    body = None
+    schema = None
+    for number, _, value in iter_fields(view):
+        if number in _ONEOF_FIELDS:
+            body = value
+            schema = _ONEOF_FIELDS[number]
+    if schema is None:
+        raise ValueError("Invalid event")
+    event_type, cls, fields = schema
+
+    result: Dict[str, Any] = {"type": event_type}
+    for number, wire_type, value in iter_fields(body):
+        if number == 1:
+            _decode_base_event(value, result)
+            continue
+        field = fields.get(number)
+        if field is None:
+            continue
+        name, kind = field
+        if kind in (STRING, OPTIONAL_STRING):
+            result[name] = str(value, "utf-8")
+        elif kind == VALUE:
+            result[name] = _decode_value(value)
+        elif kind == MESSAGES:
+            result.setdefault(name, []).append(_decode_message(value))
+        elif kind == PATCH:
+            result.setdefault(name, []).append(_decode_patch_operation(value))
+
+    # fill in proto3 defaults for fields that are omitted on the wire
+    for name, kind in fields.values():
+        if name in result:
+            continue
+        if kind == STRING:
+            result[name] = ""
+        elif kind == VALUE:
+            result[name] = None
+        elif kind in (MESSAGES, PATCH):
+            result[name] = []
+
+    return cls.model_validate(result)
+
+
+def peek(data: Buffer, names: Collection[str]) -> Tuple[EventType, Dict[str, str]]:
+    """
+    Reads the event type and the requested string fields of an encoded event
+    without decoding the rest of it or validating it. Fields that are not set
+    are left out of the result.
+    """
+    view = memoryview(data)
+    body = None
+    schema = None
+    for number, _, value in iter_fields(view):
+        if number in _ONEOF_FIELDS:
+            body = value
+            schema = _ONEOF_FIELDS[number]
+    if schema is None:
+        raise ValueError("Invalid event")
+    event_type, _, fields = schema
+
+    result: Dict[str, str] = {}
+    for number, _, value in iter_fields(body):
+        field = fields.get(number)
+        if field is not None and field[0] in names and field[1] in (STRING, OPTIONAL_STRING):
+            result[field[0]] = str(value, "utf-8")
+    return event_type, result
+
+
+def _decode_base_event(view: memoryview, result: Dict[str, Any]) -> None:
+    for number, _, value in iter_fields(view):
+        if number == 2:
+            result["timestamp"] = to_int64(value)
+        elif number == 3:
+            result["raw_event"] = _decode_value(value)
+
+
+def _encode_value(value: Any) -> bytearray:
+    """
+    Encodes a JSON compatible value as google.protobuf.Value.
+    """
+    buffer = bytearray()
+    if value is None:
+        write_tag(buffer, 1, WIRE_VARINT)
+        write_varint(buffer, 0)
+    elif isinstance(value, bool):
+        write_tag(buffer, 4, WIRE_VARINT)
+        write_varint(buffer, int(value))
+    elif isinstance(value, (int, float)):
+        write_double(buffer, 2, float(value))
+    elif isinstance(value, str):
+        write_string(buffer, 3, value)
+    elif isinstance(value, dict):
+        struct = bytearray()
+        for key, item in value.items():
+            entry = bytearray()
+            write_string(entry, 1, str(key))
+            write_length_delimited(entry, 2, _encode_value(item))
+            write_length_delimited(struct, 1, entry)
+        write_length_delimited(buffer, 5, struct)
+    elif isinstance(value, (list, tuple)):
+        values = bytearray()
+        for item in value:
+            write_length_delimited(values, 1, _encode_value(item))
+        write_length_delimited(buffer, 6, values)
+    else:
+        raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+    return buffer
+
+
+def _decode_value(view: memoryview) -> Any:
+    """
+    Decodes a google.protobuf.Value. Integral numbers are returned as `int`,
+    since JSON (and therefore Value) does not distinguish integers from floats.
+    """
+    result = None
+    for number, _, value in iter_fields(view):
+        if number == 1:
+            result = None
+        elif number == 2:
+            result = read_double(value)
+            if result.is_integer():
+                result = int(result)
+        elif number == 3:
+            result = str(value, "utf-8")
+        elif number == 4:
+            result = bool(value)
+        elif number == 5:
+            result = {}
+            for _, _, entry in iter_fields(value):
+                key = ""
+                item = None
+                for entry_number, _, entry_value in iter_fields(entry):
+                    if entry_number == 1:
+                        key = str(entry_value, "utf-8")
+                    elif entry_number == 2:
+                        item = _decode_value(entry_value)
+                result[key] = item
+        elif number == 6:
+            result = [_decode_value(item) for _, _, item in iter_fields(value)]
+    return result
+
+
+def _encode_message(message: Dict[str, Any]) -> bytearray:
+    buffer = bytearray()
+    if message.get("id"):
+        write_string(buffer, 1, message["id"])
+    if message.get("role"):
+        write_string(buffer, 2, message["role"])
+    if "content" in message:
+        write_string(buffer, 3, message["content"])
+    if "name" in message:
+        write_string(buffer, 4, message["name"])
+    for tool_call in message.get("tool_calls") or ():
+        write_length_delimited(buffer, 5, _encode_tool_call(tool_call))
+    if "tool_call_id" in message:
+        write_string(buffer, 6, message["tool_call_id"])
+    return buffer
+
+
+def _decode_message(view: memoryview) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"id": "", "role": ""}
+    tool_calls: List[Dict[str, Any]] = []
+    for number, _, value in iter_fields(view):
+        if number == 1:
+            message["id"] = str(value, "utf-8")
+        elif number == 2:
+            message["role"] = str(value, "utf-8")
+        elif number == 3:
+            message["content"] = str(value, "utf-8")
+        elif number == 4:
+            message["name"] = str(value, "utf-8")
+        elif number == 5:
+            tool_calls.append(_decode_tool_call(value))
+        elif number == 6:
+            message["tool_call_id"] = str(value, "utf-8")
+    # tool calls are optional, an empty repeated field means they were not set
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return message
+
+
+def _encode_tool_call(tool_call: Dict[str, Any]) -> bytearray:
+    buffer = bytearray()
+    if tool_call.get("id"):
+        write_string(buffer, 1, tool_call["id"])
+    if tool_call.get("type"):
+        write_string(buffer, 2, tool_call["type"])
+    function = tool_call.get("function")
+    if function is not None:
+        encoded_function = bytearray()
+        if function.get("name"):
+            write_string(encoded_function, 1, function["name"])
+        if function.get("arguments"):
+            write_string(encoded_function, 2, function["arguments"])
+        write_length_delimited(buffer, 3, encoded_function)
+    return buffer
+
+
+def _decode_tool_call(view: memoryview) -> Dict[str, Any]:
+    tool_call: Dict[str, Any] = {"id": "", "type": ""}
+    for number, _, value in iter_fields(view):
+        if number == 1:
+            tool_call["id"] = str(value, "utf-8")
+        elif number == 2:
+            tool_call["type"] = str(value, "utf-8")
+        elif number == 3:
+            function = {"name": "", "arguments": ""}
+            for function_number, _, function_value in iter_fields(value):
+                if function_number == 1:
+                    function["name"] = str(function_value, "utf-8")
+                elif function_number == 2:
+                    function["arguments"] = str(function_value, "utf-8")
+            tool_call["function"] = function
+    return tool_call
+
+
+def _encode_patch_operation(operation: Dict[str, Any]) -> bytearray:
+    buffer = bytearray()
+    op = _PATCH_OP_VALUES[operation["op"].lower()]
+    if op:
+        write_tag(buffer, 1, WIRE_VARINT)
+        write_varint(buffer, op)
+    if operation.get("path"):
+        write_string(buffer, 2, operation["path"])
+    if "from" in operation:
+        write_string(buffer, 3, operation["from"])
+    if "value" in operation:
+        write_length_delimited(buffer, 4, _encode_value(operation["value"]))
+    return buffer
+
+
+def _decode_patch_operation(view: memoryview) -> Dict[str, Any]:
+    operation: Dict[str, Any] = {"op": _PATCH_OPS[0], "path": ""}
+    for number, _, value in iter_fields(view):
+        if number == 1:
+            if value >= len(_PATCH_OPS):
+                raise ValueError(f"Unknown JSON patch operation {value}")
+            operation["op"] = _PATCH_OPS[value]
+        elif number == 2:
+            operation["path"] = str(value, "utf-8")
+        elif number == 3:
+            operation["from"] = str(value, "utf-8")
+        elif number == 4:
+            operation["value"] = _decode_value(value)
+    return operation
@@ -0,0 +1,130 @@
+"""
+This module contains low level helpers for the protocol buffer wire format.
+"""
+
+import struct
+from typing import Iterator, Tuple, Union
+
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LENGTH_DELIMITED = 2
+WIRE_FIXED32 = 5
+
+_UINT64_MASK = (1 << 64) - 1
+_INT64_SIGN = 1 << 63
+
+_DOUBLE = struct.Struct("<d")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def write_varint(buffer: bytearray, value: int) -> None:
+    """
+    Appends an unsigned varint to the buffer. Negative values are written as
+    their 64 bit two's complement, as protobuf does for int64.
+    """
+    if value < 0:
+        value &= _UINT64_MASK
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def write_tag(buffer: bytearray, field_number: int, wire_type: int) -> None:
+    """
+    Appends a field tag to the buffer.
+    """
+    write_varint(buffer, (field_number << 3) | wire_type)
+
+
+def write_length_delimited(buffer: bytearray, field_number: int, payload: Buffer) -> None:
+    """
+    Appends a length delimited field (bytes, string or embedded message).
+    """
+    write_tag(buffer, field_number, WIRE_LENGTH_DELIMITED)
+    write_varint(buffer, len(payload))
+    buffer += payload
+
+
+def write_string(buffer: bytearray, field_number: int, value: str) -> None:
+    """
+    Appends a UTF-8 encoded string field.
+    """
+    write_length_delimited(buffer, field_number, value.encode("utf-8"))
+
+
+def write_double(buffer: bytearray, field_number: int, value: float) -> None:
+    """
+    Appends a double field.
+    """
+    write_tag(buffer, field_number, WIRE_FIXED64)
+    buffer += _DOUBLE.pack(value)
+
+
+def read_varint(data: Buffer, pos: int) -> Tuple[int, int]:
+    """
+    Reads an unsigned varint starting at `pos`. Returns the value and the
+    position after it.
+    """
+    result = 0
+    shift = 0
+    try:
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return result, pos
+            shift += 7
+            if shift >= 70:
+                raise ValueError("Malformed varint")
+    except IndexError as exc:
+        raise ValueError("Truncated varint") from exc
+
+
+def to_int64(value: int) -> int:
+    """
+    Interprets a decoded varint as a signed 64 bit integer.
+    """
+    value &= _UINT64_MASK
+    return value - (1 << 64) if value & _INT64_SIGN else value
+
+
+def read_double(data: Buffer) -> float:
+    """
+    Reads a little endian double from an 8 byte field value.
+    """
+    return _DOUBLE.unpack(data)[0]
+
+
+def iter_fields(data: memoryview, start: int = 0, end: int = None) -> Iterator[Tuple[int, int, object]]:
+    """
+    Iterates over the fields of an encoded message.
+
+    Yields `(field_number, wire_type, value)` where value is an `int` for varint
+    fields and a `memoryview` slice for all other wire types.
+    """
+    pos = start
+    end = len(data) if end is None else end
+    while pos < end:
+        tag, pos = read_varint(data, pos)
+        field_number = tag >> 3
+        wire_type = tag & 0x07
+        if wire_type == WIRE_VARINT:
+            value, pos = read_varint(data, pos)
+        elif wire_type == WIRE_LENGTH_DELIMITED:
+            length, pos = read_varint(data, pos)
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == WIRE_FIXED64:
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire_type == WIRE_FIXED32:
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        if pos > end:
+            raise ValueError("Truncated message")
+        yield field_number, wire_type, value
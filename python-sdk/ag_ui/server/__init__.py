@@ -0,0 +1,27 @@
+"""
+This module contains helpers for serving agents over the Agent User Interaction Protocol.
+"""
+
+from ag_ui.server.input import LazyMessages, LazyRunAgentInput, RunAgentInputLoader
+from ag_ui.server.threads import ThreadCache, ThreadCacheMiss, message_hash
+from ag_ui.server.tools import (
+    SchemaValidator,
+    ToolArgumentsError,
+    ToolCallValidator,
+    compile_schema,
+    validate_tool_arguments,
+)
+
+__all__ = [
+    "LazyMessages",
+    "LazyRunAgentInput",
+    "RunAgentInputLoader",
+    "ThreadCache",
+    "ThreadCacheMiss",
+    "message_hash",
+    "SchemaValidator",
+    "ToolArgumentsError",
+    "ToolCallValidator",
+    "compile_schema",
+    "validate_tool_arguments",
+]
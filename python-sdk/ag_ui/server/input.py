@@ -0,0 +1,374 @@
+"""
+This module contains the RunAgentInputLoader class for loading large
+RunAgentInput request bodies incrementally.
+"""
+
+import json
+import re
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Sequence, overload
+
+from ag_ui.core.parse import parse_message
+from ag_ui.core.types import Context, Message, RunAgentInput, Tool
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_STRUCTURE = re.compile(rb'["\[\]{}]')
+_SCALAR_END = re.compile(rb"[,}\]\s]")
+
+_MESSAGES_KEY = "messages"
+
+# parser states
+_EXPECT_OBJECT = 0
+_EXPECT_KEY = 1
+_EXPECT_COLON = 2
+_EXPECT_VALUE = 3
+_AFTER_VALUE = 4
+_EXPECT_ARRAY = 5
+_EXPECT_ELEMENT = 6
+_AFTER_ELEMENT = 7
+_DONE = 8
+
+
+class LazyMessages(Sequence[Message]):
+    """
+    The messages of a loaded RunAgentInput. Each message is kept as JSON and
+    only validated when it is first accessed.
+    """
+
+    def __init__(self, raw: Optional[List[bytes]] = None):
+        self._raw: List[bytes] = [] if raw is None else raw
+        self._messages: Dict[int, Message] = {}
+
+    @property
+    def raw(self) -> List[bytes]:
+        """
+        The JSON of each message, as received.
+        """
+        return self._raw
+
+    def _append(self, raw: bytes) -> None:
+        self._raw.append(raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Message]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._message(i) for i in range(*index.indices(len(self._raw)))]
+        if index < 0:
+            index += len(self._raw)
+        if not 0 <= index < len(self._raw):
+            raise IndexError("message index out of range")
+        return self._message(index)
+
+    def _message(self, index: int) -> Message:
+        message = self._messages.get(index)
+        if message is None:
+            message = parse_message(self._raw[index])
+            self._messages[index] = message
+        return message
+
+
+class LazyRunAgentInput:
+    """
+    A RunAgentInput whose messages are validated on access. All other fields
+    are validated when loading completes.
+    """
+
+    def __init__(self, base: RunAgentInput, messages: LazyMessages):
+        self._base = base
+        self.messages = messages
+
+    @property
+    def thread_id(self) -> str:
+        """The thread id."""
+        return self._base.thread_id
+
+    @property
+    def run_id(self) -> str:
+        """The run id."""
+        return self._base.run_id
+
+    @property
+    def state(self):
+        """The agent state."""
+        return self._base.state
+
+    @property
+    def tools(self) -> List[Tool]:
+        """The tools available to the agent."""
+        return self._base.tools
+
+    @property
+    def context(self) -> List[Context]:
+        """The context passed to the agent."""
+        return self._base.context
+
+    @property
+    def forwarded_props(self):
+        """The forwarded props."""
+        return self._base.forwarded_props
+
+    def to_model(self) -> RunAgentInput:
+        """
+        Validates all messages and returns a regular RunAgentInput.
+        """
+        return self._base.model_copy(update={"messages": list(self.messages)})
+
+
+class RunAgentInputLoader:
+    """
+    Parses a RunAgentInput JSON body as it arrives.
+
+    The body is scanned chunk by chunk. Each message is split off as soon as
+    it is complete and kept as raw JSON in `messages`, which can be read while
+    the body is still arriving. The other fields are validated by `close`.
+    Nothing but the message that is currently arriving and the small fields
+    is buffered.
+    """
+
+    def __init__(self):
+        self.messages = LazyMessages()
+        self._buffer = bytearray()
+        self._state = _EXPECT_OBJECT
+        self._first = True  # no item yet in the current object or array
+        self._key: Optional[str] = None
+        self._fields: Dict[str, bytes] = {}
+        self._has_messages = False
+        self._scanner = _ValueScanner()
+
+    def feed(self, chunk: bytes) -> int:
+        """
+        Adds a chunk of the body. Returns the number of messages completed by it.
+        Raises ValueError if the body is not a JSON object.
+        """
+        count = len(self.messages)
+        self._buffer += chunk
+        self._parse(final=False)
+        return len(self.messages) - count
+
+    def close(self) -> LazyRunAgentInput:
+        """
+        Ends the body and validates everything but the messages.
+        """
+        self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Incomplete RunAgentInput body")
+        fields = [
+            b"%s:%s" % (json.dumps(key).encode("utf-8"), value)
+            for key, value in self._fields.items()
+        ]
+        if self._has_messages:
+            fields.append(b'"messages":[]')
+        base = RunAgentInput.model_validate_json(b"{" + b",".join(fields) + b"}")
+        return LazyRunAgentInput(base, self.messages)
+
+    def load(self, chunks: Iterable[bytes]) -> LazyRunAgentInput:
+        """
+        Loads a body from a synchronous stream of chunks.
+        """
+        for chunk in chunks:
+            self.feed(chunk)
+        return self.close()
+
+    async def load_async(self, chunks: AsyncIterable[bytes]) -> LazyRunAgentInput:
+        """
+        Loads a body from an asynchronous stream of chunks, for example a
+        request body stream.
+        """
+        async for chunk in chunks:
+            self.feed(chunk)
+        return self.close()
+
+    def _parse(self, final: bool) -> None:
+        buffer = self._buffer
+        while True:
+            state = self._state
+            if state in (_EXPECT_VALUE, _EXPECT_ELEMENT) and self._scanner.started:
+                pos = 0
+            else:
+                pos = _WHITESPACE.match(buffer).end()
+                if pos:
+                    del buffer[:pos]
+                    pos = 0
+                if not buffer:
+                    return
+            char = buffer[0]
+
+            if state == _EXPECT_OBJECT:
+                self._expect(char, b"{", "RunAgentInput must be a JSON object")
+                del buffer[:1]
+                self._state = _EXPECT_KEY
+                self._first = True
+
+            elif state == _EXPECT_KEY:
+                if char == 0x7D and self._first:  # "}"
+                    del buffer[:1]
+                    self._state = _DONE
+                    continue
+                match = _STRING.match(buffer)
+                if match is None:
+                    if char != 0x22 or final:
+                        raise ValueError("Invalid JSON object key")
+                    return
+                self._key = json.loads(buffer[:match.end()])
+                del buffer[:match.end()]
+                self._state = _EXPECT_COLON
+
+            elif state == _EXPECT_COLON:
+                self._expect(char, b":", "Expected ':' in JSON object")
+                del buffer[:1]
+                if self._key == _MESSAGES_KEY:
+                    if self._has_messages:
+                        raise ValueError("Duplicate messages in RunAgentInput")
+                    self._state = _EXPECT_ARRAY
+                    self._has_messages = True
+                else:
+                    self._state = _EXPECT_VALUE
+
+            elif state == _EXPECT_VALUE:
+                end = self._scanner.scan(buffer, final)
+                if end is None:
+                    return
+                self._fields[self._key] = bytes(buffer[:end])
+                del buffer[:end]
+                self._state = _AFTER_VALUE
+
+            elif state == _AFTER_VALUE:
+                if char == 0x2C:  # ","
+                    self._state = _EXPECT_KEY
+                    self._first = False
+                elif char == 0x7D:  # "}"
+                    self._state = _DONE
+                else:
+                    raise ValueError("Expected ',' or '}' in JSON object")
+                del buffer[:1]
+
+            elif state == _EXPECT_ARRAY:
+                self._expect(char, b"[", "messages must be a JSON array")
+                del buffer[:1]
+                self._state = _EXPECT_ELEMENT
+                self._first = True
+
+            elif state == _EXPECT_ELEMENT:
+                if char == 0x5D and self._first and not self._scanner.started:  # "]"
+                    del buffer[:1]
+                    self._state = _AFTER_VALUE
+                    continue
+                end = self._scanner.scan(buffer, final)
+                if end is None:
+                    return
+                self.messages._append(bytes(buffer[:end]))  # pylint: disable=protected-access
+                del buffer[:end]
+                self._state = _AFTER_ELEMENT
+
+            elif state == _AFTER_ELEMENT:
+                if char == 0x2C:  # ","
+                    self._state = _EXPECT_ELEMENT
+                    self._first = False
+                elif char == 0x5D:  # "]"
+                    self._state = _AFTER_VALUE
+                else:
+                    raise ValueError("Expected ',' or ']' in messages")
+                del buffer[:1]
+
+            else:
+                raise ValueError("Unexpected data after RunAgentInput")
+
+    @staticmethod
+    def _expect(char: int, expected: bytes, message: str) -> None:
+        if char != expected[0]:
+            raise ValueError(message)
+
+
+class _ValueScanner:
+    """
+    Finds the end of a JSON value that arrives in pieces, resuming where the
+    previous scan stopped. The value is not decoded or checked for validity.
+    """
+
+    def __init__(self):
+        self.started = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+
+    def scan(self, data: bytearray, final: bool) -> Optional[int]:
+        """
+        Returns the end of the value starting at the beginning of `data`, or
+        None if more data is needed.
+        """
+        pos = self._pos
+        end = len(data)
+        if not self.started:
+            char = data[0]
+            self.started = True
+            if char == 0x22:  # '"'
+                self._in_string = True
+                pos = 1
+            elif char in (0x7B, 0x5B):  # "{", "["
+                self._depth = 1
+                pos = 1
+            elif char in (0x2C, 0x3A, 0x5D, 0x7D):  # ",", ":", "]", "}"
+                self.started = False
+                raise ValueError("Expected a JSON value")
+            else:
+                match = _SCALAR_END.search(data)
+                self.started = False
+                if match is not None:
+                    return self._done(match.start())
+                if final:
+                    return self._done(end)
+                return None
+
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(data, pos)
+                if match is None:
+                    pos = end
+                    break
+                if data[match.start()] == 0x5C:  # backslash, skip the escaped character
+                    if match.end() >= end:
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                pos = match.end()
+                self._in_string = False
+                if self._depth == 0:
+                    return self._done(pos)
+                continue
+
+            match = _STRUCTURE.search(data, pos)
+            if match is None:
+                pos = end
+                break
+            pos = match.end()
+            char = data[match.start()]
+            if char == 0x22:
+                self._in_string = True
+            elif char in (0x7B, 0x5B):
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._done(pos)
+
+        if final:
+            raise ValueError("Unterminated JSON value")
+        self._pos = pos
+        return None
+
+    def _done(self, end: int) -> int:
+        self.started = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        return end
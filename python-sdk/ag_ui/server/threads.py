@@ -0,0 +1,193 @@
+"""
+This module contains the ThreadCache class, which keeps the validated message
+history of recent threads on the server.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from ag_ui.core.types import Message
+
+
+class ThreadCacheMiss(LookupError):
+    """
+    Raised when a run references a thread or message prefix that is not
+    cached. The client has to send the full message history instead.
+    """
+
+
+class _Thread:
+    __slots__ = ("messages", "hashes", "positions", "expires")
+
+    def __init__(self, messages: List[Message], hashes: List[str], expires: float):
+        self.messages = messages
+        self.hashes = hashes
+        # message id -> position of the last message with that id
+        self.positions: Dict[str, int] = {message.id: index for index, message in enumerate(messages)}
+        self.expires = expires
+
+
+class ThreadCache:
+    """
+    Keeps the validated messages of recently used threads, so that a run can
+    send only the messages that are new since the previous run.
+
+    A run references the part of the history it continues from by the id of
+    its last message or by its prefix hash. The prefix hash of the messages up
+    to a position chains the SHA-256 of each message's JSON, and is returned
+    by `prefix_hash` so the server can hand it to the client. Threads that
+    were not used for `ttl` seconds are dropped, and at most `max_threads`
+    threads are kept, dropping the least recently used first.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 1024,
+        ttl: Optional[float] = 3600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_threads < 1:
+            raise ValueError("max_threads must be at least 1")
+        self.max_threads = max_threads
+        self.ttl = ttl
+        self.clock = clock
+        self._threads: "OrderedDict[str, _Thread]" = OrderedDict()
+
+    def get(self, thread_id: str) -> Optional[List[Message]]:
+        """
+        Returns the cached messages of a thread, or None if it is not cached.
+        """
+        thread = self._lookup(thread_id)
+        return None if thread is None else list(thread.messages)
+
+    def prefix_hash(self, thread_id: str) -> Optional[str]:
+        """
+        Returns the prefix hash of all cached messages of a thread, or None if
+        the thread is not cached or has no messages.
+        """
+        thread = self._lookup(thread_id)
+        if thread is None or not thread.hashes:
+            return None
+        return thread.hashes[-1]
+
+    def store(self, thread_id: str, messages: Iterable[Message]) -> List[Message]:
+        """
+        Replaces the cached history of a thread with the full message history
+        sent by a client. Returns the messages.
+        """
+        messages = list(messages)
+        self._store(thread_id, messages, _chain_hashes(None, messages))
+        return list(messages)
+
+    def extend(
+        self,
+        thread_id: str,
+        new_messages: Iterable[Message],
+        after_id: Optional[str] = None,
+        after_hash: Optional[str] = None
+    ) -> List[Message]:
+        """
+        Returns the full message history of a run that sent only its new
+        messages, and caches it for the next run.
+
+        The new messages follow the cached message with id `after_id`, or the
+        cached prefix whose hash is `after_hash`. Later cached messages, for
+        example from a regenerated answer, are dropped. Raises ThreadCacheMiss
+        if the thread or the referenced message is not cached.
+        """
+        if (after_id is None) == (after_hash is None):
+            raise ValueError("Exactly one of after_id and after_hash must be given")
+        thread = self._lookup(thread_id)
+        if thread is None:
+            raise ThreadCacheMiss(f"Thread {thread_id} is not cached")
+
+        if after_id is not None:
+            position = thread.positions.get(after_id)
+            if position is None:
+                raise ThreadCacheMiss(f"Message {after_id} is not cached for thread {thread_id}")
+        else:
+            position = _find_hash(thread.hashes, after_hash)
+            if position is None:
+                raise ThreadCacheMiss(f"Message prefix {after_hash} is not cached for thread {thread_id}")
+
+        new_messages = list(new_messages)
+        hashes = thread.hashes[:position + 1]
+        hashes.extend(_chain_hashes(hashes[-1] if hashes else None, new_messages))
+        messages = thread.messages[:position + 1] + new_messages
+        self._store(thread_id, messages, hashes)
+        return list(messages)
+
+    def discard(self, thread_id: str) -> None:
+        """
+        Removes a thread from the cache.
+        """
+        self._threads.pop(thread_id, None)
+
+    def __contains__(self, thread_id: object) -> bool:
+        return isinstance(thread_id, str) and self._lookup(thread_id) is not None
+
+    def __len__(self) -> int:
+        self._evict_expired()
+        return len(self._threads)
+
+    def _lookup(self, thread_id: str) -> Optional[_Thread]:
+        thread = self._threads.get(thread_id)
+        if thread is None:
+            return None
+        now = self.clock()
+        if self.ttl is not None and thread.expires <= now:
+            del self._threads[thread_id]
+            return None
+        self._threads.move_to_end(thread_id)
+        if self.ttl is not None:
+            thread.expires = now + self.ttl
+        return thread
+
+    def _store(self, thread_id: str, messages: List[Message], hashes: List[str]) -> None:
+        expires = float("inf") if self.ttl is None else self.clock() + self.ttl
+        self._threads[thread_id] = _Thread(messages, hashes, expires)
+        self._threads.move_to_end(thread_id)
+        self._evict_expired()
+        while len(self._threads) > self.max_threads:
+            self._threads.popitem(last=False)
+
+    def _evict_expired(self) -> None:
+        if self.ttl is None:
+            return
+        now = self.clock()
+        # threads are ordered by last use, and so by expiry time
+        while self._threads:
+            thread_id, thread = next(iter(self._threads.items()))
+            if thread.expires > now:
+                break
+            del self._threads[thread_id]
+
+
+def message_hash(previous: Optional[str], message: Message) -> str:
+    """
+    Returns the prefix hash of a message, given the prefix hash of the
+    messages before it (None for the first message).
+    """
+    digest = hashlib.sha256()
+    if previous is not None:
+        digest.update(previous.encode("ascii"))
+    digest.update(message.__pydantic_serializer__.to_json(message, by_alias=True, exclude_none=True))
+    return digest.hexdigest()
+
+
+def _chain_hashes(previous: Optional[str], messages: List[Message]) -> List[str]:
+    hashes = []
+    for message in messages:
+        previous = message_hash(previous, message)
+        hashes.append(previous)
+    return hashes
+
+
+def _find_hash(hashes: List[str], prefix_hash: str) -> Optional[int]:
+    # runs usually continue from the end of the history
+    for position in range(len(hashes) - 1, -1, -1):
+        if hashes[position] == prefix_hash:
+            return position
+    return None
@@ -0,0 +1,415 @@
+"""
+This module contains validation of tool call arguments against the JSON Schema
+in `Tool.parameters`.
+
+Schemas are compiled once into nested checker functions and cached by a hash
+of their canonical JSON, since the same tools are sent with every run. The
+compiler covers the JSON Schema keywords used for tool parameters: `type`,
+`enum`, `const`, `properties`, `required`, `additionalProperties`, `items`,
+`minItems`, `maxItems`, `uniqueItems`, `minLength`, `maxLength`, `pattern`,
+`minimum`, `maximum`, `exclusiveMinimum`, `exclusiveMaximum`, `multipleOf`,
+`allOf`, `anyOf`, `oneOf`, `not` and local `$ref`s. Other keywords are
+ignored.
+"""
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ag_ui.core.equality import json_equal
+from ag_ui.core.events import BaseEvent, ToolCallArgsEvent, ToolCallEndEvent, ToolCallStartEvent
+from ag_ui.core.types import Tool
+from ag_ui.encoder.pipeline import EventStage
+
+SCHEMA_CACHE_SIZE = 256
+
+# (value, path, errors) -> None, appends an error message for each violation
+Checker = Callable[[Any, str, List[str]], None]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "integer": lambda value: (
+        (isinstance(value, int) and not isinstance(value, bool))
+        or (isinstance(value, float) and value.is_integer())
+    ),
+}
+
+
+class ToolArgumentsError(ValueError):
+    """
+    Raised when the arguments of a tool call do not match the tool's schema.
+    """
+
+    def __init__(self, tool_name: str, errors: List[str]):
+        super().__init__(f"Invalid arguments for tool {tool_name}: " + "; ".join(errors))
+        self.tool_name = tool_name
+        self.errors = errors
+
+
+class SchemaValidator:
+    """
+    A compiled JSON Schema.
+    """
+
+    def __init__(self, schema: Any):
+        self.schema = schema
+        self._refs: Dict[str, Checker] = {}
+        self._check = self._compile(schema)
+
+    def errors(self, value: Any) -> List[str]:
+        """
+        Returns the violations of the schema by a decoded JSON value, as
+        messages that start with the JSON pointer of the offending value.
+        """
+        errors: List[str] = []
+        self._check(value, "", errors)
+        return errors
+
+    def is_valid(self, value: Any) -> bool:
+        """
+        Returns True if a decoded JSON value matches the schema.
+        """
+        return not self.errors(value)
+
+    def _compile(self, schema: Any) -> Checker:  # pylint: disable=too-many-branches,too-many-statements
+        if schema is True or schema == {}:
+            return _accept
+        if schema is False:
+            return lambda value, path, errors: errors.append(f"{path or '/'}: not allowed")
+        if not isinstance(schema, dict):
+            raise ValueError(f"Invalid JSON Schema: {schema!r}")
+
+        checks: List[Checker] = []
+
+        if "$ref" in schema:
+            checks.append(self._ref(schema["$ref"]))
+
+        if "type" in schema:
+            types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+            unknown = [name for name in types if name not in _TYPE_CHECKS]
+            if unknown:
+                raise ValueError(f"Unknown JSON Schema type: {unknown[0]}")
+            type_checks = [_TYPE_CHECKS[name] for name in types]
+            expected = " or ".join(types)
+
+            def check_type(value, path, errors):
+                if not any(type_check(value) for type_check in type_checks):
+                    errors.append(f"{path or '/'}: expected {expected}")
+            checks.append(check_type)
+
+        if "enum" in schema:
+            allowed = schema["enum"]
+
+            def check_enum(value, path, errors):
+                if not any(json_equal(value, option) for option in allowed):
+                    errors.append(f"{path or '/'}: must be one of {json.dumps(allowed)}")
+            checks.append(check_enum)
+
+        if "const" in schema:
+            constant = schema["const"]
+
+            def check_const(value, path, errors):
+                if not json_equal(value, constant):
+                    errors.append(f"{path or '/'}: must be {json.dumps(constant)}")
+            checks.append(check_const)
+
+        checks.extend(self._compile_object(schema))
+        checks.extend(self._compile_array(schema))
+        checks.extend(_compile_string(schema))
+        checks.extend(_compile_number(schema))
+        checks.extend(self._compile_combinators(schema))
+
+        if not checks:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(value, path, errors):
+            for check in checks:
+                check(value, path, errors)
+        return check_all
+
+    def _compile_object(self, schema: Dict[str, Any]) -> List[Checker]:
+        checks: List[Checker] = []
+        properties = {name: self._compile(sub) for name, sub in schema.get("properties", {}).items()}
+        required = schema.get("required", [])
+        additional = schema.get("additionalProperties", True)
+        additional_check = None if additional is True else self._compile(additional)
+
+        if properties or additional_check is not None:
+            def check_properties(value, path, errors):
+                if not isinstance(value, dict):
+                    return
+                for name, item in value.items():
+                    check = properties.get(name, additional_check)
+                    if check is not None:
+                        check(item, f"{path}/{_escape(name)}", errors)
+            checks.append(check_properties)
+
+        if required:
+            def check_required(value, path, errors):
+                if not isinstance(value, dict):
+                    return
+                for name in required:
+                    if name not in value:
+                        errors.append(f"{path or '/'}: missing required property {name!r}")
+            checks.append(check_required)
+        return checks
+
+    def _compile_array(self, schema: Dict[str, Any]) -> List[Checker]:
+        checks: List[Checker] = []
+        if "items" in schema and isinstance(schema["items"], (dict, bool)):
+            item_check = self._compile(schema["items"])
+
+            def check_items(value, path, errors):
+                if isinstance(value, list):
+                    for index, item in enumerate(value):
+                        item_check(item, f"{path}/{index}", errors)
+            checks.append(check_items)
+
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+        if min_items is not None or max_items is not None:
+            def check_length(value, path, errors):
+                if not isinstance(value, list):
+                    return
+                if min_items is not None and len(value) < min_items:
+                    errors.append(f"{path or '/'}: expected at least {min_items} items")
+                if max_items is not None and len(value) > max_items:
+                    errors.append(f"{path or '/'}: expected at most {max_items} items")
+            checks.append(check_length)
+
+        if schema.get("uniqueItems"):
+            def check_unique(value, path, errors):
+                if not isinstance(value, list):
+                    return
+                seen = set()
+                for item in value:
+                    key = json.dumps(item, sort_keys=True)
+                    if key in seen:
+                        errors.append(f"{path or '/'}: items must be unique")
+                        return
+                    seen.add(key)
+            checks.append(check_unique)
+        return checks
+
+    def _compile_combinators(self, schema: Dict[str, Any]) -> List[Checker]:
+        checks: List[Checker] = []
+        for sub in schema.get("allOf", []):
+            checks.append(self._compile(sub))
+
+        if "anyOf" in schema:
+            options = [self._compile(sub) for sub in schema["anyOf"]]
+
+            def check_any_of(value, path, errors):
+                if not any(_passes(option, value, path) for option in options):
+                    errors.append(f"{path or '/'}: does not match any of the allowed schemas")
+            checks.append(check_any_of)
+
+        if "oneOf" in schema:
+            options = [self._compile(sub) for sub in schema["oneOf"]]
+
+            def check_one_of(value, path, errors):
+                matches = sum(1 for option in options if _passes(option, value, path))
+                if matches != 1:
+                    errors.append(f"{path or '/'}: must match exactly one schema, matches {matches}")
+            checks.append(check_one_of)
+
+        if "not" in schema:
+            negated = self._compile(schema["not"])
+
+            def check_not(value, path, errors):
+                if _passes(negated, value, path):
+                    errors.append(f"{path or '/'}: must not match the schema")
+            checks.append(check_not)
+        return checks
+
+    def _ref(self, ref: str) -> Checker:
+        check = self._refs.get(ref)
+        if check is not None:
+            return check
+        if not ref.startswith("#"):
+            raise ValueError(f"Only local $ref is supported: {ref}")
+
+        # compile on first use, so recursive schemas terminate
+        compiled: List[Checker] = []
+
+        def check_ref(value, path, errors):
+            if not compiled:
+                compiled.append(self._compile(_resolve_pointer(self.schema, ref[1:])))
+            compiled[0](value, path, errors)
+
+        self._refs[ref] = check_ref
+        return check_ref
+
+
+def _compile_string(schema: Dict[str, Any]) -> List[Checker]:
+    checks: List[Checker] = []
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    if min_length is not None or max_length is not None:
+        def check_length(value, path, errors):
+            if not isinstance(value, str):
+                return
+            if min_length is not None and len(value) < min_length:
+                errors.append(f"{path or '/'}: expected at least {min_length} characters")
+            if max_length is not None and len(value) > max_length:
+                errors.append(f"{path or '/'}: expected at most {max_length} characters")
+        checks.append(check_length)
+
+    if "pattern" in schema:
+        pattern = re.compile(schema["pattern"])
+
+        def check_pattern(value, path, errors):
+            if isinstance(value, str) and not pattern.search(value):
+                errors.append(f"{path or '/'}: does not match pattern {pattern.pattern!r}")
+        checks.append(check_pattern)
+    return checks
+
+
+def _compile_number(schema: Dict[str, Any]) -> List[Checker]:
+    bounds = []
+    for keyword, fails, message in (
+        ("minimum", lambda value, bound: value < bound, "at least"),
+        ("maximum", lambda value, bound: value > bound, "at most"),
+        ("exclusiveMinimum", lambda value, bound: value <= bound, "greater than"),
+        ("exclusiveMaximum", lambda value, bound: value >= bound, "less than"),
+        ("multipleOf", lambda value, bound: abs(value / bound - round(value / bound)) > 1e-9, "a multiple of"),
+    ):
+        bound = schema.get(keyword)
+        if isinstance(bound, (int, float)) and not isinstance(bound, bool):
+            bounds.append((fails, bound, message))
+    if not bounds:
+        return []
+
+    def check_bounds(value, path, errors):
+        if not _TYPE_CHECKS["number"](value):
+            return
+        for fails, bound, message in bounds:
+            if fails(value, bound):
+                errors.append(f"{path or '/'}: must be {message} {bound}")
+    return [check_bounds]
+
+
+def _accept(value: Any, path: str, errors: List[str]) -> None:
+    pass
+
+
+def _passes(check: Checker, value: Any, path: str) -> bool:
+    errors: List[str] = []
+    check(value, path, errors)
+    return not errors
+
+
+def _escape(name: str) -> str:
+    return name.replace("~", "~0").replace("/", "~1")
+
+
+def _resolve_pointer(document: Any, pointer: str) -> Any:
+    if pointer == "":
+        return document
+    current = document
+    for part in pointer.lstrip("/").split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        try:
+            current = current[int(part)] if isinstance(current, list) else current[part]
+        except (KeyError, IndexError, ValueError, TypeError) as exc:
+            raise ValueError(f"Cannot resolve $ref #{pointer}") from exc
+    return current
+
+
+_validators: "OrderedDict[str, SchemaValidator]" = OrderedDict()
+
+
+def schema_hash(schema: Any) -> str:
+    """
+    Returns the SHA-256 of the canonical JSON of a schema.
+    """
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def compile_schema(schema: Any) -> SchemaValidator:
+    """
+    Returns the compiled validator for a JSON Schema, compiling it only if an
+    equal schema is not cached yet.
+    """
+    key = schema_hash(schema)
+    validator = _validators.get(key)
+    if validator is not None:
+        _validators.move_to_end(key)
+        return validator
+    validator = SchemaValidator(schema)
+    _validators[key] = validator
+    if len(_validators) > SCHEMA_CACHE_SIZE:
+        _validators.popitem(last=False)
+    return validator
+
+
+def validate_tool_arguments(tool: Tool, arguments: str) -> Any:
+    """
+    Parses the JSON arguments of a tool call and validates them against the
+    tool's parameters. Returns the parsed arguments or raises ToolArgumentsError.
+    """
+    validator = None if tool.parameters is None else compile_schema(tool.parameters)
+    return _check_arguments(tool.name, validator, arguments)
+
+
+def _check_arguments(tool_name: str, validator: Optional[SchemaValidator], arguments: str) -> Any:
+    try:
+        value = json.loads(arguments) if arguments else {}
+    except ValueError as exc:
+        raise ToolArgumentsError(tool_name, [f"invalid JSON: {exc}"]) from exc
+    if validator is None:
+        return value
+    errors = validator.errors(value)
+    if errors:
+        raise ToolArgumentsError(tool_name, errors)
+    return value
+
+
+class ToolCallValidator(EventStage):
+    """
+    Validates the arguments of tool calls in an event stream against the
+    schemas of the run's tools.
+
+    Events pass through unchanged. The `ToolCallArgsEvent` deltas of each tool
+    call are collected, and when the call ends they are validated, raising
+    ToolArgumentsError before the `ToolCallEndEvent` is passed on. Calls of
+    tools that are not in `tools` are not validated. The parsed arguments of
+    the last completed call are kept in `arguments`.
+    """
+
+    def __init__(self, tools: Sequence[Tool]):
+        super().__init__()
+        self.arguments: Optional[Any] = None
+        # tool name -> compiled parameters, None for tools without parameters
+        self._validators: Dict[str, Optional[SchemaValidator]] = {
+            tool.name: None if tool.parameters is None else compile_schema(tool.parameters) for tool in tools
+        }
+        # tool call id -> tool name
+        self._calls: Dict[str, str] = {}
+        self._deltas: Dict[str, List[str]] = {}
+
+    def push(self, event: BaseEvent) -> List[BaseEvent]:
+        if isinstance(event, ToolCallStartEvent):
+            if event.tool_call_name in self._validators:
+                self._calls[event.tool_call_id] = event.tool_call_name
+                self._deltas[event.tool_call_id] = []
+        elif isinstance(event, ToolCallArgsEvent):
+            deltas = self._deltas.get(event.tool_call_id)
+            if deltas is not None:
+                deltas.append(event.delta)
+        elif isinstance(event, ToolCallEndEvent):
+            name = self._calls.pop(event.tool_call_id, None)
+            if name is not None:
+                arguments = "".join(self._deltas.pop(event.tool_call_id))
+                self.arguments = _check_arguments(name, self._validators[name], arguments)
+        return [event]
@@ -0,0 +1,33 @@
+"""
+This module contains helpers for the shared agent state.
+"""
+
+from ag_ui.state.patch import (
+    JsonPatchError,
+    UndoLog,
+    apply_operation,
+    apply_patch,
+    escape_token,
+    parse_pointer,
+)
+from ag_ui.state.emitter import StateEmitter, diff
+from ag_ui.state.store import PersistentList, StateStore, StateVersion
+from ag_ui.state.compact import StateDeltaCompactor, compact_patch
+from ag_ui.state.throttle import SnapshotThrottle
+
+__all__ = [
+    "JsonPatchError",
+    "UndoLog",
+    "apply_operation",
+    "apply_patch",
+    "escape_token",
+    "parse_pointer",
+    "StateEmitter",
+    "diff",
+    "PersistentList",
+    "StateStore",
+    "StateVersion",
+    "StateDeltaCompactor",
+    "compact_patch",
+    "SnapshotThrottle",
+]
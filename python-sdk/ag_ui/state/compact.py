@@ -0,0 +1,176 @@
+"""
+This module contains JSON Patch compaction and the StateDeltaCompactor
+pipeline stage.
+"""
+
+import re
+import time
+from typing import Any, Callable, List, Optional, Sequence
+
+from ag_ui.core.events import BaseEvent, StateDeltaEvent, StateSnapshotEvent
+from ag_ui.encoder.pipeline import EventStage
+from ag_ui.state.patch import parse_pointer
+
+_WRITES = ("add", "replace", "remove")
+# tokens that may be array indices
+_DIGITS = re.compile(r"[0-9]+")
+
+
+def compact_patch(operations: Sequence[Any]) -> List[Any]:
+    """
+    Returns a shorter JSON Patch with the same effect.
+
+    An `add`, `replace` or `remove` of an object member drops the earlier
+    operations on that member and on everything below it, since their
+    effect is overwritten. A `replace` that follows an `add` of the same
+    member becomes an `add`. A `remove` that follows writes to a member that
+    existed before the patch, because the first of them was a `replace` or
+    `remove`, becomes a single `remove`. Otherwise an `add` of null is kept
+    in front of it, as an `add` may have replaced an existing member.
+
+    Operations are never moved across a `move`, `copy` or `test` of a
+    related path. Paths with array indices are not compacted, but are
+    dropped when an enclosing object member is overwritten.
+    """
+    result: List[Optional[dict]] = []
+    # for each compactable operation in result: True if its member existed
+    # before the first write to it in the patch, None if that is unknown
+    existed: List[Optional[bool]] = []
+    for operation in operations:
+        if not _is_compactable(operation):
+            result.append(operation)
+            existed.append(None)
+            continue
+        path = operation["path"]
+        previous = None
+        for index in range(len(result) - 1, -1, -1):
+            earlier = result[index]
+            if earlier is None:
+                continue
+            if _is_barrier(earlier, path):
+                break
+            if earlier.get("op") in _WRITES and isinstance(earlier.get("path"), str) \
+                    and _is_within(earlier["path"], path):
+                if previous is None and earlier["path"] == path and _is_compactable(earlier):
+                    previous = index
+                result[index] = None
+
+        if previous is None:
+            # replace and remove fail unless the member exists
+            member_existed = True if operation["op"] != "add" else None
+        else:
+            member_existed = existed[previous]
+            if member_existed is None:
+                if operation["op"] == "remove":
+                    # the member is removed either way, but the remove fails
+                    # unless the member exists, so it has to be added first
+                    result[previous] = {"op": "add", "path": path, "value": None}
+                elif operation["op"] == "replace":
+                    operation = {"op": "add", "path": path, "value": operation["value"]}
+        result.append(operation)
+        existed.append(member_existed)
+    return [operation for operation in result if operation is not None]
+
+
+def _is_compactable(operation: Any) -> bool:
+    """
+    Returns True for writes to an object member, i.e. `add`, `replace` and
+    `remove` operations whose path has no array index.
+    """
+    if not isinstance(operation, dict) or operation.get("op") not in _WRITES:
+        return False
+    path = operation.get("path")
+    if not isinstance(path, str) or not path:
+        return False
+    if operation["op"] != "remove" and "value" not in operation:
+        return False
+    try:
+        tokens = parse_pointer(path)
+    except ValueError:
+        return False
+    return not any(token == "-" or _DIGITS.fullmatch(token) for token in tokens)
+
+
+def _is_barrier(operation: Any, path: str) -> bool:
+    """
+    Returns True if no operation on `path` may be dropped or merged across
+    `operation`.
+    """
+    if not isinstance(operation, dict):
+        return True
+    if operation.get("op") in _WRITES:
+        return False
+    for name in ("path", "from") if "from" in operation else ("path",):
+        other = operation.get(name)
+        if not isinstance(other, str) or _is_within(other, path) or _is_within(path, other):
+            return True
+    return False
+
+
+def _is_within(path: str, ancestor: str) -> bool:
+    """
+    Returns True if `path` is `ancestor` or below it.
+    """
+    return path == ancestor or path.startswith(ancestor + "/") or ancestor == ""
+
+
+class StateDeltaCompactor(EventStage):
+    """
+    Merges the `StateDeltaEvent`s of a time window into a single event with
+    a compacted patch.
+
+    Deltas are held back for up to `max_delay` seconds after the first of
+    them, or until any other event comes in. A `StateSnapshotEvent`
+    replaces the whole state, so held back deltas are dropped in its favor.
+    Events that carry a `raw_event` are passed on as they are.
+    """
+
+    def __init__(self, max_delay: Optional[float] = 0.05, clock: Callable[[], float] = time.monotonic):
+        super().__init__(clock)
+        self.max_delay = max_delay
+        self._first: Optional[StateDeltaEvent] = None
+        self._operations: List[Any] = []
+        self._started_at = 0.0
+
+    def push(self, event: BaseEvent) -> List[BaseEvent]:
+        if type(event) is StateDeltaEvent and event.raw_event is None:
+            if self._first is None:
+                self._first = event
+                self._started_at = self.clock()
+            self._operations.extend(event.delta)
+            if self.max_delay is not None and self.clock() - self._started_at >= self.max_delay:
+                return self.flush()
+            return []
+
+        if type(event) is StateSnapshotEvent:
+            self._reset()
+            return [event]
+        ready = self.flush()
+        ready.append(event)
+        return ready
+
+    def flush(self) -> List[BaseEvent]:
+        if self._first is None:
+            return []
+        event = self._first
+        operations = compact_patch(self._operations)
+        if operations != event.delta:
+            event = event.model_copy(update={"delta": operations})
+        self._reset()
+        return [event] if operations else []
+
+    def deadline(self) -> Optional[float]:
+        if self._first is None or self.max_delay is None:
+            return None
+        return self._started_at + self.max_delay
+
+    def poll(self) -> List[BaseEvent]:
+        deadline = self.deadline()
+        if deadline is not None and self.clock() >= deadline:
+            return self.flush()
+        return []
+
+    def _reset(self) -> None:
+        self._first = None
+        self._operations = []
+        self._started_at = 0.0
@@ -0,0 +1,130 @@
+"""
+This module contains the StateEmitter class, which sends state updates as
+StateDeltaEvent or StateSnapshotEvent, whichever is smaller.
+"""
+
+from typing import Any, Callable, List, Optional, Union
+
+from pydantic_core import to_jsonable_python
+
+from ag_ui.core.equality import json_equal
+from ag_ui.core.events import BaseEvent, StateDeltaEvent, StateSnapshotEvent
+from ag_ui.encoder.encoder import EventEncoder
+from ag_ui.encoder.serializers import serialize_json
+from ag_ui.state.patch import escape_token
+from ag_ui import proto
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[dict]:
+    """
+    Returns a JSON Patch that turns the JSON value `old` into `new`.
+
+    Objects are compared key by key and arrays element by element, after
+    skipping their common start and end, so that unchanged parts of the
+    state produce no operations.
+    """
+    operations: List[dict] = []
+    _diff(old, new, path, operations)
+    return operations
+
+
+def _diff(old: Any, new: Any, path: str, operations: List[dict]) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                operations.append({"op": "remove", "path": f"{path}/{escape_token(key)}"})
+        for key, value in new.items():
+            key_path = f"{path}/{escape_token(key)}"
+            if key not in old:
+                operations.append({"op": "add", "path": key_path, "value": value})
+            else:
+                _diff(old[key], value, key_path, operations)
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, operations)
+    elif not json_equal(old, new):
+        operations.append({"op": "replace", "path": path, "value": new})
+
+
+def _diff_list(old: list, new: list, path: str, operations: List[dict]) -> None:
+    start = 0
+    limit = min(len(old), len(new))
+    while start < limit and json_equal(old[start], new[start]):
+        start += 1
+    old_end = len(old)
+    new_end = len(new)
+    while old_end > start and new_end > start and json_equal(old[old_end - 1], new[new_end - 1]):
+        old_end -= 1
+        new_end -= 1
+
+    common = min(old_end, new_end)
+    for index in range(start, common):
+        _diff(old[index], new[index], f"{path}/{index}", operations)
+    # removing from the back keeps the indices of the remaining items valid
+    for index in range(old_end - 1, common - 1, -1):
+        operations.append({"op": "remove", "path": f"{path}/{index}"})
+    for index in range(common, new_end):
+        operations.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+
+
+class StateEmitter:
+    """
+    Turns full states into state events for one stream.
+
+    The emitter remembers the last state sent on the stream. For each new
+    state it computes a JSON Patch against it and returns a StateDeltaEvent
+    if that encodes smaller than a StateSnapshotEvent, or the snapshot
+    otherwise. The first state of a stream is always sent as a snapshot.
+    Sizes are measured in the format of `encoder` (JSON without an encoder).
+    """
+
+    def __init__(self, encoder: Optional[EventEncoder] = None):
+        self._size: Callable[[BaseEvent], int] = (
+            (lambda event: len(proto.encode(event)))
+            if encoder is not None and encoder.accepts_protobuf
+            else (lambda event: len(serialize_json(event)))
+        )
+        self._last: Any = None
+        self._sent = False
+
+    def update(self, state: Any) -> Optional[Union[StateSnapshotEvent, StateDeltaEvent]]:
+        """
+        Returns the event that brings the client to `state`, or None if the
+        state did not change since the last update.
+        """
+        state = to_jsonable_python(state)
+        snapshot = StateSnapshotEvent.trusted(snapshot=state)
+        if not self._sent:
+            self._remember(state)
+            return snapshot
+
+        operations = diff(self._last, state)
+        if not operations:
+            return None
+        self._remember(state)
+        delta = StateDeltaEvent.trusted(delta=operations)
+        if self._size(delta) < self._size(snapshot):
+            return delta
+        return snapshot
+
+    def snapshot(self, state: Any) -> StateSnapshotEvent:
+        """
+        Returns a snapshot of `state` regardless of its size, for example
+        after the client reconnected.
+        """
+        state = to_jsonable_python(state)
+        self._remember(state)
+        return StateSnapshotEvent.trusted(snapshot=state)
+
+    def reset(self) -> None:
+        """
+        Forgets the last state, so the next update is sent as a snapshot.
+        """
+        self._last = None
+        self._sent = False
+
+    def _remember(self, state: Any) -> None:
+        # to_jsonable_python returns new containers, so later changes to the
+        # agent's state do not affect the remembered copy. The events share
+        # it, which is fine as long as they are not changed after sending.
+        self._last = state
+        self._sent = True
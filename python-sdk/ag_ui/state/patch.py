@@ -0,0 +1,272 @@
+"""
+This module contains an in-place JSON Patch (RFC 6902) implementation for
+applying StateDeltaEvent deltas.
+
+Operations change the document in place, so applying a patch costs time in
+proportion to the patch, not to the state. A patch is applied atomically: if
+an operation fails, the operations before it are undone. Parsed JSON
+Pointers are cached, since state deltas touch the same paths over and over.
+"""
+
+import copy
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from ag_ui.core.equality import json_equal
+
+POINTER_CACHE_SIZE = 1024
+
+# array indices are ASCII digits without leading zeros
+_ARRAY_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+
+class JsonPatchError(ValueError):
+    """
+    Raised when a patch cannot be applied, including when a `test`
+    operation fails.
+    """
+
+
+@lru_cache(maxsize=POINTER_CACHE_SIZE)
+def parse_pointer(pointer: str) -> Tuple[str, ...]:
+    """
+    Splits a JSON Pointer (RFC 6901) into its unescaped reference tokens.
+    """
+    if pointer == "":
+        return ()
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON Pointer: {pointer!r}")
+    return tuple(token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/"))
+
+
+def escape_token(token: str) -> str:
+    """
+    Escapes a key for use in a JSON Pointer.
+    """
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+class UndoLog:
+    """
+    Records how to revert applied operations. Pass one to `apply_patch` to be
+    able to revert the patch later, for example when an optimistic update is
+    rejected.
+    """
+
+    def __init__(self):
+        self._steps: List[Callable[[Any], Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def record(self, step: Callable[[Any], Any]) -> None:
+        """
+        Adds a step that takes the document and returns it with one change reverted.
+        """
+        self._steps.append(step)
+
+    def undo(self, document: Any) -> Any:
+        """
+        Reverts all recorded changes, newest first, and clears the log.
+        Returns the document, which is a different object if the root was
+        replaced.
+        """
+        while self._steps:
+            document = self._steps.pop()(document)
+        return document
+
+
+def apply_patch(document: Any, patch: Sequence[Any], undo_log: Optional[UndoLog] = None) -> Any:
+    """
+    Applies a JSON Patch to a document in place and returns the document,
+    which is a different object if the patch replaced the root.
+
+    Values of `add` and `replace` operations are copied into the document,
+    so later changes to the document never change the patch. If an
+    operation fails, the document is restored and JsonPatchError is raised.
+    Undo steps are appended to `undo_log` if given.
+    """
+    log = UndoLog()
+    try:
+        for index, operation in enumerate(patch):
+            try:
+                document = _apply_operation(document, operation, log)
+            except JsonPatchError as exc:
+                raise JsonPatchError(f"Operation {index} failed: {exc}") from exc
+    except BaseException:
+        log.undo(document)
+        raise
+    if undo_log is not None:
+        # pylint: disable=protected-access
+        undo_log._steps.extend(log._steps)
+    return document
+
+
+def apply_operation(document: Any, operation: Any, undo_log: Optional[UndoLog] = None) -> Any:
+    """
+    Applies a single JSON Patch operation to a document in place and returns
+    the document, which is a different object if the root was replaced.
+
+    Unlike `apply_patch`, a failing operation raises JsonPatchError without
+    restoring anything, so callers that apply operations one by one handle
+    errors themselves, for example by changing copies. Undo steps are
+    appended to `undo_log` if given.
+    """
+    return _apply_operation(document, operation, _DISCARD if undo_log is None else undo_log)
+
+
+class _DiscardLog(UndoLog):
+    """
+    An UndoLog that records nothing.
+    """
+
+    def record(self, step: Callable[[Any], Any]) -> None:
+        pass
+
+
+_DISCARD = _DiscardLog()
+
+
+def _apply_operation(document: Any, operation: Any, log: UndoLog) -> Any:
+    if not isinstance(operation, dict):
+        raise JsonPatchError("Operation must be an object")
+    op = operation.get("op")
+    path = _pointer(operation, "path")
+
+    if op == "add":
+        return _add(document, path, _value(operation), log)
+    if op == "remove":
+        document, _ = _remove(document, path, log)
+        return document
+    if op == "replace":
+        value = _value(operation)
+        if not path:
+            log.record(lambda _, old=document: old)
+            return value
+        parent, token = _parent(document, path)
+        key = _existing_key(parent, token)
+        old = parent[key]
+        parent[key] = value
+        log.record(lambda doc: _set(parent, key, old, doc))
+        return document
+    if op == "move":
+        source = _pointer(operation, "from")
+        if source == path:
+            _resolve(document, source)
+            return document
+        if path[:len(source)] == source:
+            raise JsonPatchError("Cannot move a value into itself")
+        document, value = _remove(document, source, log)
+        return _add(document, path, value, log)
+    if op == "copy":
+        value = copy.deepcopy(_resolve(document, _pointer(operation, "from")))
+        return _add(document, path, value, log)
+    if op == "test":
+        if not json_equal(_resolve(document, path), _member(operation, "value")):
+            raise JsonPatchError(f"Test failed at {operation['path']!r}")
+        return document
+    raise JsonPatchError(f"Unknown operation: {op!r}")
+
+
+def _add(document: Any, path: Tuple[str, ...], value: Any, log: UndoLog) -> Any:
+    if not path:
+        log.record(lambda _, old=document: old)
+        return value
+    parent, token = _parent(document, path)
+    if isinstance(parent, list):
+        index = len(parent) if token == "-" else _array_index(token, len(parent) + 1)
+        parent.insert(index, value)
+        log.record(lambda doc: _delete(parent, index, doc))
+    elif isinstance(parent, dict):
+        if token in parent:
+            old = parent[token]
+            log.record(lambda doc: _set(parent, token, old, doc))
+        else:
+            log.record(lambda doc: _delete(parent, token, doc))
+        parent[token] = value
+    else:
+        raise JsonPatchError(f"Cannot add to a {type(parent).__name__}")
+    return document
+
+
+def _remove(document: Any, path: Tuple[str, ...], log: UndoLog) -> Tuple[Any, Any]:
+    if not path:
+        raise JsonPatchError("Cannot remove the root")
+    parent, token = _parent(document, path)
+    key = _existing_key(parent, token)
+    value = parent.pop(key)
+    if isinstance(parent, list):
+        log.record(lambda doc: _insert(parent, key, value, doc))
+    else:
+        log.record(lambda doc: _set(parent, key, value, doc))
+    return document, value
+
+
+def _parent(document: Any, path: Tuple[str, ...]) -> Tuple[Any, str]:
+    return _resolve(document, path[:-1]), path[-1]
+
+
+def _resolve(document: Any, path: Tuple[str, ...]) -> Any:
+    current = document
+    for token in path:
+        if isinstance(current, (dict, list)):
+            current = current[_existing_key(current, token)]
+        else:
+            raise JsonPatchError(f"Cannot resolve {token!r} in a {type(current).__name__}")
+    return current
+
+
+def _existing_key(container: Any, token: str) -> Any:
+    if isinstance(container, list):
+        return _array_index(token, len(container))
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchError(f"Missing key {token!r}")
+        return token
+    raise JsonPatchError(f"Cannot resolve {token!r} in a {type(container).__name__}")
+
+
+def _array_index(token: str, size: int) -> int:
+    if not _ARRAY_INDEX.fullmatch(token):
+        raise JsonPatchError(f"Invalid array index {token!r}")
+    index = int(token)
+    if index >= size:
+        raise JsonPatchError(f"Array index {index} out of range")
+    return index
+
+
+def _member(operation: dict, name: str) -> Any:
+    if name not in operation:
+        raise JsonPatchError(f"Missing {name!r} in {operation.get('op')!r} operation")
+    return operation[name]
+
+
+def _value(operation: dict) -> Any:
+    # containers are copied, so that the patch is not changed with the document
+    value = _member(operation, "value")
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+def _pointer(operation: dict, name: str) -> Tuple[str, ...]:
+    pointer = _member(operation, name)
+    if not isinstance(pointer, str):
+        raise JsonPatchError(f"{name!r} must be a string")
+    return parse_pointer(pointer)
+
+
+def _set(container: Any, key: Any, value: Any, document: Any) -> Any:
+    container[key] = value
+    return document
+
+
+def _insert(container: list, index: int, value: Any, document: Any) -> Any:
+    container.insert(index, value)
+    return document
+
+
+def _delete(container: Any, key: Any, document: Any) -> Any:
+    del container[key]
+    return document
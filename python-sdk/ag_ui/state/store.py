@@ -0,0 +1,346 @@
+"""
+This module contains the StateStore class, a copy-on-write store for the
+state and messages of an agent run.
+
+Every change creates a new StateVersion that shares everything it did not
+touch with the previous one. Applying a state delta copies only the
+containers on the changed paths, and the messages are kept in a persistent
+list, a trie of small tuples, so appending or replacing a message copies a
+few tuples. Old versions stay valid and unchanged, which makes keeping
+every intermediate version cheap.
+
+Versions share containers, so they must be treated as read-only. The store
+never changes a container once it is part of a version.
+"""
+
+import re
+from itertools import chain
+from typing import Any, Generic, Iterable, Iterator, NamedTuple, Optional, Sequence, Set, Tuple, TypeVar
+
+from ag_ui.core.events import StateDeltaEvent, StateSnapshotEvent
+from ag_ui.core.types import Message
+from ag_ui.state.patch import JsonPatchError, apply_operation, parse_pointer
+
+T = TypeVar("T")
+
+_ARRAY_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+
+
+class PersistentList(Sequence[T], Generic[T]):
+    """
+    An immutable list in which `append` and `set` return a new list that
+    shares almost everything with the old one.
+
+    Items are kept in a trie of tuples with up to 32 entries, plus a tail
+    tuple with the last items. `append` copies the tail, or moves a full tail
+    into the trie, and `set` copies the nodes on the path to one item, so
+    both take time in proportion to the depth of the trie, which grows by
+    one for every 32 times more items.
+    """
+
+    __slots__ = ("_root", "_shift", "_tail", "_length")
+
+    def __init__(self, items: Iterable[T] = ()):
+        items = tuple(items)
+        tail_start = (len(items) - 1) & ~_MASK if items else 0
+        nodes: Tuple[Any, ...] = tuple(items[start:start + _WIDTH] for start in range(0, tail_start, _WIDTH))
+        shift = _BITS
+        while len(nodes) > _WIDTH:
+            nodes = tuple(nodes[start:start + _WIDTH] for start in range(0, len(nodes), _WIDTH))
+            shift += _BITS
+        self._root: Tuple[Any, ...] = nodes
+        self._shift = shift
+        self._tail: Tuple[T, ...] = items[tail_start:]
+        self._length = len(items)
+
+    @classmethod
+    def _create(cls, root: Tuple[Any, ...], shift: int, tail: Tuple[T, ...], length: int) -> "PersistentList[T]":
+        result = cls.__new__(cls)
+        result._root = root
+        result._shift = shift
+        result._tail = tail
+        result._length = length
+        return result
+
+    def append(self, item: T) -> "PersistentList[T]":
+        """
+        Returns a new list with `item` added at the end.
+        """
+        if len(self._tail) < _WIDTH:
+            return self._create(self._root, self._shift, self._tail + (item,), self._length + 1)
+
+        # the tail is full, move it into the trie
+        size = self._length - _WIDTH
+        shift = self._shift
+        if size == 1 << (shift + _BITS):
+            root = (self._root, _new_path(shift, self._tail))
+            shift += _BITS
+        else:
+            root = _push_tail(shift, self._root, size, self._tail)
+        return self._create(root, shift, (item,), self._length + 1)
+
+    def set(self, index: int, item: T) -> "PersistentList[T]":
+        """
+        Returns a new list with the item at `index` replaced.
+        """
+        index = self._index(index)
+        tail_start = self._length - len(self._tail)
+        if index >= tail_start:
+            offset = index - tail_start
+            tail = self._tail[:offset] + (item,) + self._tail[offset + 1:]
+            return self._create(self._root, self._shift, tail, self._length)
+        root = _set_item(self._shift, self._root, index, item)
+        return self._create(root, self._shift, self._tail, self._length)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        index = self._index(index)
+        tail_start = self._length - len(self._tail)
+        if index >= tail_start:
+            return self._tail[index - tail_start]
+        node = self._root
+        for level in range(self._shift, 0, -_BITS):
+            node = node[(index >> level) & _MASK]
+        return node[index & _MASK]
+
+    def __iter__(self) -> Iterator[T]:
+        return chain(chain.from_iterable(_leaves(self._shift, self._root)), self._tail)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PersistentList):
+            return self._length == other._length and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return f"PersistentList({list(self)!r})"
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("PersistentList index out of range")
+        return index
+
+
+def _new_path(level: int, leaf: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    Returns a branch of nodes down to `leaf` for a trie level.
+    """
+    node = leaf
+    for _ in range(level, 0, -_BITS):
+        node = (node,)
+    return node
+
+
+def _push_tail(level: int, node: Tuple[Any, ...], size: int, leaf: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    Returns `node` with `leaf` added after the `size` items below it.
+    """
+    slot = (size >> level) & _MASK
+    if level == _BITS:
+        child = leaf
+    elif slot < len(node):
+        child = _push_tail(level - _BITS, node[slot], size, leaf)
+    else:
+        child = _new_path(level - _BITS, leaf)
+    return node[:slot] + (child,) + node[slot + 1:]
+
+
+def _set_item(level: int, node: Tuple[Any, ...], index: int, item: Any) -> Tuple[Any, ...]:
+    """
+    Returns `node` with the item at `index` below it replaced.
+    """
+    slot = (index >> level) & _MASK
+    child = item if level == 0 else _set_item(level - _BITS, node[slot], index, item)
+    return node[:slot] + (child,) + node[slot + 1:]
+
+
+def _leaves(level: int, node: Tuple[Any, ...]) -> Iterator[Tuple[Any, ...]]:
+    if level == _BITS:
+        yield from node
+    else:
+        for child in node:
+            yield from _leaves(level - _BITS, child)
+
+
+class StateVersion(NamedTuple):
+    """
+    An immutable version of the state and messages of a run.
+    """
+    state: Any
+    messages: PersistentList[Message]
+    version: int
+
+
+class StateStore:
+    """
+    Holds the current StateVersion of a run and creates new versions as
+    state events and messages arrive.
+    """
+
+    def __init__(self, state: Any = None, messages: Iterable[Message] = ()):
+        self.current = StateVersion(state, PersistentList(messages), 0)
+
+    @property
+    def state(self) -> Any:
+        """
+        The current state.
+        """
+        return self.current.state
+
+    @property
+    def messages(self) -> PersistentList[Message]:
+        """
+        The current messages.
+        """
+        return self.current.messages
+
+    def set_state(self, state: Any) -> StateVersion:
+        """
+        Replaces the state, as a StateSnapshotEvent does.
+        """
+        return self._commit(state, self.current.messages)
+
+    def apply_delta(self, patch: Sequence[Any]) -> StateVersion:
+        """
+        Applies a JSON Patch to the state, copying only the containers on the
+        changed paths. If an operation fails, JsonPatchError is raised and the
+        current version is kept.
+        """
+        state = self.current.state
+        copied: Set[int] = set()
+        for index, operation in enumerate(patch):
+            try:
+                if isinstance(operation, dict) and operation.get("op") == "move" \
+                        and isinstance(operation.get("from"), str) and isinstance(operation.get("path"), str) \
+                        and operation["from"] != operation["path"]:
+                    state = _move(state, operation["from"], operation["path"], copied)
+                    continue
+                if isinstance(operation, dict) and operation.get("op") != "test":
+                    pointer = operation.get("path")
+                    if isinstance(pointer, str):
+                        state = _copy_path(state, parse_pointer(pointer)[:-1], copied)
+                state = apply_operation(state, operation)
+            except JsonPatchError as exc:
+                raise JsonPatchError(f"Operation {index} failed: {exc}") from exc
+        return self._commit(state, self.current.messages)
+
+    def apply(self, event: Any) -> StateVersion:
+        """
+        Applies a StateSnapshotEvent or StateDeltaEvent. Other events leave the
+        store unchanged.
+        """
+        if isinstance(event, StateSnapshotEvent):
+            return self.set_state(event.snapshot)
+        if isinstance(event, StateDeltaEvent):
+            return self.apply_delta(event.delta)
+        return self.current
+
+    def set_messages(self, messages: Iterable[Message]) -> StateVersion:
+        """
+        Replaces all messages, as a MessagesSnapshotEvent does.
+        """
+        return self._commit(self.current.state, PersistentList(messages))
+
+    def append_message(self, message: Message) -> StateVersion:
+        """
+        Adds a message at the end.
+        """
+        return self._commit(self.current.state, self.current.messages.append(message))
+
+    def replace_message(self, message: Message, index: Optional[int] = None) -> StateVersion:
+        """
+        Replaces the message at `index`, or the last message with the same id.
+        Raises KeyError if there is no message with that id.
+        """
+        messages = self.current.messages
+        if index is None:
+            index = _find_message(messages, message.id)
+        return self._commit(self.current.state, messages.set(index, message))
+
+    def _commit(self, state: Any, messages: PersistentList[Message]) -> StateVersion:
+        self.current = StateVersion(state, messages, self.current.version + 1)
+        return self.current
+
+
+def _move(state: Any, source: str, target: str, copied: Set[int]) -> Any:
+    """
+    Applies a `move` as a remove followed by an add. The containers on the
+    target path are only copied after the removal, which can shift the array
+    items the target path goes through.
+    """
+    source_path = parse_pointer(source)
+    target_path = parse_pointer(target)
+    if target_path[:len(source_path)] == source_path:
+        raise JsonPatchError("Cannot move a value into itself")
+    state = _copy_path(state, source_path[:-1], copied)
+    value = _lookup(state, source_path)
+    state = apply_operation(state, {"op": "remove", "path": source})
+    state = _copy_path(state, target_path[:-1], copied)
+    return apply_operation(state, {"op": "add", "path": target, "value": value})
+
+
+def _lookup(state: Any, path: Tuple[str, ...]) -> Any:
+    """
+    Returns the value at `path`, leaving errors to the remove that follows.
+    """
+    current = state
+    for token in path:
+        if isinstance(current, dict) and token in current:
+            current = current[token]
+        elif isinstance(current, list) and _ARRAY_INDEX.fullmatch(token) and int(token) < len(current):
+            current = current[int(token)]
+        else:
+            return None
+    return current
+
+
+def _copy_path(root: Any, path: Tuple[str, ...], copied: Set[int]) -> Any:
+    """
+    Returns `root` with shallow copies of the containers along `path`, so that
+    they can be changed without affecting earlier versions. Containers that
+    were already copied for the current patch are reused. Stops at the first
+    token that does not resolve and leaves the error to the operation.
+    """
+    root = _copy(root, copied)
+    current = root
+    for token in path:
+        if isinstance(current, dict):
+            if token not in current:
+                break
+            key: Any = token
+        elif isinstance(current, list):
+            if not _ARRAY_INDEX.fullmatch(token) or int(token) >= len(current):
+                break
+            key = int(token)
+        else:
+            break
+        child = _copy(current[key], copied)
+        current[key] = child
+        current = child
+    return root
+
+
+def _copy(value: Any, copied: Set[int]) -> Any:
+    if isinstance(value, (dict, list)) and id(value) not in copied:
+        value = dict(value) if isinstance(value, dict) else list(value)
+        copied.add(id(value))
+    return value
+
+
+def _find_message(messages: PersistentList[Message], message_id: str) -> int:
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].id == message_id:
+            return index
+    raise KeyError(f"No message with id {message_id}")
@@ -0,0 +1,158 @@
+"""
+This module contains the SnapshotThrottle pipeline stage.
+"""
+
+import copy
+import time
+from typing import Callable, List, Optional
+
+from ag_ui.core.events import (
+    BaseEvent,
+    MessagesSnapshotEvent,
+    RunErrorEvent,
+    RunFinishedEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+)
+from ag_ui.encoder.pipeline import EventStage
+from ag_ui.state.compact import compact_patch
+from ag_ui.state.patch import JsonPatchError, apply_patch
+
+
+class _Slot:
+    """
+    The held back event of one kind, and when that kind was last sent.
+    `copied` is True once the snapshot of the held back event is a copy
+    owned by the slot, which deltas can be applied to in place.
+    """
+    __slots__ = ("pending", "copied", "sent_at", "order")
+
+    def __init__(self):
+        self.pending: Optional[BaseEvent] = None
+        self.copied = False
+        self.sent_at: Optional[float] = None
+        self.order = 0
+
+
+class SnapshotThrottle(EventStage):
+    """
+    Limits how often state and messages updates are sent, keeping only the
+    latest one.
+
+    State events (`StateSnapshotEvent` and `StateDeltaEvent`) and
+    `MessagesSnapshotEvent`s are each sent at most `max_rate` times per
+    second. An update that comes in sooner is held back until its interval
+    ends, and replaced by newer ones in the meantime: a newer snapshot
+    replaces the held back event, and a delta is composed with it, by
+    applying it to a held back snapshot or appending it to a held back
+    delta. Held back updates are always sent before a `RunFinishedEvent` or
+    `RunErrorEvent`. Other events pass through immediately.
+    """
+
+    def __init__(self, max_rate: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        if max_rate <= 0:
+            raise ValueError("max_rate must be positive")
+        super().__init__(clock)
+        self.interval = 1.0 / max_rate
+        self._state = _Slot()
+        self._messages = _Slot()
+        self._order = 0
+
+    def push(self, event: BaseEvent) -> List[BaseEvent]:
+        slot = self._slot(event)
+        if slot is None:
+            if isinstance(event, (RunFinishedEvent, RunErrorEvent)):
+                ready = self.flush()
+                ready.append(event)
+                return ready
+            return [event]
+
+        if event.raw_event is not None:
+            # not merged, but kept in order with the updates of its kind
+            ready = self._release(slot)
+            ready.append(event)
+            slot.sent_at = self.clock()
+            return ready
+
+        if slot.pending is not None:
+            ready = self._merge(slot, event)
+        else:
+            slot.pending = event
+            self._order += 1
+            slot.order = self._order
+            ready = []
+        ready.extend(self.poll())
+        return ready
+
+    def flush(self) -> List[BaseEvent]:
+        slots = sorted((self._state, self._messages), key=lambda slot: slot.order)
+        ready: List[BaseEvent] = []
+        for slot in slots:
+            ready.extend(self._release(slot))
+        return ready
+
+    def deadline(self) -> Optional[float]:
+        deadlines = [
+            self._slot_deadline(slot) for slot in (self._state, self._messages) if slot.pending is not None
+        ]
+        return min(deadlines) if deadlines else None
+
+    def poll(self) -> List[BaseEvent]:
+        now = self.clock()
+        slots = sorted((self._state, self._messages), key=lambda slot: slot.order)
+        ready: List[BaseEvent] = []
+        for slot in slots:
+            if slot.pending is not None and self._slot_deadline(slot) <= now:
+                ready.extend(self._release(slot))
+        return ready
+
+    def _slot(self, event: BaseEvent) -> Optional[_Slot]:
+        if isinstance(event, (StateSnapshotEvent, StateDeltaEvent)):
+            return self._state
+        if isinstance(event, MessagesSnapshotEvent):
+            return self._messages
+        return None
+
+    def _slot_deadline(self, slot: _Slot) -> float:
+        return float("-inf") if slot.sent_at is None else slot.sent_at + self.interval
+
+    def _release(self, slot: _Slot) -> List[BaseEvent]:
+        if slot.pending is None:
+            return []
+        event = slot.pending
+        slot.pending = None
+        slot.copied = False
+        slot.sent_at = self.clock()
+        return [event]
+
+    def _merge(self, slot: _Slot, event: BaseEvent) -> List[BaseEvent]:
+        """
+        Combines an update with the held back one. Returns events that have
+        to be sent right away because they cannot be combined.
+        """
+        pending = slot.pending
+        if not isinstance(event, StateDeltaEvent):
+            slot.pending = event
+            slot.copied = False
+            return []
+        if isinstance(pending, StateDeltaEvent):
+            slot.pending = pending.model_copy(update={"delta": compact_patch(pending.delta + event.delta)})
+            return []
+
+        if not slot.copied:
+            # the snapshot is copied once, later deltas are applied in place
+            pending = pending.model_copy(update={"snapshot": copy.deepcopy(pending.snapshot)})
+            slot.pending = pending
+            slot.copied = True
+        try:
+            # the patch is atomic, a failing delta leaves the snapshot unchanged
+            snapshot = apply_patch(pending.snapshot, event.delta)
+        except JsonPatchError:
+            # let the client report the invalid delta
+            ready = self._release(slot)
+            ready.append(event)
+            return ready
+        if snapshot is not pending.snapshot:
+            # the delta replaced the whole document
+            slot.pending = pending.model_copy(update={"snapshot": snapshot})
+        return []
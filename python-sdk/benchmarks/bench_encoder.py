@@ -0,0 +1,86 @@
+"""
+Benchmarks for the EventEncoder.
+
+Run with `poetry run python benchmarks/bench_encoder.py` from the python-sdk directory.
+"""
+
+import timeit
+
+from ag_ui.core import EventType, TextMessageContentEvent
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+
+EVENT_COUNT = 10_000
+REPEAT = 5
+
+
+def make_events():
+    """
+    Returns a stream of token sized text message content events.
+    """
+    return [
+        TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_0123456789",
+            delta=f" token{i}"
+        )
+        for i in range(EVENT_COUNT)
+    ]
+
+
+def report(name, seconds):
+    """
+    Prints the per event cost of a benchmark.
+    """
+    print(f"{name:<40} {seconds / EVENT_COUNT * 1e6:8.3f} us/event")
+
+
+def bench_encode(events):
+    """
+    encode() followed by the UTF-8 encoding every ASGI server performs.
+    """
+    encoder = EventEncoder()
+    return min(timeit.repeat(
+        lambda: [encoder.encode(event).encode("utf-8") for event in events],
+        number=1,
+        repeat=REPEAT
+    ))
+
+
+def bench_encode_bytes(events, accept=None):
+    """
+    encode_bytes(), which skips the str round-trip.
+    """
+    encoder = EventEncoder(accept=accept)
+    return min(timeit.repeat(
+        lambda: [encoder.encode_bytes(event) for event in events],
+        number=1,
+        repeat=REPEAT
+    ))
+
+
+def bench_encode_many(events, batch_size=32):
+    """
+    encode_many() on bursts of `batch_size` events.
+    """
+    encoder = EventEncoder()
+    batches = [events[i:i + batch_size] for i in range(0, len(events), batch_size)]
+    return min(timeit.repeat(
+        lambda: [encoder.encode_many(batch) for batch in batches],
+        number=1,
+        repeat=REPEAT
+    ))
+
+
+def main():
+    """
+    Runs all encoder benchmarks.
+    """
+    events = make_events()
+    report("encode() + str.encode()", bench_encode(events))
+    report("encode_bytes()", bench_encode_bytes(events))
+    report("encode_many() (batches of 32)", bench_encode_many(events))
+    report("encode_bytes() protobuf", bench_encode_bytes(events, AGUI_MEDIA_TYPE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmarks for creating events.
+
+Run with `poetry run python benchmarks/bench_events.py` from the python-sdk directory.
+"""
+
+import timeit
+
+from ag_ui.core import EventType, TextMessageContentEvent, set_trusted_validation
+
+EVENT_COUNT = 100_000
+REPEAT = 5
+
+
+def report(name, seconds):
+    """
+    Prints the per event cost of a benchmark.
+    """
+    print(f"{name:<40} {seconds / EVENT_COUNT * 1e6:10.3f} us/event")
+
+
+def bench(create):
+    """
+    Returns the best time of creating EVENT_COUNT events.
+    """
+    return min(timeit.repeat(
+        lambda: [create(i) for i in range(EVENT_COUNT)],
+        number=1,
+        repeat=REPEAT
+    ))
+
+
+def main():
+    """
+    Runs all event creation benchmarks.
+    """
+    report("TextMessageContentEvent(...)", bench(lambda i: TextMessageContentEvent(
+        type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_0123456789", delta=" token"
+    )))
+    report("TextMessageContentEvent.model_construct", bench(lambda i: TextMessageContentEvent.model_construct(
+        type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_0123456789", delta=" token"
+    )))
+    report("TextMessageContentEvent.trusted", bench(lambda i: TextMessageContentEvent.trusted(
+        message_id="msg_0123456789", delta=" token"
+    )))
+    set_trusted_validation(True)
+    report("trusted, validation on", bench(lambda i: TextMessageContentEvent.trusted(
+        message_id="msg_0123456789", delta=" token"
+    )))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmarks for importing the SDK.
+
+Run with `poetry run python benchmarks/bench_import.py` from the python-sdk directory.
+"""
+
+import subprocess
+import sys
+
+REPEAT = 5
+
+SCRIPT = """
+import time
+import pydantic
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def bench(module):
+    """
+    Returns the best time of importing a module in a fresh interpreter,
+    after pydantic has been imported.
+    """
+    return min(
+        float(subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(module=module)],
+            capture_output=True,
+            check=True,
+            text=True
+        ).stdout)
+        for _ in range(REPEAT)
+    )
+
+
+def main():
+    """
+    Runs all import benchmarks.
+    """
+    for module in ("ag_ui.core", "ag_ui.encoder", "ag_ui.decoder", "ag_ui.server"):
+        print(f"import {module:<30} {bench(module) * 1e3:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
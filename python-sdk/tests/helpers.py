@@ -0,0 +1,13 @@
+"""
+Helpers shared by the test suites.
+"""
+
+
+class FakeClock:
+    """A clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
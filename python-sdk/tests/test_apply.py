@@ -0,0 +1,262 @@
+import asyncio
+import json
+import unittest
+
+from ag_ui.core import (
+    AssistantMessage,
+    CustomEvent,
+    EventType,
+    MessagesSnapshotEvent,
+    RunAgentInput,
+    RunStartedEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    StepFinishedEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallStartEvent,
+    UserMessage,
+)
+from ag_ui.core.events import TextMessageChunkEvent
+from ag_ui.apply import EventReducer, untruncate_json
+
+
+def text_events(message_id, *deltas):
+    """Creates the events of a streamed text message"""
+    return [
+        TextMessageStartEvent(type=EventType.TEXT_MESSAGE_START, message_id=message_id, role="assistant"),
+        *(TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta)
+          for delta in deltas),
+        TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id=message_id),
+    ]
+
+
+def tool_call_events(tool_call_id, name, *deltas, parent_message_id=None):
+    """Creates the events of a streamed tool call"""
+    return [
+        ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id=tool_call_id,
+            tool_call_name=name,
+            parent_message_id=parent_message_id,
+        ),
+        *(ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id=tool_call_id, delta=delta)
+          for delta in deltas),
+        ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id=tool_call_id),
+    ]
+
+
+class TestEventReducer(unittest.TestCase):
+    """Test suite for EventReducer"""
+
+    def test_text_message(self):
+        """Test that text deltas are joined into the message content"""
+        reducer = EventReducer([UserMessage(id="u1", role="user", content="hi")])
+        reducer.apply_all(text_events("m1", "Hello", ", ", "world"))
+        messages = reducer.messages
+        self.assertEqual(len(messages), 2)
+        self.assertIsInstance(messages[1], AssistantMessage)
+        self.assertEqual(messages[1].id, "m1")
+        self.assertEqual(messages[1].content, "Hello, world")
+
+    def test_messages_are_not_changed_later(self):
+        """Test that messages handed out stay unchanged"""
+        reducer = EventReducer()
+        events = text_events("m1", "a", "b", "c")
+        reducer.apply_all(events[:2])
+        first = reducer.messages
+        reducer.apply_all(events[2:])
+        self.assertEqual(first[0].content, "a")
+        self.assertEqual(reducer.messages[0].content, "abc")
+
+    def test_deltas_are_joined_lazily(self):
+        """Test that deltas are kept as chunks until the messages are read"""
+        reducer = EventReducer()
+        reducer.apply_all(text_events("m1", *("x" for _ in range(100))))
+        # pylint: disable=protected-access
+        self.assertEqual(len(reducer._content[0]), 101)
+        self.assertEqual(reducer._messages[0].content, "")
+        self.assertEqual(reducer.messages[0].content, "x" * 100)
+        self.assertEqual(reducer._content, {})
+
+    def test_tool_call_with_parent_message(self):
+        """Test that a tool call is added to its parent message"""
+        reducer = EventReducer()
+        reducer.apply_all(text_events("m1", "Let me check"))
+        reducer.apply_all(tool_call_events("t1", "search", '{"q":', ' "x"}', parent_message_id="m1"))
+        reducer.apply_all(tool_call_events("t2", "lookup", "{}", parent_message_id="m1"))
+        messages = reducer.messages
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].content, "Let me check")
+        self.assertEqual([call.id for call in messages[0].tool_calls], ["t1", "t2"])
+        self.assertEqual(messages[0].tool_calls[0].function.name, "search")
+        self.assertEqual(json.loads(messages[0].tool_calls[0].function.arguments), {"q": "x"})
+        self.assertEqual(messages[0].tool_calls[1].function.arguments, "{}")
+
+    def test_tool_call_without_parent_message(self):
+        """Test that a tool call without a matching parent gets a new message"""
+        reducer = EventReducer()
+        reducer.apply_all(text_events("m1", "Hi"))
+        reducer.apply_all(tool_call_events("t1", "search", "{}"))
+        reducer.apply_all(tool_call_events("t2", "search", "{}", parent_message_id="m2"))
+        messages = reducer.messages
+        self.assertEqual([message.id for message in messages], ["m1", "t1", "m2"])
+        self.assertIsNone(messages[0].tool_calls)
+        self.assertEqual(messages[1].tool_calls[0].id, "t1")
+        self.assertEqual(messages[2].role, "assistant")
+
+    def test_state_snapshot_and_delta(self):
+        """Test that state snapshots and deltas are applied"""
+        reducer = EventReducer(state={"count": 0})
+        reducer.apply(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"count": 1, "items": []}))
+        initial = reducer.state
+        self.assertTrue(reducer.apply(StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[{"op": "add", "path": "/items/-", "value": "a"}, {"op": "replace", "path": "/count", "value": 2}],
+        )))
+        self.assertEqual(reducer.state, {"count": 2, "items": ["a"]})
+        self.assertEqual(initial, {"count": 1, "items": []})
+
+    def test_returned_states_are_not_changed(self):
+        """Test that a moving delta leaves states handed out earlier unchanged"""
+        reducer = EventReducer(state={"lists": [["a"], ["b"], ["c"]], "done": []})
+        kept = reducer.state
+        reducer.apply(StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[
+                {"op": "move", "from": "/lists/0", "path": "/lists/1/0"},
+                {"op": "move", "from": "/lists/0", "path": "/done/-"},
+            ],
+        ))
+        self.assertEqual(reducer.state, {"lists": [[["a"], "c"]], "done": [["b"]]})
+        self.assertEqual(kept, {"lists": [["a"], ["b"], ["c"]], "done": []})
+
+    def test_invalid_state_delta(self):
+        """Test that a failing patch is logged and leaves the state unchanged"""
+        reducer = EventReducer(state={"count": 1})
+        reducer.take_update()
+        with self.assertLogs("ag_ui.apply.reducer", level="WARNING"):
+            changed = reducer.apply(StateDeltaEvent(
+                type=EventType.STATE_DELTA,
+                delta=[{"op": "replace", "path": "/count", "value": 2}, {"op": "remove", "path": "/missing"}],
+            ))
+        self.assertFalse(changed)
+        self.assertEqual(reducer.state, {"count": 1})
+        self.assertIsNone(reducer.take_update())
+
+    def test_messages_snapshot(self):
+        """Test that a messages snapshot replaces pending deltas"""
+        reducer = EventReducer()
+        reducer.apply_all(text_events("m1", "partial"))
+        snapshot = [UserMessage(id="u1", role="user", content="hi")]
+        reducer.apply(MessagesSnapshotEvent(type=EventType.MESSAGES_SNAPSHOT, messages=snapshot))
+        self.assertEqual(reducer.messages, snapshot)
+        reducer.apply_all(text_events("m2", "done"))
+        self.assertEqual([message.id for message in reducer.messages], ["u1", "m2"])
+        self.assertEqual(reducer.messages[1].content, "done")
+
+    def test_predict_state(self):
+        """Test that tool call arguments stream into the state"""
+        reducer = EventReducer(state={"other": True})
+        reducer.apply(CustomEvent(
+            type=EventType.CUSTOM,
+            name="PredictState",
+            value=[
+                {"state_key": "document", "tool": "write_document", "tool_argument": "text"},
+                {"state_key": "plan", "tool": "plan"},
+            ],
+        ))
+        events = tool_call_events("t1", "write_document", '{"text": "Once up', 'on a time', '", "n": 1}')
+        reducer.apply_all(events[:2])
+        self.assertEqual(reducer.state, {"other": True, "document": "Once up"})
+        reducer.apply_all(events[2:])
+        self.assertEqual(reducer.state, {"other": True, "document": "Once upon a time"})
+
+        reducer.apply_all(tool_call_events("t2", "plan", '{"steps": ["a"'))
+        self.assertEqual(reducer.state["plan"], {"steps": ["a"]})
+
+        reducer.apply(StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="write"))
+        reducer.apply_all(tool_call_events("t3", "plan", '{"steps": []}'))
+        self.assertEqual(reducer.state["plan"], {"steps": ["a"]})
+        self.assertEqual(reducer.messages[0].tool_calls[0].function.arguments, '{"text": "Once upon a time", "n": 1}')
+
+    def test_take_update(self):
+        """Test that updates are only produced for what changed"""
+        reducer = EventReducer()
+        self.assertIsNone(reducer.take_update())
+        reducer.apply_all(text_events("m1", "a", "b"))
+        update = reducer.take_update()
+        self.assertEqual(list(update), ["messages"])
+        self.assertEqual(update["messages"][0].content, "ab")
+        self.assertIsNone(reducer.take_update())
+        reducer.apply(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": 1}))
+        self.assertEqual(reducer.take_update(), {"state": {"a": 1}})
+
+    def test_ignored_events(self):
+        """Test that events without effect on messages or state are ignored"""
+        reducer = EventReducer()
+        self.assertFalse(reducer.apply(RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")))
+        self.assertIsNone(reducer.take_update())
+
+    def test_chunk_events_are_rejected(self):
+        """Test that chunk events have to be transformed first"""
+        reducer = EventReducer()
+        with self.assertRaises(ValueError):
+            reducer.apply(TextMessageChunkEvent(type=EventType.TEXT_MESSAGE_CHUNK, message_id="m1", delta="x"))
+
+    def test_from_input(self):
+        """Test that a reducer can start from a run input"""
+        run_input = RunAgentInput(
+            thread_id="t",
+            run_id="r",
+            state={"a": 1},
+            messages=[UserMessage(id="u1", role="user", content="hi")],
+            tools=[],
+            context=[],
+            forwarded_props={},
+        )
+        reducer = EventReducer.from_input(run_input)
+        reducer.apply_all(text_events("m1", "hello"))
+        self.assertEqual([message.id for message in reducer.messages], ["u1", "m1"])
+        self.assertEqual(reducer.state, {"a": 1})
+
+    def test_apply_async(self):
+        """Test that an async stream of events can be applied"""
+        async def events():
+            for event in text_events("m1", "a", "b"):
+                yield event
+
+        reducer = EventReducer()
+        asyncio.run(reducer.apply_async(events()))
+        self.assertEqual(reducer.messages[0].content, "ab")
+
+
+class TestUntruncateJson(unittest.TestCase):
+    """Test suite for untruncate_json"""
+
+    def test_complete_json_is_unchanged(self):
+        """Test that complete documents are returned as they are"""
+        for text in ('{"a": [1, 2, {"b": null}]}', '"x"', "[]", "12"):
+            self.assertEqual(untruncate_json(text), text)
+
+    def test_prefixes_parse(self):
+        """Test that every prefix of a document can be parsed"""
+        document = json.dumps({
+            "text": 'say "hi" \\ é\n',
+            "items": [1, -2.5e3, True, False, None, {"x": []}],
+            "nested": {"deep": {"deeper": ["a", "b"]}},
+        })
+        for end in range(1, len(document) + 1):
+            json.loads(untruncate_json(document[:end]))
+
+    def test_partial_values(self):
+        """Test how partial values are closed"""
+        self.assertEqual(json.loads(untruncate_json('{"text": "Once up')), {"text": "Once up"})
+        self.assertEqual(json.loads(untruncate_json('{"a": 1.')), {"a": 1})
+        self.assertEqual(json.loads(untruncate_json('{"a": -')), {})
+        self.assertEqual(json.loads(untruncate_json('{"a": "x\\u00')), {"a": "x"})
+        self.assertEqual(json.loads(untruncate_json('{"a": [1, tr')), {"a": [1]})
+        self.assertEqual(json.loads(untruncate_json('{"a": 1, "b')), {"a": 1})
@@ -0,0 +1,143 @@
+import asyncio
+import unittest
+
+from ag_ui.core.events import (
+    EventType,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    ToolCallArgsEvent,
+)
+from ag_ui.encoder import DeltaCoalescer
+from tests.helpers import FakeClock
+
+
+def content(delta, message_id="msg_1", **kwargs):
+    """Creates a TextMessageContentEvent"""
+    return TextMessageContentEvent(
+        type=EventType.TEXT_MESSAGE_CONTENT,
+        message_id=message_id,
+        delta=delta,
+        **kwargs
+    )
+
+
+def args(delta, tool_call_id="call_1"):
+    """Creates a ToolCallArgsEvent"""
+    return ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id=tool_call_id, delta=delta)
+
+
+class TestDeltaCoalescer(unittest.TestCase):
+    """Test suite for DeltaCoalescer"""
+
+    def test_merges_consecutive_deltas(self):
+        """Test that consecutive deltas for the same message are merged"""
+        coalescer = DeltaCoalescer(max_bytes=None, max_delay=None)
+        end = TextMessageEndEvent(type=EventType.TEXT_MESSAGE_END, message_id="msg_1")
+        events = list(coalescer.process([content("H", timestamp=1), content("i"), content("!"), end]))
+
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0].delta, "Hi!")
+        self.assertEqual(events[0].message_id, "msg_1")
+        self.assertEqual(events[0].timestamp, 1)
+        self.assertIs(events[1], end)
+
+    def test_single_event_passes_through(self):
+        """Test that a delta that is not merged is emitted unchanged"""
+        coalescer = DeltaCoalescer()
+        event = content("Hello")
+        self.assertEqual(coalescer.push(event), [])
+        flushed = coalescer.flush()
+        self.assertEqual(len(flushed), 1)
+        self.assertIs(flushed[0], event)
+        self.assertEqual(coalescer.flush(), [])
+
+    def test_different_keys_are_not_merged(self):
+        """Test that deltas for different messages or tool calls are kept apart"""
+        coalescer = DeltaCoalescer(max_bytes=None, max_delay=None)
+        events = list(coalescer.process([
+            content("a"), content("b", message_id="msg_2"),
+            args("{"), args("}"), args("x", tool_call_id="call_2"),
+        ]))
+        self.assertEqual(
+            [(type(event), event.delta) for event in events],
+            [
+                (TextMessageContentEvent, "a"),
+                (TextMessageContentEvent, "b"),
+                (ToolCallArgsEvent, "{}"),
+                (ToolCallArgsEvent, "x"),
+            ]
+        )
+
+    def test_raw_events_are_not_merged(self):
+        """Test that events carrying a raw event are never merged"""
+        coalescer = DeltaCoalescer(max_bytes=None, max_delay=None)
+        events = list(coalescer.process([content("a"), content("b", raw_event={"x": 1}), content("c")]))
+        self.assertEqual([event.delta for event in events], ["a", "b", "c"])
+
+    def test_flush_on_size(self):
+        """Test that merged deltas are released once they reach max_bytes"""
+        coalescer = DeltaCoalescer(max_bytes=4, max_delay=None)
+        self.assertEqual(coalescer.push(content("ab")), [])
+        self.assertEqual([event.delta for event in coalescer.push(content("é"))], ["abé"])
+        self.assertEqual(coalescer.flush(), [])
+
+    def test_flush_on_time(self):
+        """Test that merged deltas are released after max_delay"""
+        clock = FakeClock()
+        coalescer = DeltaCoalescer(max_bytes=None, max_delay=0.1, clock=clock)
+        coalescer.push(content("a"))
+        self.assertEqual(coalescer.deadline(), 0.1)
+        clock.now = 0.05
+        self.assertEqual(coalescer.poll(), [])
+        self.assertEqual(coalescer.push(content("b")), [])
+        clock.now = 0.1
+        self.assertEqual([event.delta for event in coalescer.poll()], ["ab"])
+        self.assertIsNone(coalescer.deadline())
+
+        coalescer.push(content("c"))
+        clock.now = 0.3
+        self.assertEqual([event.delta for event in coalescer.push(content("d"))], ["cd"])
+
+    def test_async_stream_flushes_while_idle(self):
+        """Test that the async stream releases deltas when the producer is idle"""
+        received = []
+
+        async def producer():
+            yield content("a")
+            yield content("b")
+            await asyncio.sleep(0.2)
+            yield content("c")
+
+        async def consume():
+            coalescer = DeltaCoalescer(max_bytes=None, max_delay=0.01)
+            async for event in coalescer.stream(producer()):
+                received.append(event.delta)
+
+        asyncio.run(consume())
+        self.assertEqual(received, ["ab", "c"])
+
+    def test_closing_stream_closes_producer(self):
+        """Test that a disconnecting consumer closes the producer"""
+        closed = []
+
+        async def producer():
+            try:
+                yield content("a")
+                await asyncio.sleep(10)
+                yield content("b")
+            finally:
+                closed.append(True)
+
+        async def consume():
+            stream = DeltaCoalescer(max_bytes=None, max_delay=0.01).stream(producer())
+            await stream.__anext__()
+            # the producer is now sleeping inside a pending __anext__
+            await stream.aclose()
+            return asyncio.all_tasks() - {asyncio.current_task()}
+
+        self.assertEqual(asyncio.run(consume()), set())
+        self.assertEqual(closed, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
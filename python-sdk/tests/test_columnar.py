@@ -0,0 +1,74 @@
+import sys
+import unittest
+
+from ag_ui.core import (
+    DeltaColumns,
+    EventType,
+    RunStartedEvent,
+    TextMessageContentEvent,
+    ToolCallArgsEvent,
+)
+
+
+def make_events():
+    """Creates interleaved text and tool call deltas"""
+    return [
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta="Héllo"),
+        ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta='{"q":', timestamp=7),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m1", delta=" 👋"),
+        ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c1", delta='"x"}'),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m2", delta="!"),
+    ]
+
+
+class TestDeltaColumns(unittest.TestCase):
+    """Test suite for DeltaColumns"""
+
+    def test_round_trip(self):
+        """Test that events come back unchanged"""
+        events = make_events()
+        columns = DeltaColumns(events)
+        self.assertEqual(len(columns), len(events))
+        self.assertEqual(columns.to_events(), events)
+        self.assertEqual(list(columns), events)
+        self.assertEqual(columns[-1], events[-1])
+        self.assertEqual(columns[1:3], events[1:3])
+        self.assertEqual(
+            [event.model_dump_json(by_alias=True, exclude_none=True) for event in columns],
+            [event.model_dump_json(by_alias=True, exclude_none=True) for event in events]
+        )
+        with self.assertRaises(IndexError):
+            _ = columns[len(events)]
+
+    def test_ids_are_interned(self):
+        """Test that each id is stored once"""
+        columns = DeltaColumns(make_events())
+        self.assertEqual(columns.ids, ["m1", "c1", "m2"])
+        self.assertEqual(columns.text("m1"), "Héllo 👋")
+        self.assertEqual(columns.text("c1"), '{"q":"x"}')
+        self.assertEqual(columns.text("unknown"), "")
+
+    def test_rejects_other_events(self):
+        """Test that only delta events without raw_event can be stored"""
+        columns = DeltaColumns()
+        with self.assertRaises(ValueError):
+            columns.append(RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"))
+        with self.assertRaises(ValueError):
+            columns.append(TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="x", raw_event={"a": 1}
+            ))
+        self.assertEqual(len(columns), 0)
+
+    def test_smaller_than_events(self):
+        """Test that the columns use far less memory than the events"""
+        events = [
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta=" token")
+            for _ in range(1000)
+        ]
+        columns = DeltaColumns(events)
+        event_size = sys.getsizeof(events[0]) + sys.getsizeof(events[0].__dict__)
+        self.assertLess(columns.nbytes * 10, event_size * len(events))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import copy
+import random
+import unittest
+
+from ag_ui.core import CustomEvent, EventType, StateDeltaEvent, StateSnapshotEvent
+from ag_ui.state import StateDeltaCompactor, apply_patch, compact_patch
+from tests.helpers import FakeClock
+
+
+def delta(*operations):
+    """Creates a StateDeltaEvent"""
+    return StateDeltaEvent(type=EventType.STATE_DELTA, delta=list(operations))
+
+
+def random_patch(rng, state, length):
+    """
+    Creates a valid patch against `state` from writes to a few keys, array
+    appends and the odd copy and test. Adds both create and replace members.
+    """
+    state = copy.deepcopy(state)
+    patch = []
+    keys = ["a", "b", "c"]
+    while len(patch) < length:
+        parent_path = rng.choice(["", "/obj"])
+        parent = state if parent_path == "" else state.get("obj")
+        if not isinstance(parent, dict):
+            parent_path, parent = "", state
+        key = rng.choice(keys)
+        path = f"{parent_path}/{key}"
+        choice = rng.random()
+        if choice < 0.1:
+            operation = {"op": "add", "path": "/list/-", "value": len(patch)}
+        elif choice < 0.15 and key in parent:
+            operation = {"op": "copy", "from": path, "path": "/copied"}
+        elif choice < 0.2 and key in parent:
+            operation = {"op": "test", "path": path, "value": copy.deepcopy(parent[key])}
+        elif key in parent:
+            if rng.random() < 0.3:
+                operation = {"op": "add", "path": path, "value": rng.choice([len(patch), {}])}
+            elif rng.random() < 0.4:
+                operation = {"op": "remove", "path": path}
+            else:
+                operation = {"op": "replace", "path": path, "value": rng.choice([len(patch), {"x": 1}])}
+        else:
+            operation = {"op": "add", "path": path, "value": rng.choice([len(patch), {}])}
+        state = apply_patch(state, [operation])
+        patch.append(operation)
+    return patch
+
+
+class TestCompactPatch(unittest.TestCase):
+    """Test suite for compact_patch"""
+
+    def test_superseded_replaces(self):
+        """Test that only the last replace of a field is kept"""
+        patch = [{"op": "replace", "path": "/progress", "value": i} for i in range(10)]
+        self.assertEqual(compact_patch(patch), [{"op": "replace", "path": "/progress", "value": 9}])
+
+    def test_non_ascii_digits_are_keys(self):
+        """Test that tokens with non-ASCII digits are compacted as object keys"""
+        patch = [{"op": "replace", "path": "/\u00b2", "value": i} for i in range(3)]
+        self.assertEqual(compact_patch(patch), patch[-1:])
+
+    def test_add_then_replace(self):
+        """Test folding an add and a replace into one add"""
+        patch = [
+            {"op": "add", "path": "/step", "value": "plan"},
+            {"op": "replace", "path": "/step", "value": "act"},
+        ]
+        self.assertEqual(compact_patch(patch), [{"op": "add", "path": "/step", "value": "act"}])
+
+    def test_add_then_remove(self):
+        """Test that an added member is removed, dropping the writes below it"""
+        patch = [
+            {"op": "add", "path": "/tmp", "value": {}},
+            {"op": "add", "path": "/tmp/x", "value": 1},
+            {"op": "add", "path": "/tmp/list", "value": []},
+            {"op": "add", "path": "/tmp/list/-", "value": 1},
+            {"op": "remove", "path": "/tmp"},
+        ]
+        self.assertEqual(compact_patch(patch), [
+            {"op": "add", "path": "/tmp", "value": None},
+            {"op": "remove", "path": "/tmp"},
+        ])
+
+    def test_add_then_remove_of_existing_member(self):
+        """Test that an add replacing a member does not cancel its removal"""
+        patch = [
+            {"op": "add", "path": "/progress", "value": 0.5},
+            {"op": "remove", "path": "/progress"},
+        ]
+        compacted = compact_patch(patch)
+        self.assertEqual(apply_patch({"progress": 0.1}, compacted), {})
+        self.assertEqual(apply_patch({}, compacted), {})
+
+    def test_replace_then_add_then_remove(self):
+        """Test that writes to a member that existed become a single remove"""
+        patch = [
+            {"op": "replace", "path": "/x", "value": 1},
+            {"op": "add", "path": "/x", "value": 2},
+            {"op": "remove", "path": "/x"},
+        ]
+        self.assertEqual(compact_patch(patch), [{"op": "remove", "path": "/x"}])
+
+    def test_remove_add_remove(self):
+        """Test that a removed member stays removed"""
+        patch = [
+            {"op": "remove", "path": "/x"},
+            {"op": "add", "path": "/x", "value": 1},
+            {"op": "remove", "path": "/x"},
+        ]
+        self.assertEqual(compact_patch(patch), [{"op": "remove", "path": "/x"}])
+
+    def test_barriers(self):
+        """Test that operations are not merged across reads of the same path"""
+        patch = [
+            {"op": "replace", "path": "/x", "value": 1},
+            {"op": "copy", "from": "/x", "path": "/y"},
+            {"op": "replace", "path": "/x", "value": 2},
+            {"op": "replace", "path": "/z", "value": 1},
+            {"op": "test", "path": "/other", "value": 1},
+            {"op": "replace", "path": "/z", "value": 2},
+        ]
+        self.assertEqual(compact_patch(patch), patch[:3] + patch[4:])
+
+    def test_array_paths_are_kept(self):
+        """Test that operations with array indices are not merged"""
+        patch = [
+            {"op": "add", "path": "/list/0", "value": 1},
+            {"op": "remove", "path": "/list/0"},
+            {"op": "replace", "path": "/list/1", "value": 2},
+        ]
+        self.assertEqual(compact_patch(patch), patch)
+
+    def test_equivalence(self):
+        """Test that compacted random patches have the same effect"""
+        rng = random.Random(6902)
+        for _ in range(300):
+            state = {"a": 1, "obj": {"b": 2}, "list": []}
+            patch = random_patch(rng, state, rng.randint(1, 12))
+            compacted = compact_patch(patch)
+            self.assertLessEqual(len(compacted), len(patch))
+            self.assertEqual(
+                apply_patch(copy.deepcopy(state), compacted),
+                apply_patch(copy.deepcopy(state), patch),
+                msg=f"{patch} -> {compacted}"
+            )
+
+
+class TestStateDeltaCompactor(unittest.TestCase):
+    """Test suite for StateDeltaCompactor"""
+
+    def test_one_delta_per_window(self):
+        """Test that the deltas of a window are merged"""
+        clock = FakeClock()
+        stage = StateDeltaCompactor(max_delay=0.1, clock=clock)
+        for i in range(5):
+            self.assertEqual(stage.push(delta({"op": "replace", "path": "/n", "value": i})), [])
+        self.assertEqual(stage.deadline(), 0.1)
+        clock.now = 0.1
+        ready = stage.poll()
+        self.assertEqual(ready, [delta({"op": "replace", "path": "/n", "value": 4})])
+        self.assertIsNone(stage.deadline())
+
+    def test_other_events_flush(self):
+        """Test that other events keep their order"""
+        stage = StateDeltaCompactor()
+        custom = CustomEvent(type=EventType.CUSTOM, name="x", value=1)
+        stage.push(delta({"op": "add", "path": "/a", "value": 1}))
+        self.assertEqual(stage.push(custom), [delta({"op": "add", "path": "/a", "value": 1}), custom])
+
+    def test_snapshot_drops_pending_deltas(self):
+        """Test that a snapshot replaces held back deltas"""
+        stage = StateDeltaCompactor()
+        snapshot = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": 2})
+        stage.push(delta({"op": "replace", "path": "/a", "value": 1}))
+        self.assertEqual(stage.push(snapshot), [snapshot])
+        self.assertEqual(stage.flush(), [])
+
+    def test_removed_member_stays_removed(self):
+        """Test that a window adding and removing a member still removes it"""
+        events = [
+            delta({"op": "add", "path": "/progress", "value": 0.5}),
+            delta({"op": "remove", "path": "/progress"}),
+        ]
+        ready = list(StateDeltaCompactor(max_delay=None).process(events))
+        self.assertEqual(len(ready), 1)
+        self.assertEqual(apply_patch({"progress": 0.1}, ready[0].delta), {})
+
+    def test_empty_window_sends_nothing(self):
+        """Test that a window without operations sends no event"""
+        self.assertEqual(list(StateDeltaCompactor(max_delay=None).process([delta()])), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
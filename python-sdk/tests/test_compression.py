@@ -0,0 +1,90 @@
+import gzip
+import unittest
+import zlib
+
+from ag_ui.core.events import EventType, TextMessageContentEvent
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.compression import StreamCompressor, negotiate_content_encoding
+
+
+def make_events(count=200):
+    """Creates a stream of token sized content events"""
+    return [
+        TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_0123456789abcdef",
+            delta=f" word{i % 7}"
+        )
+        for i in range(count)
+    ]
+
+
+class TestCompression(unittest.TestCase):
+    """Test suite for streaming compression"""
+
+    def test_negotiate_content_encoding(self):
+        """Test picking a content coding from Accept-Encoding"""
+        self.assertIsNone(negotiate_content_encoding(None))
+        self.assertIsNone(negotiate_content_encoding(""))
+        self.assertIsNone(negotiate_content_encoding("identity"))
+        self.assertIsNone(negotiate_content_encoding("br"))
+        self.assertEqual(negotiate_content_encoding("gzip, deflate, br"), "gzip")
+        self.assertEqual(negotiate_content_encoding("deflate"), "deflate")
+        self.assertEqual(negotiate_content_encoding("gzip;q=0.5, deflate"), "deflate")
+        self.assertEqual(negotiate_content_encoding("GZIP"), "gzip")
+        self.assertEqual(negotiate_content_encoding("*"), "gzip")
+        self.assertEqual(negotiate_content_encoding("gzip;q=0, *"), "deflate")
+        self.assertIsNone(negotiate_content_encoding("gzip;q=0, deflate;q=0"))
+
+    def test_unsupported_encoding(self):
+        """Test that unknown codings are rejected"""
+        with self.assertRaises(ValueError):
+            StreamCompressor("br")
+
+    def test_each_event_is_decompressible(self):
+        """Test that every encoded event can be decompressed as soon as it arrives"""
+        for accept_encoding, wbits in (("gzip", 16 + zlib.MAX_WBITS), ("deflate", zlib.MAX_WBITS)):
+            encoder = EventEncoder(accept_encoding=accept_encoding)
+            plain = EventEncoder()
+            self.assertEqual(encoder.get_content_encoding(), accept_encoding)
+            decompressor = zlib.decompressobj(wbits)
+            for event in make_events(20):
+                chunk = encoder.encode(event)
+                self.assertIsInstance(chunk, bytes)
+                self.assertEqual(decompressor.decompress(chunk), plain.encode_bytes(event))
+
+    def test_complete_gzip_stream(self):
+        """Test that a finished stream is a valid gzip file"""
+        events = make_events()
+        encoder = EventEncoder(accept_encoding="gzip")
+        body = b"".join(encoder.encode_bytes(event) for event in events) + encoder.finish()
+        self.assertEqual(gzip.decompress(body), EventEncoder().encode_many(events))
+
+    def test_batches_and_protobuf(self):
+        """Test compressing batches and protobuf streams"""
+        events = make_events()
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE, accept_encoding="deflate")
+        body = encoder.encode_many(events[:100])
+        body += b"".join(encoder.encode_many_views(events[100:]))
+        body += encoder.finish()
+        expected = EventEncoder(accept=AGUI_MEDIA_TYPE).encode_many(events)
+        self.assertEqual(zlib.decompress(body), expected)
+
+    def test_compression_ratio(self):
+        """Test that the shared dictionary compresses repetitive events well"""
+        events = make_events()
+        encoder = EventEncoder(accept_encoding="gzip")
+        compressed = sum(len(encoder.encode_bytes(event)) for event in events)
+        uncompressed = len(EventEncoder().encode_many(events))
+        self.assertGreater(uncompressed / compressed, 5)
+
+    def test_no_compression(self):
+        """Test that encoders without Accept-Encoding behave as before"""
+        encoder = EventEncoder()
+        self.assertIsNone(encoder.get_content_encoding())
+        self.assertIsInstance(encoder.encode(make_events(1)[0]), str)
+        self.assertEqual(encoder.finish(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import copy
+import unittest
+
+from ag_ui.core import StateDeltaEvent, StateSnapshotEvent
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.state import StateEmitter, apply_patch, diff
+
+
+class TestDiff(unittest.TestCase):
+    """Test suite for diff"""
+
+    def test_diff_round_trip(self):
+        """Test that applying the diff turns the old value into the new one"""
+        cases = [
+            ({"a": 1, "b": 2}, {"a": 1, "b": 3, "c": 4}),
+            ({"a": {"b": [1, 2, 3]}}, {"a": {"b": [1, 3]}}),
+            ([1, 2, 3, 4, 5], [1, 9, 4, 5, 6, 7]),
+            ([{"id": 1}, {"id": 2}], [{"id": 2}]),
+            ({"a/b": {"~c": 1}}, {"a/b": {"~c": 2}}),
+            ({"flag": 1}, {"flag": True}),
+            ({"a": [1]}, {"a": {"0": 1}}),
+            (1, [1]),
+            ({"x": 1}, {}),
+        ]
+        for old, new in cases:
+            with self.subTest(old=old, new=new):
+                patch = diff(old, new)
+                self.assertEqual(apply_patch(copy.deepcopy(old), patch), new)
+
+    def test_minimal_operations(self):
+        """Test that unchanged parts produce no operations"""
+        old = {"items": [{"n": i} for i in range(100)], "title": "x"}
+        new = copy.deepcopy(old)
+        new["items"][50]["n"] = -1
+        self.assertEqual(diff(old, new), [{"op": "replace", "path": "/items/50/n", "value": -1}])
+        self.assertEqual(diff(old, copy.deepcopy(old)), [])
+
+
+class TestStateEmitter(unittest.TestCase):
+    """Test suite for StateEmitter"""
+
+    def test_first_update_is_snapshot(self):
+        """Test that a new stream starts with a snapshot"""
+        event = StateEmitter().update({"a": 1})
+        self.assertIsInstance(event, StateSnapshotEvent)
+        self.assertEqual(event.snapshot, {"a": 1})
+
+    def test_small_change_is_delta(self):
+        """Test that a small change to a large state is sent as a delta"""
+        emitter = StateEmitter()
+        state = {"documents": ["text " * 100 for _ in range(10)], "count": 0}
+        emitter.update(state)
+        state["count"] = 1
+        event = emitter.update(state)
+        self.assertIsInstance(event, StateDeltaEvent)
+        self.assertEqual(event.delta, [{"op": "replace", "path": "/count", "value": 1}])
+        self.assertIsNone(emitter.update(state))
+
+    def test_large_change_is_snapshot(self):
+        """Test that a rewrite of a small state is sent as a snapshot"""
+        emitter = StateEmitter()
+        emitter.update({"a": 1, "b": 2, "c": 3})
+        event = emitter.update({"x": 1})
+        self.assertIsInstance(event, StateSnapshotEvent)
+        event = emitter.update({"x": 1, "y": "a longer value than the rest of the state"})
+        self.assertIsInstance(event, StateSnapshotEvent)
+
+    def test_mutating_state_after_update(self):
+        """Test that the remembered state is a copy"""
+        emitter = StateEmitter()
+        state = {"items": [1, 2, 3], "big": "x" * 500}
+        emitter.update(state)
+        state["items"].append(4)
+        event = emitter.update(state)
+        self.assertEqual(event.delta, [{"op": "add", "path": "/items/3", "value": 4}])
+
+    def test_reset_and_snapshot(self):
+        """Test forcing a snapshot"""
+        emitter = StateEmitter()
+        state = {"big": "x" * 500, "n": 1}
+        emitter.update(state)
+        emitter.reset()
+        self.assertIsInstance(emitter.update(state), StateSnapshotEvent)
+        self.assertIsInstance(emitter.snapshot(state), StateSnapshotEvent)
+        self.assertIsNone(emitter.update(state))
+
+    def test_protobuf_sizes(self):
+        """Test choosing by protobuf size"""
+        emitter = StateEmitter(EventEncoder(accept=AGUI_MEDIA_TYPE))
+        emitter.update({"big": "x" * 500, "n": 1})
+        self.assertIsInstance(emitter.update({"big": "x" * 500, "n": 2}), StateDeltaEvent)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
+import asyncio
+import gzip
 import unittest
 import json
 from datetime import datetime
 
 from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
 from ag_ui.core.events import BaseEvent, EventType, TextMessageContentEvent, ToolCallStartEvent
+from ag_ui import proto
 
 
 class TestEventEncoder(unittest.TestCase):
@@ -186,3 +189,199 @@ class TestEventEncoder(unittest.TestCase):
             original_event.model_dump(), 
             deserialized_event.model_dump()
         )
+
+    def test_content_type_negotiation(self):
+        """Test that the content type reflects the Accept header"""
+        self.assertEqual(EventEncoder().get_content_type(), "text/event-stream")
+        self.assertEqual(
+            EventEncoder(accept="text/event-stream").get_content_type(),
+            "text/event-stream"
+        )
+        self.assertEqual(
+            EventEncoder(accept=f"text/event-stream, {AGUI_MEDIA_TYPE}").get_content_type(),
+            AGUI_MEDIA_TYPE
+        )
+        self.assertEqual(
+            EventEncoder(accept=f"text/event-stream, {AGUI_MEDIA_TYPE};q=0.5").get_content_type(),
+            "text/event-stream"
+        )
+        self.assertEqual(
+            EventEncoder(accept=f"{AGUI_MEDIA_TYPE};q=0").get_content_type(),
+            "text/event-stream"
+        )
+        # wildcards alone never select protobuf
+        self.assertEqual(EventEncoder(accept="*/*").get_content_type(), "text/event-stream")
+
+    def test_encode_protobuf(self):
+        """Test that a protobuf encoder writes length prefixed protobuf messages"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta="Hello, world!",
+            timestamp=1648214400000
+        )
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        encoded = encoder.encode(event)
+
+        self.assertIsInstance(encoded, bytes)
+        length = int.from_bytes(encoded[:4], "big")
+        self.assertEqual(length, len(encoded) - 4)
+        self.assertEqual(proto.decode(encoded[4:]), event)
+
+    def test_encode_bytes(self):
+        """Test that encode_bytes matches the string encoding byte for byte"""
+        events = [
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT,
+                message_id="msg_123",
+                delta="Hällo \"wörld\"\n👋",
+                timestamp=1648214400000
+            ),
+            ToolCallStartEvent(
+                type=EventType.TOOL_CALL_START,
+                tool_call_id="call_123",
+                tool_call_name="test_tool"
+            ),
+            BaseEvent(type=EventType.RAW, raw_event={"a": [1, None]}),
+        ]
+        encoder = EventEncoder()
+        for event in events:
+            encoded = encoder.encode_bytes(event)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(encoded, encoder.encode(event).encode("utf-8"))
+
+        protobuf_encoder = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        self.assertEqual(
+            protobuf_encoder.encode_bytes(events[0]),
+            protobuf_encoder.encode(events[0])
+        )
+
+    def test_encode_many(self):
+        """Test that batch encoding equals the concatenation of single events"""
+        events = [
+            TextMessageContentEvent(
+                type=EventType.TEXT_MESSAGE_CONTENT,
+                message_id="msg_123",
+                delta=f"token {i}"
+            )
+            for i in range(5)
+        ]
+        for encoder in (EventEncoder(), EventEncoder(accept=AGUI_MEDIA_TYPE)):
+            expected = b"".join(encoder.encode_bytes(event) for event in events)
+            self.assertEqual(encoder.encode_many(events), expected)
+            # generators are accepted as well
+            self.assertEqual(encoder.encode_many(event for event in events), expected)
+
+            views = encoder.encode_many_views(events)
+            self.assertTrue(all(isinstance(view, memoryview) for view in views))
+            self.assertEqual(b"".join(views), expected)
+
+            self.assertEqual(encoder.encode_many([]), b"")
+            self.assertEqual(encoder.encode_many_views([]), [])
+
+
+class TestEventEncoderStream(unittest.TestCase):
+    """Test suite for EventEncoder.stream"""
+
+    @staticmethod
+    def make_event(delta):
+        """Creates a TextMessageContentEvent"""
+        return TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_123",
+            delta=delta
+        )
+
+    def test_stream_encodes_events(self):
+        """Test that the stream yields one encoded chunk per event"""
+        events = [self.make_event(str(i)) for i in range(3)]
+
+        async def producer():
+            for event in events:
+                yield event
+
+        async def consume():
+            encoder = EventEncoder()
+            return [chunk async for chunk in encoder.stream(producer())]
+
+        chunks = asyncio.run(consume())
+        self.assertEqual(chunks, [EventEncoder().encode_bytes(event) for event in events])
+
+    def test_heartbeats_while_idle(self):
+        """Test that SSE comments are sent while the producer is idle"""
+        async def producer():
+            yield self.make_event("a")
+            await asyncio.sleep(0.12)
+            yield self.make_event("b")
+
+        async def consume(encoder):
+            return [chunk async for chunk in encoder.stream(producer(), heartbeat_interval=0.05)]
+
+        chunks = asyncio.run(consume(EventEncoder()))
+        self.assertEqual(chunks[0], EventEncoder().encode_bytes(self.make_event("a")))
+        self.assertEqual(chunks[-1], EventEncoder().encode_bytes(self.make_event("b")))
+        self.assertGreaterEqual(len(chunks[1:-1]), 1)
+        self.assertTrue(all(chunk == b": ping\n\n" for chunk in chunks[1:-1]))
+
+        # protobuf streams have no heartbeats
+        chunks = asyncio.run(consume(EventEncoder(accept=AGUI_MEDIA_TYPE)))
+        self.assertEqual(len(chunks), 2)
+
+    def test_backpressure(self):
+        """Test that the producer is not drained ahead of a slow consumer"""
+        produced = []
+
+        async def producer():
+            for i in range(100):
+                produced.append(i)
+                yield self.make_event(str(i))
+
+        async def consume():
+            stream = EventEncoder().stream(producer())
+            await stream.__anext__()
+            await stream.__anext__()
+            await asyncio.sleep(0.01)
+            count = len(produced)
+            await stream.aclose()
+            return count
+
+        self.assertLessEqual(asyncio.run(consume()), 3)
+
+    def test_closing_stream_closes_producer(self):
+        """Test that a disconnecting consumer closes the producer"""
+        closed = []
+
+        async def producer():
+            try:
+                yield self.make_event("a")
+                await asyncio.sleep(10)
+                yield self.make_event("b")
+            finally:
+                closed.append(True)
+
+        async def consume():
+            stream = EventEncoder().stream(producer(), heartbeat_interval=None)
+            await stream.__anext__()
+            # the producer is now sleeping inside a pending __anext__
+            next_chunk = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.01)
+            next_chunk.cancel()
+            await asyncio.wait((next_chunk,))
+            await stream.aclose()
+
+        asyncio.run(consume())
+        self.assertEqual(closed, [True])
+
+    def test_compressed_stream_is_finished(self):
+        """Test that compressed streams end with the gzip trailer"""
+        events = [self.make_event(str(i)) for i in range(3)]
+
+        async def producer():
+            for event in events:
+                yield event
+
+        async def consume():
+            encoder = EventEncoder(accept_encoding="gzip")
+            return b"".join([chunk async for chunk in encoder.stream(producer())])
+
+        self.assertEqual(gzip.decompress(asyncio.run(consume())), EventEncoder().encode_many(events))
@@ -0,0 +1,104 @@
+import unittest
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    StateSnapshotEvent,
+    TextMessageContentEvent,
+    ToolCallArgsEvent,
+)
+from ag_ui.decoder import LazyEvent, ProtoDecoder, SSEDecoder
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui import proto
+
+
+class TestLazyEvent(unittest.TestCase):
+    """Test suite for LazyEvent"""
+
+    def test_json_routing_keys(self):
+        """Test reading routing keys without validating the event"""
+        data = (
+            b' {"rawEvent": {"a": [1, "}", {"b": "\\"]"}]}, "delta": "x",'
+            b' "type": "TEXT_MESSAGE_CONTENT", "messageId": "m\\u00e9"} '
+        )
+        event = LazyEvent.from_json(data)
+        self.assertEqual(event.type, EventType.TEXT_MESSAGE_CONTENT)
+        self.assertEqual(event.message_id, "mé")
+        self.assertIsNone(event.run_id)
+        self.assertIsNone(event._event)  # pylint: disable=protected-access
+        self.assertEqual(event.delta, "x")
+        self.assertIsInstance(event.event, TextMessageContentEvent)
+
+    def test_proto_routing_keys(self):
+        """Test reading routing keys from protobuf bytes"""
+        original = RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+        event = LazyEvent.from_proto(proto.encode(original))
+        self.assertEqual(event.type, EventType.RUN_STARTED)
+        self.assertEqual(event.thread_id, "t")
+        self.assertEqual(event.run_id, "r")
+        self.assertIsNone(event.message_id)
+        self.assertIsNone(event._event)  # pylint: disable=protected-access
+        self.assertEqual(event.event, original)
+
+    def test_routing_does_not_validate(self):
+        """Test that invalid fields are only reported on full access"""
+        event = LazyEvent.from_json(b'{"type":"TOOL_CALL_ARGS","toolCallId":"c","delta":1}')
+        self.assertEqual(event.tool_call_id, "c")
+        with self.assertRaises(ValueError):
+            _ = event.event
+
+    def test_invalid_envelopes(self):
+        """Test that malformed input is rejected when routing keys are read"""
+        for data in (b"[]", b'{"messageId":"m"}', b'{"type":"NOPE"}', b'{"type" "X"}'):
+            with self.assertRaises(ValueError):
+                _ = LazyEvent.from_json(data).type
+        with self.assertRaises(ValueError):
+            LazyEvent(b"", "xml")
+
+    def test_conversions(self):
+        """Test converting between formats"""
+        original = ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta='{"a"')
+        from_json = LazyEvent.from_json(original.model_dump_json(by_alias=True, exclude_none=True))
+        self.assertEqual(from_json.to_proto(), proto.encode(original))
+        from_proto = LazyEvent.from_proto(proto.encode(original))
+        self.assertEqual(from_proto.to_json(), from_json.raw)
+
+    def test_sse_reemission_is_verbatim(self):
+        """Test that the encoder sends the received JSON as it is"""
+        raw = b'{"type":"STATE_SNAPSHOT","snapshot":{"b":1,"a":2}}'
+        decoder = SSEDecoder(lazy=True)
+        events = decoder.feed(b"data: " + raw + b"\n\n")
+        self.assertEqual(len(events), 1)
+        self.assertIsInstance(events[0], LazyEvent)
+        encoder = EventEncoder()
+        self.assertEqual(encoder.encode_bytes(events[0]), b"data: " + raw + b"\n\n")
+        self.assertEqual(encoder.encode(events[0]), "data: " + raw.decode() + "\n\n")
+
+    def test_multiline_sse_roundtrip(self):
+        """Test that an event received from multi-line data fields is sent on one line"""
+        decoder = SSEDecoder(lazy=True)
+        [lazy] = decoder.feed(b'data: {"type":"STATE_SNAPSHOT",\ndata: "snapshot":{"a":\r\ndata: [1, 2]}}\n\n')
+        self.assertIn(b"\n", lazy.raw)
+        encoder = EventEncoder()
+        expected = StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": [1, 2]})
+        for frame in (encoder.encode_bytes(lazy), encoder.encode(lazy).encode("utf-8")):
+            self.assertEqual(frame.count(b"\n"), 2)
+            self.assertEqual(SSEDecoder().feed(frame), [expected])
+
+    def test_proto_reemission_is_verbatim(self):
+        """Test that a protobuf stream is relayed without re-encoding"""
+        encoder = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        events = [
+            RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"),
+            StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"x": [1, 2.5]}),
+        ]
+        stream = encoder.encode_many(events)
+        lazy = list(ProtoDecoder(lazy=True).decode([stream[:7], stream[7:]]))
+        self.assertEqual([event.type for event in lazy], [event.type for event in events])
+        self.assertEqual(encoder.encode_many(lazy), stream)
+        self.assertEqual(b"".join(encoder.encode_bytes(event) for event in lazy), stream)
+        self.assertEqual([event.event for event in lazy], events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from ag_ui.core import json_equal
+
+
+class TestJsonEqual(unittest.TestCase):
+    """Test suite for json_equal"""
+
+    def test_numbers_and_containers(self):
+        """Test that equal JSON values compare equal"""
+        self.assertTrue(json_equal({"a": [1, 2.0]}, {"a": [1.0, 2]}))
+        self.assertFalse(json_equal({"a": 1}, {"a": 1, "b": 2}))
+        self.assertFalse(json_equal([1, 2], [2, 1]))
+
+    def test_booleans_are_not_numbers(self):
+        """Test that booleans are not equal to numbers, also when nested"""
+        self.assertFalse(json_equal(True, 1))
+        self.assertFalse(json_equal({"a": [True]}, {"a": [1]}))
+        self.assertFalse(json_equal([0], [False]))
+        self.assertTrue(json_equal([False], [False]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -23,7 +23,8 @@ from ag_ui.core.events import (
     RunErrorEvent,
     StepStartedEvent,
     StepFinishedEvent,
-    Event
+    Event,
+    set_trusted_validation
 )
 
 
@@ -569,5 +570,64 @@ class TestEvents(unittest.TestCase):
         self.assertEqual(deserialized.delta, text)
 
 
+class TestTrustedEvents(unittest.TestCase):
+    """Test suite for BaseEvent.trusted"""
+
+    def tearDown(self):
+        set_trusted_validation(False)
+
+    def test_trusted_matches_validated(self):
+        """Test that trusted events equal and serialize like validated ones"""
+        cases = [
+            (TextMessageContentEvent, {"message_id": "m", "delta": "Hi"}),
+            (ToolCallArgsEvent, {"tool_call_id": "c", "delta": "{", "timestamp": 5}),
+            (ToolCallStartEvent, {"tool_call_id": "c", "tool_call_name": "f"}),
+            (StateDeltaEvent, {"delta": [{"op": "add", "path": "/a", "value": 1}]}),
+            (RunErrorEvent, {"message": "boom", "raw_event": {"x": 1}}),
+        ]
+        for cls, fields in cases:
+            with self.subTest(cls=cls.__name__):
+                event_type = cls.model_fields["type"].annotation.__args__[0]
+                validated = cls(type=event_type, **fields)
+                trusted = cls.trusted(**fields)
+                self.assertIs(type(trusted), cls)
+                self.assertEqual(trusted, validated)
+                self.assertEqual(trusted.model_fields_set, validated.model_fields_set)
+                self.assertEqual(
+                    trusted.model_dump_json(by_alias=True, exclude_none=True),
+                    validated.model_dump_json(by_alias=True, exclude_none=True)
+                )
+
+    def test_trusted_skips_validation(self):
+        """Test that trusted events are not validated by default"""
+        event = TextMessageContentEvent.trusted(message_id="m", delta="")
+        self.assertEqual(event.delta, "")
+
+    def test_validation_switch(self):
+        """Test that validation can be turned back on"""
+        set_trusted_validation(True)
+        with self.assertRaises(ValidationError):
+            TextMessageContentEvent.trusted(message_id="m", delta="")
+        with self.assertRaises(ValidationError):
+            RunStartedEvent.trusted(thread_id=1, run_id="r")
+        event = RunStartedEvent.trusted(thread_id="t", run_id="r")
+        self.assertEqual(event.run_id, "r")
+
+    def test_validation_with_optional_fields(self):
+        """Test that optional fields can be given with validation turned on"""
+        set_trusted_validation(True)
+        event = ToolCallArgsEvent.trusted(tool_call_id="c", delta="x", timestamp=5)
+        self.assertEqual(event.timestamp, 5)
+        self.assertEqual(
+            event,
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id="c", delta="x", timestamp=5)
+        )
+
+    def test_base_event_is_not_trusted_constructible(self):
+        """Test that only concrete event classes can be created"""
+        with self.assertRaises(TypeError):
+            BaseEvent.trusted(type=EventType.RAW)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# seconds that importing ag_ui on top of pydantic may take, far above the
+# usual cost so that only real regressions fail
+IMPORT_BUDGET = 1.0
+
+IMPORT_SCRIPT = """
+import json
+import time
+
+import pydantic
+
+start = time.perf_counter()
+import ag_ui.core
+import ag_ui.encoder
+elapsed = time.perf_counter() - start
+
+def subclasses(cls):
+    for sub in cls.__subclasses__():
+        yield sub
+        yield from subclasses(sub)
+
+def built():
+    return sorted(
+        cls.__name__ for cls in subclasses(ag_ui.core.types.ConfiguredBaseModel)
+        if cls.__pydantic_complete__
+    )
+
+after_import = built()
+ag_ui.core.TextMessageContentEvent(type="TEXT_MESSAGE_CONTENT", message_id="m", delta="x")
+print(json.dumps({"elapsed": elapsed, "after_import": after_import, "after_use": built()}))
+"""
+
+
+class TestImport(unittest.TestCase):
+    """Test suite for the cost of importing the SDK"""
+
+    @classmethod
+    def setUpClass(cls):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout
+        cls.result = json.loads(output)
+
+    def test_no_schemas_built_on_import(self):
+        """Test that importing builds no model schemas"""
+        self.assertEqual(self.result["after_import"], [])
+
+    def test_only_used_models_are_built(self):
+        """Test that using a model builds only that model"""
+        self.assertEqual(self.result["after_use"], ["TextMessageContentEvent"])
+
+    def test_import_time(self):
+        """Test that importing stays within the time budget"""
+        self.assertLess(self.result["elapsed"], IMPORT_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.core import AssistantMessage, RunAgentInput, Tool, UserMessage
+from ag_ui.server import RunAgentInputLoader
+
+
+def make_input(count=20):
+    """Creates a RunAgentInput with awkward strings in messages and state"""
+    return RunAgentInput(
+        thread_id="t",
+        run_id="r",
+        state={"nested": [1, 2.5, "]}\\\"", {"messages": []}], "flag": True},
+        messages=[
+            UserMessage(id=f"u{i}", role="user", content=f'say "{i}" \\ ] }} 👋')
+            if i % 2 == 0 else
+            AssistantMessage(id=f"a{i}", role="assistant", content="ok")
+            for i in range(count)
+        ],
+        tools=[Tool(name="search", description="Search", parameters={"type": "object"})],
+        context=[],
+        forwarded_props=None,
+    )
+
+
+def chunked(data, size):
+    """Splits bytes into chunks of the given size"""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestRunAgentInputLoader(unittest.TestCase):
+    """Test suite for RunAgentInputLoader"""
+
+    def test_arbitrary_chunk_boundaries(self):
+        """Test loading a body split at every possible size"""
+        expected = make_input()
+        for body in (
+            expected.model_dump_json(by_alias=True).encode("utf-8"),
+            json.dumps(expected.model_dump(by_alias=True), indent=2).encode("utf-8"),
+        ):
+            for size in (1, 2, 5, 64, len(body)):
+                with self.subTest(size=size):
+                    loaded = RunAgentInputLoader().load(chunked(body, size))
+                    self.assertEqual(loaded.thread_id, "t")
+                    self.assertEqual(loaded.state, expected.state)
+                    self.assertEqual(loaded.tools, expected.tools)
+                    self.assertEqual(list(loaded.messages), expected.messages)
+                    self.assertEqual(loaded.to_model(), expected)
+
+    def test_messages_available_while_loading(self):
+        """Test that messages can be read before the body is complete"""
+        body = make_input(3).model_dump_json(by_alias=True).encode("utf-8")
+        loader = RunAgentInputLoader()
+        split = body.index(b'"a1"') + 20
+        self.assertEqual(loader.feed(body[:split]), 1)
+        self.assertEqual(loader.messages[0].id, "u0")
+        self.assertEqual(loader.feed(body[split:]), 2)
+        self.assertEqual(len(loader.close().messages), 3)
+
+    def test_messages_are_validated_on_access(self):
+        """Test that an invalid message only fails when it is read"""
+        body = (
+            b'{"threadId":"t","runId":"r","state":{},"tools":[],"context":[],"forwardedProps":{},'
+            b'"messages":[{"id":"1","role":"user","content":"hi"},{"id":"2","role":"robot"}]}'
+        )
+        loaded = RunAgentInputLoader().load([body])
+        self.assertEqual(loaded.messages[0].content, "hi")
+        self.assertIs(loaded.messages[0], loaded.messages[-2])
+        with self.assertRaises(ValidationError):
+            _ = loaded.messages[1]
+        self.assertEqual(len(loaded.messages.raw), 2)
+
+    def test_invalid_bodies(self):
+        """Test that malformed bodies are rejected"""
+        valid = make_input(2).model_dump_json(by_alias=True).encode("utf-8")
+        for body in (
+            b"[]",
+            valid[:-1],
+            valid + b"{}",
+            valid.replace(b'"messages":[', b'"messages":{'),
+            valid.replace(b"}]", b"},]", 1),
+        ):
+            with self.subTest(body=body[:40]):
+                with self.assertRaises(ValueError):
+                    RunAgentInputLoader().load([body])
+
+    def test_other_fields_are_validated(self):
+        """Test that unknown and missing fields are reported by close"""
+        for body in (
+            b'{"threadId":"t","runId":"r","state":{},"tools":[],"context":[],"forwardedProps":{}}',
+            b'{"threadId":"t","runId":"r","state":{},"tools":[],"context":[],"forwardedProps":{},'
+            b'"messages":[],"extra":1}',
+        ):
+            with self.assertRaises(ValidationError):
+                RunAgentInputLoader().load([body])
+
+    def test_load_async(self):
+        """Test loading from an async stream"""
+        expected = make_input()
+        body = expected.model_dump_json(by_alias=True).encode("utf-8")
+
+        async def chunks():
+            for chunk in chunked(body, 100):
+                yield chunk
+
+        loaded = asyncio.run(RunAgentInputLoader().load_async(chunks()))
+        self.assertEqual(loaded.to_model(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from ag_ui.encoder.media_type import (
+    negotiate_media_type,
+    parse_accept,
+    preferred_media_types,
+    _preferred_media_types,
+)
+
+SSE = "text/event-stream"
+PROTO = "application/vnd.ag-ui.event+proto"
+
+
+class TestMediaType(unittest.TestCase):
+    """Test suite for Accept header negotiation"""
+
+    def test_parse_accept(self):
+        """Test parsing media ranges, parameters and q-values"""
+        parsed = parse_accept('text/html;level=1;q=0.5, application/json ,invalid, text/*;q=.2')
+        self.assertEqual([(m.type, m.subtype) for m in parsed], [
+            ("text", "html"), ("application", "json"), ("text", "*")
+        ])
+        self.assertEqual(parsed[0].params, {"level": "1"})
+        self.assertEqual([m.q for m in parsed], [0.5, 1.0, 0.2])
+        self.assertEqual([m.i for m in parsed], [0, 1, 3])
+
+    def test_quoted_parameters(self):
+        """Test that separators inside quoted parameters are ignored"""
+        parsed = parse_accept('text/plain;foo="a,b;c";q=0.3, text/html')
+        self.assertEqual(len(parsed), 2)
+        self.assertEqual(parsed[0].params, {"foo": "a,b;c"})
+        self.assertEqual(parsed[0].q, 0.3)
+
+    def test_preferred_without_provided(self):
+        """Test sorting all media types listed in the header"""
+        self.assertEqual(
+            preferred_media_types("text/plain;q=0.5, application/json, text/html;q=0"),
+            ["application/json", "text/plain"]
+        )
+        self.assertEqual(preferred_media_types(), ["*/*"])
+        self.assertEqual(preferred_media_types(""), [])
+
+    def test_preferred_with_provided(self):
+        """Test picking between supported formats"""
+        self.assertEqual(preferred_media_types(None, [SSE, PROTO]), [SSE, PROTO])
+        self.assertEqual(preferred_media_types("*/*", [SSE, PROTO]), [SSE, PROTO])
+        self.assertEqual(preferred_media_types(SSE, [SSE, PROTO]), [SSE])
+        self.assertEqual(preferred_media_types(f"{SSE};q=0.5, {PROTO}", [SSE, PROTO]), [PROTO, SSE])
+        self.assertEqual(preferred_media_types(f"{PROTO}, {SSE}", [SSE, PROTO]), [PROTO, SSE])
+        self.assertEqual(preferred_media_types("text/*", [SSE, PROTO, "text/plain"]), [SSE, "text/plain"])
+        self.assertEqual(preferred_media_types("application/json", [SSE, PROTO]), [])
+
+    def test_specificity_beats_wildcards(self):
+        """Test that the most specific matching range determines the quality"""
+        accept = "text/*;q=0.1, text/event-stream;q=0.9, */*;q=0.5"
+        self.assertEqual(preferred_media_types(accept, [PROTO, SSE, "text/plain"]), [SSE, PROTO, "text/plain"])
+        self.assertEqual(
+            preferred_media_types("text/plain;charset=utf-8, text/plain;q=0.1", ["text/plain;charset=UTF-8", "text/plain"]),
+            ["text/plain;charset=UTF-8", "text/plain"]
+        )
+
+    def test_negotiate_media_type(self):
+        """Test picking the single best media type"""
+        self.assertEqual(negotiate_media_type(f"{PROTO};q=0.9, */*;q=0.1", [SSE, PROTO]), PROTO)
+        self.assertEqual(negotiate_media_type("text/html", [SSE, PROTO]), None)
+
+    def test_results_are_cached(self):
+        """Test that repeated headers are served from the cache"""
+        accept = f"{SSE};q=0.7, {PROTO};q=0.8, unique/type"
+        preferred_media_types(accept, [SSE, PROTO])
+        hits = _preferred_media_types.cache_info().hits
+        result = preferred_media_types(accept, (SSE, PROTO))
+        self.assertEqual(_preferred_media_types.cache_info().hits, hits + 1)
+        # callers get their own list
+        result.append("mutated")
+        self.assertEqual(preferred_media_types(accept, [SSE, PROTO]), [PROTO, SSE])
+
+
+if __name__ == "__main__":
+    unittest.main()
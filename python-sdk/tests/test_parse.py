@@ -0,0 +1,66 @@
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.core import (
+    AssistantMessage,
+    EventType,
+    RunStartedEvent,
+    TextMessageContentEvent,
+    ToolMessage,
+    UserMessage,
+    parse_event,
+    parse_events,
+    parse_message,
+    parse_messages,
+)
+
+
+class TestParse(unittest.TestCase):
+    """Test suite for the parsing helpers"""
+
+    def test_parse_event(self):
+        """Test parsing an event from str, bytes and dict"""
+        expected = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_1",
+            delta="Hello"
+        )
+        data = '{"type":"TEXT_MESSAGE_CONTENT","messageId":"msg_1","delta":"Hello"}'
+        self.assertEqual(parse_event(data), expected)
+        self.assertEqual(parse_event(data.encode()), expected)
+        self.assertEqual(parse_event(bytearray(data.encode())), expected)
+        self.assertEqual(parse_event({"type": "TEXT_MESSAGE_CONTENT", "message_id": "msg_1", "delta": "Hello"}), expected)
+        self.assertIsInstance(parse_event(expected.model_dump_json()), TextMessageContentEvent)
+
+    def test_parse_events(self):
+        """Test parsing a JSON array of events"""
+        events = parse_events(
+            '[{"type":"RUN_STARTED","threadId":"t","runId":"r"},'
+            '{"type":"TEXT_MESSAGE_CONTENT","messageId":"m","delta":"x"}]'
+        )
+        self.assertEqual([type(event) for event in events], [RunStartedEvent, TextMessageContentEvent])
+
+    def test_parse_event_errors(self):
+        """Test that invalid events raise validation errors"""
+        with self.assertRaises(ValidationError):
+            parse_event('{"type":"UNKNOWN"}')
+        with self.assertRaises(ValidationError):
+            parse_event('{"type":"TEXT_MESSAGE_CONTENT","messageId":"m","delta":""}')
+        with self.assertRaises(ValidationError):
+            parse_event(b"not json")
+
+    def test_parse_messages(self):
+        """Test parsing messages by role"""
+        self.assertIsInstance(parse_message('{"id":"1","role":"user","content":"hi"}'), UserMessage)
+        messages = parse_messages([
+            {"id": "1", "role": "assistant", "content": "hi"},
+            {"id": "2", "role": "tool", "content": "42", "toolCallId": "c"},
+        ])
+        self.assertEqual([type(message) for message in messages], [AssistantMessage, ToolMessage])
+        with self.assertRaises(ValidationError):
+            parse_message('{"id":"1","role":"robot"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import copy
+import unittest
+
+from ag_ui.state import JsonPatchError, UndoLog, apply_operation, apply_patch, parse_pointer
+
+
+class TestApplyPatch(unittest.TestCase):
+    """Test suite for the JSON Patch engine"""
+
+    def test_rfc6902_examples(self):
+        """Test the operations with examples from RFC 6902 appendix A"""
+        cases = [
+            ({"foo": "bar"}, [{"op": "add", "path": "/baz", "value": "qux"}], {"baz": "qux", "foo": "bar"}),
+            ({"foo": ["bar", "baz"]}, [{"op": "add", "path": "/foo/1", "value": "qux"}],
+             {"foo": ["bar", "qux", "baz"]}),
+            ({"baz": "qux", "foo": "bar"}, [{"op": "remove", "path": "/baz"}], {"foo": "bar"}),
+            ({"foo": ["bar", "qux", "baz"]}, [{"op": "remove", "path": "/foo/1"}], {"foo": ["bar", "baz"]}),
+            ({"baz": "qux", "foo": "bar"}, [{"op": "replace", "path": "/baz", "value": "boo"}],
+             {"baz": "boo", "foo": "bar"}),
+            ({"foo": {"bar": "baz", "waldo": "fred"}, "qux": {"corge": "grault"}},
+             [{"op": "move", "from": "/foo/waldo", "path": "/qux/thud"}],
+             {"foo": {"bar": "baz"}, "qux": {"corge": "grault", "thud": "fred"}}),
+            ({"foo": ["all", "grass", "cows", "eat"]}, [{"op": "move", "from": "/foo/1", "path": "/foo/3"}],
+             {"foo": ["all", "cows", "eat", "grass"]}),
+            ({"foo": ["bar"]}, [{"op": "add", "path": "/foo/-", "value": ["abc", "def"]}],
+             {"foo": ["bar", ["abc", "def"]]}),
+            ({"/": 9, "~1": 10}, [{"op": "test", "path": "/~01", "value": 10}], {"/": 9, "~1": 10}),
+            ({"a": [1]}, [{"op": "copy", "from": "/a", "path": "/b"}], {"a": [1], "b": [1]}),
+            ({"a": 1}, [{"op": "replace", "path": "", "value": [1]}], [1]),
+        ]
+        for document, patch, expected in cases:
+            with self.subTest(patch=patch):
+                self.assertEqual(apply_patch(document, patch), expected)
+
+    def test_in_place(self):
+        """Test that the document is changed in place"""
+        inner = {"items": []}
+        document = {"inner": inner}
+        result = apply_patch(document, [{"op": "add", "path": "/inner/items/0", "value": 1}])
+        self.assertIs(result, document)
+        self.assertEqual(inner, {"items": [1]})
+
+    def test_copy_does_not_share(self):
+        """Test that copied values are independent"""
+        document = apply_patch({"a": {"b": 1}}, [{"op": "copy", "from": "/a", "path": "/c"}])
+        document["c"]["b"] = 2
+        self.assertEqual(document["a"], {"b": 1})
+
+    def test_patch_is_not_changed(self):
+        """Test that later operations do not change the values of the patch"""
+        patch = [
+            {"op": "add", "path": "/x", "value": {}},
+            {"op": "add", "path": "/x/y", "value": 1},
+            {"op": "replace", "path": "/list", "value": []},
+            {"op": "add", "path": "/list/-", "value": {"z": 1}},
+            {"op": "replace", "path": "/list/0/z", "value": 2},
+        ]
+        original = copy.deepcopy(patch)
+        document = apply_patch({"list": None}, patch)
+        self.assertEqual(document, {"x": {"y": 1}, "list": [{"z": 2}]})
+        self.assertEqual(patch, original)
+
+    def test_failed_patch_is_rolled_back(self):
+        """Test that a failing operation reverts the earlier ones"""
+        document = {"list": [1, 2, 3], "obj": {"a": 1}, "keep": True}
+        original = copy.deepcopy(document)
+        patch = [
+            {"op": "add", "path": "/list/1", "value": 9},
+            {"op": "remove", "path": "/obj/a"},
+            {"op": "replace", "path": "/keep", "value": False},
+            {"op": "move", "from": "/list/0", "path": "/moved"},
+            {"op": "add", "path": "/obj/a", "value": 5},
+            {"op": "test", "path": "/keep", "value": True},
+        ]
+        with self.assertRaises(JsonPatchError):
+            apply_patch(document, patch)
+        self.assertEqual(document, original)
+
+    def test_undo_log(self):
+        """Test reverting a successful patch later"""
+        document = {"a": [1, 2], "b": {"c": 1}}
+        original = copy.deepcopy(document)
+        log = UndoLog()
+        document = apply_patch(document, [
+            {"op": "remove", "path": "/a/0"},
+            {"op": "add", "path": "/b/c", "value": 2},
+            {"op": "copy", "from": "/b", "path": "/d"},
+        ], log)
+        self.assertEqual(document, {"a": [2], "b": {"c": 2}, "d": {"c": 2}})
+        self.assertEqual(log.undo(document), original)
+        self.assertEqual(len(log), 0)
+        log = UndoLog()
+        replaced = apply_patch(document, [{"op": "add", "path": "", "value": 1}], log)
+        self.assertEqual(replaced, 1)
+        self.assertIs(log.undo(replaced), document)
+
+    def test_apply_operation(self):
+        """Test applying single operations"""
+        document = {"a": 1}
+        log = UndoLog()
+        self.assertIs(apply_operation(document, {"op": "add", "path": "/b", "value": 2}, log), document)
+        self.assertEqual(apply_operation(document, {"op": "remove", "path": "/a"}), {"b": 2})
+        self.assertEqual(apply_operation(document, {"op": "replace", "path": "", "value": []}), [])
+        with self.assertRaises(JsonPatchError):
+            apply_operation(document, {"op": "remove", "path": "/a"})
+        self.assertEqual(len(log), 1)
+
+    def test_errors(self):
+        """Test that invalid operations raise JsonPatchError"""
+        for patch in (
+            [{"op": "add", "path": "/a/b", "value": 1}],
+            [{"op": "add", "path": "/list/3", "value": 1}],
+            [{"op": "add", "path": "/list/01", "value": 1}],
+            [{"op": "add", "path": "/list/\u00b2", "value": 1}],
+            [{"op": "remove", "path": "/list/\u0661"}],
+            [{"op": "remove", "path": "/missing"}],
+            [{"op": "replace", "path": "/list/-", "value": 1}],
+            [{"op": "move", "from": "/obj", "path": "/obj/x"}],
+            [{"op": "test", "path": "/flag", "value": 1}],
+            [{"op": "add", "path": "missing-slash", "value": 1}],
+            [{"op": "add", "path": "/x"}],
+            [{"op": "nope", "path": "/x"}],
+            [{"op": "add", "path": ["x"], "value": 1}],
+            ["add"],
+        ):
+            with self.subTest(patch=patch):
+                with self.assertRaises(JsonPatchError):
+                    apply_patch({"list": [1, 2], "obj": {}, "flag": True}, patch)
+
+    def test_pointer_cache(self):
+        """Test that pointers are parsed once"""
+        self.assertEqual(parse_pointer("/a~1b/~0c/0"), ("a/b", "~c", "0"))
+        self.assertIs(parse_pointer("/a~1b/~0c/0"), parse_pointer("/a~1b/~0c/0"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+
+from ag_ui.core.types import AssistantMessage, UserMessage, ToolMessage, ToolCall, FunctionCall
+from ag_ui.core.events import (
+    EventType,
+    BaseEvent,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+)
+from ag_ui.proto import encode, decode
+
+
+class TestProto(unittest.TestCase):
+    """Test suite for the protocol buffer encoding"""
+
+    def assert_round_trip(self, event: BaseEvent):
+        """Encodes and decodes an event and compares the result with the original"""
+        encoded = encode(event)
+        self.assertIsInstance(encoded, bytes)
+        decoded = decode(encoded)
+        self.assertIs(type(decoded), type(event))
+        self.assertEqual(
+            decoded.model_dump(exclude_none=True),
+            event.model_dump(exclude_none=True)
+        )
+
+    def test_wire_format(self):
+        """Test that the encoded bytes match the schema in events.proto"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="m",
+            delta="hi"
+        )
+        # Event.text_message_content (2) { base_event (1) { type: 1 }, message_id (2), delta (3) }
+        expected = bytes([
+            0x12, 0x0b,
+            0x0a, 0x02, 0x08, 0x01,
+            0x12, 0x01, ord("m"),
+            0x1a, 0x02, ord("h"), ord("i"),
+        ])
+        self.assertEqual(encode(event), expected)
+
+    def test_text_message_events(self):
+        """Test round-tripping text message events"""
+        self.assert_round_trip(TextMessageStartEvent(
+            type=EventType.TEXT_MESSAGE_START,
+            message_id="msg-1",
+            role="assistant",
+            timestamp=1698765432123
+        ))
+        self.assert_round_trip(TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg-1",
+            delta="Hällo, wörld! 👋"
+        ))
+        self.assert_round_trip(TextMessageEndEvent(
+            type=EventType.TEXT_MESSAGE_END,
+            message_id="msg-1"
+        ))
+        self.assert_round_trip(TextMessageChunkEvent(
+            type=EventType.TEXT_MESSAGE_CHUNK,
+            message_id="msg-1",
+            delta=""
+        ))
+
+    def test_tool_call_events(self):
+        """Test round-tripping tool call events"""
+        self.assert_round_trip(ToolCallStartEvent(
+            type=EventType.TOOL_CALL_START,
+            tool_call_id="call-1",
+            tool_call_name="search",
+            parent_message_id="msg-1"
+        ))
+        self.assert_round_trip(ToolCallArgsEvent(
+            type=EventType.TOOL_CALL_ARGS,
+            tool_call_id="call-1",
+            delta='{"query": "weather"}'
+        ))
+        self.assert_round_trip(ToolCallEndEvent(
+            type=EventType.TOOL_CALL_END,
+            tool_call_id="call-1"
+        ))
+        self.assert_round_trip(ToolCallChunkEvent(
+            type=EventType.TOOL_CALL_CHUNK,
+            tool_call_name="search"
+        ))
+
+    def test_state_events(self):
+        """Test round-tripping state events with nested values"""
+        self.assert_round_trip(StateSnapshotEvent(
+            type=EventType.STATE_SNAPSHOT,
+            snapshot={
+                "nested": {"array": [1, 2.5, None, "x"], "object": {"key": "value"}},
+                "boolean": True,
+                "number": 42,
+                "negative": -7,
+            }
+        ))
+        self.assert_round_trip(StateDeltaEvent(
+            type=EventType.STATE_DELTA,
+            delta=[
+                {"op": "add", "path": "/foo", "value": "bar"},
+                {"op": "remove", "path": "/baz"},
+                {"op": "move", "path": "/a", "from": "/b"},
+                {"op": "replace", "path": "/c", "value": None},
+            ]
+        ))
+
+    def test_messages_snapshot(self):
+        """Test round-tripping a messages snapshot"""
+        self.assert_round_trip(MessagesSnapshotEvent(
+            type=EventType.MESSAGES_SNAPSHOT,
+            messages=[
+                UserMessage(id="1", role="user", content="Hello"),
+                AssistantMessage(
+                    id="2",
+                    role="assistant",
+                    tool_calls=[ToolCall(
+                        id="call-1",
+                        type="function",
+                        function=FunctionCall(name="search", arguments='{"q": 1}')
+                    )]
+                ),
+                ToolMessage(id="3", role="tool", content="result", tool_call_id="call-1"),
+            ]
+        ))
+
+    def test_special_and_lifecycle_events(self):
+        """Test round-tripping raw, custom and lifecycle events"""
+        self.assert_round_trip(RawEvent(
+            type=EventType.RAW,
+            event={"provider": "openai", "tokens": [1, 2]},
+            source="openai",
+            raw_event={"original": True}
+        ))
+        self.assert_round_trip(CustomEvent(type=EventType.CUSTOM, name="ping", value=None))
+        self.assert_round_trip(RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"))
+        self.assert_round_trip(RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r"))
+        self.assert_round_trip(RunErrorEvent(type=EventType.RUN_ERROR, message="boom", code="E1"))
+        self.assert_round_trip(StepStartedEvent(type=EventType.STEP_STARTED, step_name="plan"))
+        self.assert_round_trip(StepFinishedEvent(type=EventType.STEP_FINISHED, step_name="plan"))
+
+    def test_negative_timestamp(self):
+        """Test that int64 timestamps keep their sign"""
+        self.assert_round_trip(StepStartedEvent(
+            type=EventType.STEP_STARTED,
+            step_name="plan",
+            timestamp=-1
+        ))
+
+    def test_decode_invalid_data(self):
+        """Test that decoding garbage raises a ValueError"""
+        with self.assertRaises(ValueError):
+            decode(b"")
+        with self.assertRaises(ValueError):
+            decode(b"\x12\x05\x0a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    StateSnapshotEvent,
+    TextMessageContentEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.decoder import ProtoDecoder
+from ag_ui.encoder import EventEncoder, AGUI_MEDIA_TYPE
+
+
+def make_events():
+    """Creates a few events of different types and sizes"""
+    return [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="Héllo 👋"),
+        ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="c", tool_call_name="search"),
+        StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"text": "x" * 5000}),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="!"),
+    ]
+
+
+def encode(events):
+    """Encodes events as a length prefixed protobuf stream"""
+    return EventEncoder(accept=AGUI_MEDIA_TYPE).encode_many(events)
+
+
+class TestProtoDecoder(unittest.TestCase):
+    """Test suite for ProtoDecoder"""
+
+    def test_round_trip(self):
+        """Test decoding a complete stream in one chunk"""
+        events = make_events()
+        self.assertEqual(list(ProtoDecoder().decode([encode(events)])), events)
+
+    def test_arbitrary_chunk_boundaries(self):
+        """Test that frames split across chunks are reassembled"""
+        events = make_events()[:3]
+        stream = encode(events)
+        for split in range(1, len(stream)):
+            decoder = ProtoDecoder()
+            decoded = decoder.feed(stream[:split]) + decoder.feed(stream[split:]) + decoder.close()
+            self.assertEqual(decoded, events, f"split at {split}")
+
+    def test_small_chunks_and_large_frames(self):
+        """Test feeding a stream with large frames in small chunks"""
+        events = make_events()
+        stream = encode(events)
+        for size in (1, 3, 4, 5, 1000, 4096):
+            decoder = ProtoDecoder()
+            chunks = (memoryview(stream)[i:i + size] for i in range(0, len(stream), size))
+            self.assertEqual(list(decoder.decode(chunks)), events)
+
+    def test_buffer_is_reused(self):
+        """Test that the frame buffer is not reallocated for every split frame"""
+        event = make_events()[1]
+        frame = encode([event])
+        decoder = ProtoDecoder()
+        buffer = decoder._buffer
+        for _ in range(10):
+            self.assertEqual(decoder.feed(frame[:7]), [])
+            self.assertEqual(decoder.feed(frame[7:]), [event])
+        self.assertIs(decoder._buffer, buffer)
+
+    def test_incomplete_stream(self):
+        """Test that a stream ending inside a frame is an error"""
+        decoder = ProtoDecoder()
+        decoder.feed(encode(make_events()[:1])[:-1])
+        with self.assertRaises(ValueError):
+            decoder.close()
+
+    def test_invalid_frames(self):
+        """Test that oversized and malformed frames raise ValueError"""
+        with self.assertRaises(ValueError):
+            ProtoDecoder(max_frame_size=10).feed(encode(make_events()[:1]))
+        with self.assertRaises(ValueError):
+            ProtoDecoder().feed(b"\x00\x00\x00\x02\x12\x05")
+
+    def test_async(self):
+        """Test decoding an async stream of chunks"""
+        events = make_events()
+        stream = encode(events)
+
+        async def chunks():
+            for i in range(0, len(stream), 100):
+                yield stream[i:i + 100]
+
+        async def decode():
+            return [event async for event in ProtoDecoder().decode_async(chunks())]
+
+        self.assertEqual(asyncio.run(decode()), events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import gzip
+import unittest
+
+from ag_ui.core.events import EventType, TextMessageContentEvent
+from ag_ui.encoder import EventEncoder, ReplayBuffer, ReplayGapError
+
+
+def make_event(delta):
+    """Creates a TextMessageContentEvent"""
+    return TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="msg_1", delta=delta)
+
+
+class TestEventIds(unittest.TestCase):
+    """Test suite for SSE event ids in the EventEncoder"""
+
+    def test_event_ids(self):
+        """Test that event ids increase across all encode methods"""
+        encoder = EventEncoder(event_ids=True)
+        plain = EventEncoder()
+        self.assertEqual(encoder.encode(make_event("a")), "id: 1\n" + plain.encode(make_event("a")))
+        self.assertEqual(encoder.encode_bytes(make_event("b")), b"id: 2\n" + plain.encode_bytes(make_event("b")))
+        self.assertEqual(
+            encoder.encode_many([make_event("c"), make_event("d")]),
+            b"id: 3\n" + plain.encode_bytes(make_event("c")) + b"id: 4\n" + plain.encode_bytes(make_event("d"))
+        )
+        self.assertEqual(encoder.last_event_id, 4)
+
+    def test_no_event_ids_by_default(self):
+        """Test that events have no ids unless requested"""
+        encoder = EventEncoder()
+        self.assertIsNone(encoder.last_event_id)
+        self.assertTrue(encoder.encode(make_event("a")).startswith("data: "))
+
+
+class TestReplayBuffer(unittest.TestCase):
+    """Test suite for ReplayBuffer"""
+
+    def test_frames_after(self):
+        """Test replaying the frames after a given event id"""
+        buffer = ReplayBuffer()
+        frames = [buffer.append(make_event(str(i))) for i in range(5)]
+        self.assertEqual(buffer.last_event_id, 5)
+        self.assertEqual(buffer.frames_after(), frames)
+        self.assertEqual(buffer.frames_after("3"), frames[3:])
+        self.assertEqual(buffer.frames_after(5), [])
+        with self.assertRaises(ValueError):
+            buffer.frames_after(6)
+        with self.assertRaises(ValueError):
+            buffer.frames_after("abc")
+
+    def test_bounded(self):
+        """Test that old frames are dropped and cannot be resumed from"""
+        buffer = ReplayBuffer(max_events=3)
+        frames = [buffer.append(make_event(str(i))) for i in range(5)]
+        self.assertEqual(buffer.first_event_id, 3)
+        self.assertEqual(buffer.frames_after(2), frames[2:])
+        with self.assertRaises(ReplayGapError):
+            buffer.frames_after(1)
+
+    def test_frames_are_not_reencoded(self):
+        """Test that replayed frames are the stored bytes"""
+        buffer = ReplayBuffer()
+        frame = buffer.append(make_event("a"))
+        self.assertIs(buffer.frames_after()[0], frame)
+
+    def test_subscribe_replays_then_follows(self):
+        """Test that a reconnecting client gets missed events and then live ones"""
+        buffer = ReplayBuffer()
+
+        async def producer():
+            for i in range(3):
+                yield make_event(str(i))
+            await asyncio.sleep(0.01)
+            for i in range(3, 6):
+                yield make_event(str(i))
+                await asyncio.sleep(0)
+
+        async def run():
+            feed = asyncio.ensure_future(buffer.feed(producer()))
+            await asyncio.sleep(0.005)
+            # the client has seen events 1 and 2 before reconnecting
+            received = [frame async for frame in buffer.subscribe(last_event_id="2")]
+            await feed
+            return received
+
+        received = asyncio.run(run())
+        self.assertTrue(buffer.closed)
+        self.assertEqual(received, buffer.frames_after(2))
+        self.assertEqual([frame.split(b"\n")[0] for frame in received], [b"id: 3", b"id: 4", b"id: 5", b"id: 6"])
+
+    def test_compressed_replay(self):
+        """Test sending stored frames through a compressing encoder"""
+        buffer = ReplayBuffer()
+        for i in range(3):
+            buffer.append(make_event(str(i)))
+        buffer.close()
+
+        async def run():
+            encoder = EventEncoder(accept_encoding="gzip")
+            body = b""
+            async for frame in buffer.subscribe():
+                body += encoder.encode_raw(frame)
+            return body + encoder.finish()
+
+        self.assertEqual(gzip.decompress(asyncio.run(run())), b"".join(buffer.frames_after()))
+
+    def test_closed_buffer(self):
+        """Test that appending after the run ended fails"""
+        buffer = ReplayBuffer()
+        buffer.close()
+        with self.assertRaises(RuntimeError):
+            buffer.append(make_event("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+from typing import get_args
+
+from ag_ui.core.types import UserMessage
+from ag_ui.core.events import (
+    EventType,
+    TextMessageStartEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageChunkEvent,
+    ToolCallStartEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallChunkEvent,
+    StateSnapshotEvent,
+    StateDeltaEvent,
+    MessagesSnapshotEvent,
+    RawEvent,
+    CustomEvent,
+    RunStartedEvent,
+    RunFinishedEvent,
+    RunErrorEvent,
+    StepStartedEvent,
+    StepFinishedEvent,
+    Event,
+)
+from ag_ui.encoder.serializers import serialize_json, serialize_json_generic, serialize_sse
+from ag_ui.proto import proto
+
+# Strings that exercise JSON escaping: quotes, backslashes, control characters,
+# characters JSON may or may not escape, and multi-byte UTF-8.
+TRICKY_STRINGS = [
+    "Hello, world!",
+    " ",
+    'say "hi"',
+    "back\\slash / slash",
+    "line\nbreak\r\ttab\b\f",
+    "\x00\x01\x1f\x7f",
+    "  ",
+    "héllo wörld",
+    "👋🏽 emoji",
+    "%s %d %%",
+    "{\"json\": [1, 2]}",
+]
+
+# Keyword arguments for at least one instance of every event class
+SAMPLES = {
+    TextMessageStartEvent: [dict(message_id="msg_1", role="assistant")],
+    TextMessageContentEvent: [dict(message_id="msg_1", delta=s) for s in TRICKY_STRINGS],
+    TextMessageEndEvent: [dict(message_id=s) for s in TRICKY_STRINGS],
+    TextMessageChunkEvent: [dict(message_id="msg_1", delta="chunk"), dict()],
+    ToolCallStartEvent: [
+        dict(tool_call_id="call_1", tool_call_name="search"),
+        dict(tool_call_id="call_1", tool_call_name="search", parent_message_id="msg_1"),
+    ],
+    ToolCallArgsEvent: [dict(tool_call_id="call_1", delta=s) for s in TRICKY_STRINGS]
+    + [dict(tool_call_id="call_1", delta="")],
+    ToolCallEndEvent: [dict(tool_call_id="call_1")],
+    ToolCallChunkEvent: [dict(tool_call_id="call_1", delta='{"a"')],
+    StateSnapshotEvent: [dict(snapshot={"a": [1, 2.5, None], "b": "x"})],
+    StateDeltaEvent: [dict(delta=[{"op": "replace", "path": "/a", "value": 1}])],
+    MessagesSnapshotEvent: [dict(messages=[UserMessage(id="1", role="user", content="hi")])],
+    RawEvent: [dict(event={"x": 1}, source="openai")],
+    CustomEvent: [dict(name="ping", value={"x": 1})],
+    RunStartedEvent: [dict(thread_id="t", run_id="r")],
+    RunFinishedEvent: [dict(thread_id="t", run_id="r")],
+    RunErrorEvent: [dict(message="boom"), dict(message="boom", code="E1")],
+    StepStartedEvent: [dict(step_name="plan")],
+    StepFinishedEvent: [dict(step_name="plan")],
+}
+
+
+def make_events():
+    """Creates every sample, with and without timestamp and raw_event"""
+    for cls, samples in SAMPLES.items():
+        event_type = cls.model_fields["type"].annotation.__args__[0]
+        for kwargs in samples:
+            yield cls(type=event_type, **kwargs)
+            yield cls(type=event_type, timestamp=1648214400000, **kwargs)
+            yield cls(type=event_type, timestamp=-5, raw_event={"raw": True}, **kwargs)
+
+
+class TestSerializers(unittest.TestCase):
+    """Conformance tests for the fast serializers"""
+
+    def test_samples_cover_all_events(self):
+        """Test that there is a sample for every event class"""
+        self.assertEqual(set(SAMPLES), set(get_args(get_args(Event)[0])))
+
+    def test_json_matches_generic(self):
+        """Test that fast JSON serialization is byte-identical to pydantic"""
+        for event in make_events():
+            with self.subTest(event=event):
+                self.assertEqual(serialize_json(event), serialize_json_generic(event))
+
+    def test_sse_matches_generic(self):
+        """Test that fast SSE frames are byte-identical to the generic frames"""
+        for event in make_events():
+            with self.subTest(event=event):
+                expected = f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+                self.assertEqual(serialize_sse(event), expected.encode("utf-8"))
+
+    def test_protobuf_matches_generic(self):
+        """Test that fast protobuf encoding is byte-identical to the generic path"""
+        for event in make_events():
+            with self.subTest(event=event):
+                self.assertEqual(proto.encode(event), proto._encode_generic(event))
+
+    def test_unexpected_values_fall_back(self):
+        """Test that events that do not fit a template use the generic path"""
+        class Identifier(str):
+            pass
+
+        event = TextMessageContentEvent.model_construct(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id=Identifier("msg_1"),
+            delta="hi",
+            timestamp=None,
+            raw_event=None
+        )
+        self.assertEqual(serialize_json(event), serialize_json_generic(event))
+        self.assertEqual(proto.encode(event), proto._encode_generic(event))
+
+    def test_surrogates_raise(self):
+        """Test that lone surrogates fail like they do in pydantic"""
+        event = TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT,
+            message_id="msg_1",
+            delta="\ud800"
+        )
+        with self.assertRaises(Exception):
+            serialize_json_generic(event)
+        with self.assertRaises(Exception):
+            serialize_json(event)
+
+
+if __name__ == "__main__":
+    unittest.main()
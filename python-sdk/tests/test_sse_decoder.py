@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+
+from pydantic import ValidationError
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    StateSnapshotEvent,
+    TextMessageContentEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.decoder import SSEDecoder
+from ag_ui.encoder import EventEncoder
+
+
+def make_events():
+    """Creates a few events of different types"""
+    return [
+        RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r"),
+        TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id="m", delta="Héllo\nwörld 👋"),
+        ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id="c", tool_call_name="search"),
+        StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"a": [1, 2]}),
+    ]
+
+
+class TestSSEDecoder(unittest.TestCase):
+    """Test suite for SSEDecoder"""
+
+    def test_round_trip(self):
+        """Test decoding the output of the EventEncoder"""
+        events = make_events()
+        stream = EventEncoder().encode_many(events)
+        self.assertEqual(list(SSEDecoder().decode([stream])), events)
+
+    def test_arbitrary_chunk_boundaries(self):
+        """Test that the stream can be split at any byte"""
+        events = make_events()
+        stream = EventEncoder(event_ids=True).encode_many(events)
+        for split in range(1, len(stream)):
+            decoder = SSEDecoder()
+            decoded = decoder.feed(stream[:split]) + decoder.feed(stream[split:]) + decoder.close()
+            self.assertEqual(decoded, events, f"split at {split}")
+        # one byte at a time
+        decoder = SSEDecoder()
+        self.assertEqual(list(decoder.decode(stream[i:i + 1] for i in range(len(stream)))), events)
+        self.assertEqual(decoder.last_event_id, "4")
+
+    def test_line_endings(self):
+        """Test LF, CRLF and CR line endings, also split between chunks"""
+        payload = b'data: {"type":"RUN_STARTED","threadId":"t","runId":"r"}'
+        event = RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")
+        for newline in (b"\n", b"\r\n", b"\r"):
+            stream = payload + newline + newline
+            for split in range(1, len(stream)):
+                decoder = SSEDecoder()
+                decoded = decoder.feed(stream[:split]) + decoder.feed(stream[split:])
+                self.assertEqual(decoded, [event])
+
+    def test_multi_line_data_and_comments(self):
+        """Test joining data fields and ignoring comments and other fields"""
+        stream = (
+            b": ping\n\n"
+            b"event: message\n"
+            b"retry: 1000\n"
+            b'data: {"type":"RUN_STARTED",\n'
+            b'data:"threadId":"t",\n'
+            b': comment in the middle\n'
+            b'data: "runId":"r"}\n'
+            b"\n"
+        )
+        self.assertEqual(
+            list(SSEDecoder().decode([stream])),
+            [RunStartedEvent(type=EventType.RUN_STARTED, thread_id="t", run_id="r")]
+        )
+
+    def test_byte_order_mark(self):
+        """Test that a leading UTF-8 BOM is skipped"""
+        stream = b"\xef\xbb\xbf" + EventEncoder().encode_bytes(make_events()[0])
+        decoder = SSEDecoder()
+        decoded = []
+        for i in range(len(stream)):
+            decoded += decoder.feed(stream[i:i + 1])
+        self.assertEqual(decoded, make_events()[:1])
+
+    def test_unterminated_event_at_close(self):
+        """Test that a final event without an empty line is dispatched on close"""
+        decoder = SSEDecoder()
+        self.assertEqual(decoder.feed(b'data: {"type":"RUN_STARTED","threadId":"t","runId":"r"}'), [])
+        self.assertEqual(len(decoder.close()), 1)
+
+    def test_invalid_event(self):
+        """Test that invalid events raise a validation error"""
+        with self.assertRaises(ValidationError):
+            SSEDecoder().feed(b'data: {"type":"NOT_AN_EVENT"}\n\n')
+
+    def test_async(self):
+        """Test decoding an async stream of chunks"""
+        events = make_events()
+        stream = EventEncoder().encode_many(events)
+
+        async def chunks():
+            for i in range(0, len(stream), 7):
+                yield stream[i:i + 7]
+
+        async def decode():
+            return [event async for event in SSEDecoder().decode_async(chunks())]
+
+        self.assertEqual(asyncio.run(decode()), events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import copy
+import random
+import unittest
+
+from ag_ui.core import AssistantMessage, EventType, StateDeltaEvent, StateSnapshotEvent, UserMessage
+from ag_ui.state import JsonPatchError, PersistentList, StateStore, apply_patch
+
+
+def make_state():
+    """Creates a state with several independent branches"""
+    return {
+        "documents": [{"title": f"doc {i}", "tags": ["a"]} for i in range(3)],
+        "settings": {"theme": "dark", "limits": {"tokens": 10}},
+        "log": [],
+    }
+
+
+def pointers(value, path=""):
+    """Returns the pointers of all values below the root"""
+    children = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    for key, child in children:
+        pointer = f"{path}/{key}"
+        yield pointer
+        yield from pointers(child, pointer)
+
+
+def random_operation(rng, state):
+    """Creates a move, copy, add or remove between random paths of `state`"""
+    paths = list(pointers(state))
+    if not paths:
+        return {"op": "add", "path": "/a", "value": [0]}
+    source = rng.choice(paths)
+    target = rng.choice(paths + [path + "/-" for path in paths])
+    op = rng.choice(["move", "move", "copy", "add", "remove"])
+    if op in ("move", "copy"):
+        return {"op": op, "from": source, "path": target}
+    if op == "add":
+        return {"op": "add", "path": target, "value": [0]}
+    return {"op": "remove", "path": source}
+
+
+class TestPersistentList(unittest.TestCase):
+    """Test suite for PersistentList"""
+
+    def test_append_and_set_keep_old_versions(self):
+        """Test that old lists are unchanged"""
+        versions = [PersistentList()]
+        for i in range(100):
+            versions.append(versions[-1].append(i))
+        for length, version in enumerate(versions):
+            self.assertEqual(list(version), list(range(length)))
+        changed = versions[-1].set(40, "x")
+        self.assertEqual(changed[40], "x")
+        self.assertEqual(versions[-1][40], 40)
+        self.assertEqual(changed[-1], 99)
+        self.assertEqual(changed[38:41], [38, 39, "x"])
+        with self.assertRaises(IndexError):
+            _ = changed[100]
+
+    def test_structural_sharing(self):
+        """Test that untouched nodes are shared"""
+        old = PersistentList(range(100))
+        # pylint: disable=protected-access
+        new = old.set(99, -1)
+        self.assertIs(old._root, new._root)
+        new = old.set(0, -1)
+        self.assertIs(old._root[1], new._root[1])
+        self.assertIs(old._tail, new._tail)
+        appended = old.append(100)
+        self.assertIs(old._root, appended._root)
+
+    def test_large_lists(self):
+        """Test that deep tries match plain lists"""
+        items = list(range(40000))
+        built = PersistentList(items)
+        appended = PersistentList()
+        for item in items:
+            appended = appended.append(item)
+        self.assertEqual(list(built), items)
+        self.assertEqual(built, appended)
+        # pylint: disable=protected-access
+        self.assertEqual(built._shift, appended._shift)
+        for index in (0, 31, 32, 1023, 1024, 32767, 32768, 39999):
+            self.assertEqual(built[index], index)
+            self.assertEqual(appended[index], index)
+            changed = appended.set(index, -1)
+            self.assertEqual(changed[index], -1)
+            self.assertEqual(appended[index], index)
+            self.assertEqual(sum(changed), sum(items) - index - 1)
+
+
+class TestStateStore(unittest.TestCase):
+    """Test suite for StateStore"""
+
+    def test_delta_copies_only_touched_path(self):
+        """Test that a delta shares untouched containers with the old version"""
+        store = StateStore(make_state())
+        old = store.current
+        snapshot = copy.deepcopy(old.state)
+        new = store.apply_delta([
+            {"op": "replace", "path": "/documents/1/title", "value": "renamed"},
+            {"op": "add", "path": "/documents/1/tags/-", "value": "b"},
+            {"op": "add", "path": "/log/-", "value": "renamed doc 1"},
+        ])
+        self.assertEqual(old.state, snapshot)
+        self.assertEqual(new.state["documents"][1], {"title": "renamed", "tags": ["a", "b"]})
+        self.assertIs(new.state["settings"], old.state["settings"])
+        self.assertIs(new.state["documents"][0], old.state["documents"][0])
+        self.assertIsNot(new.state["documents"][1], old.state["documents"][1])
+        self.assertEqual(new.version, old.version + 1)
+
+    def test_move_and_copy(self):
+        """Test operations that read from a second path"""
+        store = StateStore(make_state())
+        old = store.current
+        snapshot = copy.deepcopy(old.state)
+        new = store.apply_delta([
+            {"op": "move", "from": "/settings/limits", "path": "/limits"},
+            {"op": "copy", "from": "/documents/0", "path": "/first"},
+        ])
+        self.assertEqual(old.state, snapshot)
+        self.assertEqual(new.state["limits"], {"tokens": 10})
+        self.assertNotIn("limits", new.state["settings"])
+        self.assertEqual(new.state["first"], snapshot["documents"][0])
+
+    def test_moves_within_arrays(self):
+        """Test that moves that shift array items keep old versions unchanged"""
+        cases = [
+            ({"a": [[1], [2], [3]]}, {"op": "move", "from": "/a/0", "path": "/a/1/0"}, {"a": [[2], [[1], 3]]}),
+            ({"a": [[1], [2], [3]]}, {"op": "move", "from": "/a/2", "path": "/a/0"}, {"a": [[3], [1], [2]]}),
+            (
+                {"a": [[1], {"x": []}], "b": [{"y": []}]},
+                {"op": "move", "from": "/a/0", "path": "/b/0/y/-"},
+                {"a": [{"x": []}], "b": [{"y": [[1]]}]},
+            ),
+        ]
+        for state, operation, expected in cases:
+            with self.subTest(operation=operation):
+                store = StateStore(state)
+                old = store.current
+                snapshot = copy.deepcopy(state)
+                new = store.apply_delta([operation])
+                self.assertEqual(new.state, expected)
+                self.assertEqual(new.state, apply_patch(copy.deepcopy(snapshot), [operation]))
+                self.assertEqual(old.state, snapshot)
+
+    def test_random_deltas_keep_old_versions(self):
+        """Test that random patches match apply_patch and never change old versions"""
+        rng = random.Random(2022)
+        for _ in range(300):
+            store = StateStore({"a": [[1], [2, [3]], {"x": [4]}], "b": {"c": [5, 6]}})
+            versions = [(store.current, copy.deepcopy(store.state))]
+            for _ in range(5):
+                operation = random_operation(rng, store.state)
+                try:
+                    expected = apply_patch(copy.deepcopy(store.state), [operation])
+                except JsonPatchError:
+                    continue
+                store.apply_delta([operation])
+                self.assertEqual(store.state, expected, msg=operation)
+                versions.append((store.current, copy.deepcopy(store.state)))
+            for version, snapshot in versions:
+                self.assertEqual(version.state, snapshot)
+
+    def test_non_ascii_digits_are_not_indices(self):
+        """Test that tokens with non-ASCII digits fail as JsonPatchError"""
+        store = StateStore({"list": [[1], [2]]})
+        for operation in (
+            {"op": "add", "path": "/list/\u00b2/0", "value": 1},
+            {"op": "move", "from": "/list/\u0661", "path": "/list/0/-"},
+        ):
+            with self.subTest(operation=operation):
+                with self.assertRaises(JsonPatchError):
+                    store.apply_delta([operation])
+        self.assertEqual(store.state, {"list": [[1], [2]]})
+
+    def test_failed_delta_keeps_version(self):
+        """Test that a failing patch leaves the store unchanged"""
+        store = StateStore(make_state())
+        old = store.current
+        snapshot = copy.deepcopy(old.state)
+        with self.assertRaises(JsonPatchError):
+            store.apply_delta([
+                {"op": "remove", "path": "/documents/0"},
+                {"op": "test", "path": "/settings/theme", "value": "light"},
+            ])
+        self.assertIs(store.current, old)
+        self.assertEqual(old.state, snapshot)
+
+    def test_apply_events(self):
+        """Test applying state events"""
+        store = StateStore()
+        store.apply(StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot={"n": 1}))
+        store.apply(StateDeltaEvent(
+            type=EventType.STATE_DELTA, delta=[{"op": "replace", "path": "/n", "value": 2}]
+        ))
+        self.assertEqual(store.state, {"n": 2})
+
+    def test_messages(self):
+        """Test appending and replacing messages"""
+        store = StateStore()
+        first = store.append_message(UserMessage(id="1", role="user", content="hi"))
+        store.append_message(AssistantMessage(id="2", role="assistant", content="Hel"))
+        last = store.replace_message(AssistantMessage(id="2", role="assistant", content="Hello"))
+        self.assertEqual(len(first.messages), 1)
+        self.assertEqual(last.messages[1].content, "Hello")
+        self.assertIs(last.messages[0], first.messages[0])
+        with self.assertRaises(KeyError):
+            store.replace_message(UserMessage(id="3", role="user", content="?"))
+        self.assertEqual(len(store.set_messages([]).messages), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from ag_ui.core import AssistantMessage, UserMessage
+from ag_ui.server import ThreadCache, ThreadCacheMiss, message_hash
+from tests.helpers import FakeClock
+
+
+def user(message_id, content="hi"):
+    """Creates a user message"""
+    return UserMessage(id=message_id, role="user", content=content)
+
+
+def assistant(message_id, content="hello"):
+    """Creates an assistant message"""
+    return AssistantMessage(id=message_id, role="assistant", content=content)
+
+
+class TestThreadCache(unittest.TestCase):
+    """Test suite for ThreadCache"""
+
+    def test_extend_after_id(self):
+        """Test rebuilding the history from the cached prefix and new messages"""
+        cache = ThreadCache()
+        history = [user("1"), assistant("2")]
+        cache.store("t", history)
+        messages = cache.extend("t", [user("3")], after_id="2")
+        self.assertEqual([message.id for message in messages], ["1", "2", "3"])
+        self.assertIs(messages[0], history[0])
+        self.assertEqual(cache.get("t"), messages)
+
+    def test_extend_drops_later_messages(self):
+        """Test continuing from an earlier message, e.g. after an edit"""
+        cache = ThreadCache()
+        cache.store("t", [user("1"), assistant("2"), user("3"), assistant("4")])
+        messages = cache.extend("t", [user("5")], after_id="2")
+        self.assertEqual([message.id for message in messages], ["1", "2", "5"])
+
+    def test_extend_after_hash(self):
+        """Test referencing the prefix by hash"""
+        cache = ThreadCache()
+        history = [user("1"), assistant("2")]
+        cache.store("t", history)
+        prefix = cache.prefix_hash("t")
+        self.assertEqual(prefix, message_hash(message_hash(None, history[0]), history[1]))
+        messages = cache.extend("t", [user("3")], after_hash=prefix)
+        self.assertEqual([message.id for message in messages], ["1", "2", "3"])
+        self.assertEqual(cache.prefix_hash("t"), message_hash(prefix, messages[2]))
+
+    def test_hash_depends_on_content(self):
+        """Test that a changed message changes all later hashes"""
+        cache = ThreadCache()
+        cache.store("a", [user("1"), assistant("2")])
+        cache.store("b", [user("1", "changed"), assistant("2")])
+        self.assertNotEqual(cache.prefix_hash("a"), cache.prefix_hash("b"))
+        with self.assertRaises(ThreadCacheMiss):
+            cache.extend("a", [], after_hash=cache.prefix_hash("b"))
+
+    def test_misses(self):
+        """Test that unknown threads and messages raise ThreadCacheMiss"""
+        cache = ThreadCache()
+        with self.assertRaises(ThreadCacheMiss):
+            cache.extend("t", [user("1")], after_id="0")
+        cache.store("t", [user("1")])
+        with self.assertRaises(ThreadCacheMiss):
+            cache.extend("t", [user("2")], after_id="0")
+        with self.assertRaises(ValueError):
+            cache.extend("t", [user("2")])
+        self.assertIsNone(cache.get("unknown"))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used thread is dropped"""
+        cache = ThreadCache(max_threads=2)
+        cache.store("a", [user("1")])
+        cache.store("b", [user("1")])
+        cache.get("a")
+        cache.store("c", [user("1")])
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl_eviction(self):
+        """Test that threads expire when they are not used"""
+        clock = FakeClock()
+        cache = ThreadCache(ttl=10, clock=clock)
+        cache.store("a", [user("1")])
+        cache.store("b", [user("1")])
+        clock.now = 8
+        cache.get("a")
+        clock.now = 12
+        self.assertIn("a", cache)
+        self.assertEqual(len(cache), 1)
+        clock.now = 30
+        with self.assertRaises(ThreadCacheMiss):
+            cache.extend("a", [user("2")], after_id="1")
+
+
+if __name__ == "__main__":
+    unittest.main()
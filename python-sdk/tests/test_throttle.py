@@ -0,0 +1,130 @@
+import copy
+import unittest
+from unittest import mock
+
+from ag_ui.core import (
+    CustomEvent,
+    EventType,
+    MessagesSnapshotEvent,
+    RunFinishedEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    UserMessage,
+)
+from ag_ui.state import SnapshotThrottle, apply_patch
+from tests.helpers import FakeClock
+
+
+def snapshot(state):
+    """Creates a StateSnapshotEvent"""
+    return StateSnapshotEvent(type=EventType.STATE_SNAPSHOT, snapshot=state)
+
+
+def delta(*operations):
+    """Creates a StateDeltaEvent"""
+    return StateDeltaEvent(type=EventType.STATE_DELTA, delta=list(operations))
+
+
+def messages(*ids):
+    """Creates a MessagesSnapshotEvent"""
+    return MessagesSnapshotEvent(
+        type=EventType.MESSAGES_SNAPSHOT,
+        messages=[UserMessage(id=message_id, role="user", content="hi") for message_id in ids]
+    )
+
+
+class TestSnapshotThrottle(unittest.TestCase):
+    """Test suite for SnapshotThrottle"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.stage = SnapshotThrottle(max_rate=10, clock=self.clock)
+
+    def test_latest_snapshot_wins(self):
+        """Test that only the newest snapshot of an interval is sent"""
+        self.assertEqual(self.stage.push(snapshot({"n": 0})), [snapshot({"n": 0})])
+        for i in range(1, 5):
+            self.assertEqual(self.stage.push(snapshot({"n": i})), [])
+        self.assertAlmostEqual(self.stage.deadline(), 0.1)
+        self.clock.now = 0.1
+        self.assertEqual(self.stage.poll(), [snapshot({"n": 4})])
+        self.assertIsNone(self.stage.deadline())
+
+    def test_deltas_are_composed(self):
+        """Test that held back deltas are merged into one"""
+        self.stage.push(delta({"op": "add", "path": "/a", "value": 1}))
+        self.stage.push(delta({"op": "replace", "path": "/n", "value": 1}))
+        self.stage.push(delta({"op": "replace", "path": "/n", "value": 2}))
+        self.clock.now = 0.2
+        self.assertEqual(self.stage.poll(), [delta({"op": "replace", "path": "/n", "value": 2})])
+
+    def test_delta_applied_to_snapshot(self):
+        """Test that a delta after a held back snapshot updates the snapshot"""
+        self.stage.push(snapshot({"n": 0}))
+        original = {"n": 1, "items": []}
+        self.stage.push(snapshot(original))
+        self.stage.push(delta({"op": "add", "path": "/items/-", "value": "x"}))
+        self.assertEqual(self.stage.flush(), [snapshot({"n": 1, "items": ["x"]})])
+        self.assertEqual(original, {"n": 1, "items": []})
+
+    def test_snapshot_is_copied_once(self):
+        """Test that deltas are applied in place to one copy of a held back snapshot"""
+        self.stage.push(snapshot({"n": 0}))
+        original = {"n": 1}
+        self.stage.push(snapshot(original))
+        with mock.patch("ag_ui.state.throttle.copy.deepcopy", wraps=copy.deepcopy) as deepcopy:
+            for i in range(10):
+                self.stage.push(delta({"op": "replace", "path": "/n", "value": i}))
+        self.assertEqual(deepcopy.call_count, 1)
+        self.assertEqual(self.stage.flush(), [snapshot({"n": 9})])
+        self.assertEqual(original, {"n": 1})
+
+    def test_invalid_delta_after_applied_delta(self):
+        """Test that a failing delta leaves the held back snapshot unchanged"""
+        self.stage.push(snapshot({"n": 0}))
+        self.stage.push(snapshot({"n": 1}))
+        self.stage.push(delta({"op": "replace", "path": "/n", "value": 2}))
+        bad = delta({"op": "replace", "path": "/n", "value": 3}, {"op": "remove", "path": "/missing"})
+        self.assertEqual(self.stage.push(bad), [snapshot({"n": 2}), bad])
+
+    def test_composed_deltas_remove_existing_member(self):
+        """Test that an add and a remove of an existing member still remove it"""
+        self.stage.push(delta({"op": "replace", "path": "/n", "value": 1}))
+        self.stage.push(delta({"op": "add", "path": "/progress", "value": 0.5}))
+        self.stage.push(delta({"op": "remove", "path": "/progress"}))
+        self.clock.now = 0.2
+        [composed] = self.stage.poll()
+        self.assertEqual(apply_patch({"n": 1, "progress": 0.1}, composed.delta), {"n": 1})
+
+    def test_invalid_delta_is_sent_after_snapshot(self):
+        """Test that a delta that does not apply is passed on in order"""
+        self.stage.push(snapshot({"n": 0}))
+        self.stage.push(snapshot({"n": 1}))
+        bad = delta({"op": "remove", "path": "/missing"})
+        self.assertEqual(self.stage.push(bad), [snapshot({"n": 1}), bad])
+
+    def test_kinds_are_limited_separately(self):
+        """Test that state and messages have their own intervals"""
+        self.assertEqual(self.stage.push(snapshot({"n": 0})), [snapshot({"n": 0})])
+        self.assertEqual(self.stage.push(messages("1")), [messages("1")])
+        self.assertEqual(self.stage.push(messages("1", "2")), [])
+        custom = CustomEvent(type=EventType.CUSTOM, name="x", value=1)
+        self.assertEqual(self.stage.push(custom), [custom])
+
+    def test_flush_before_run_finished(self):
+        """Test that held back updates are sent before the run ends"""
+        self.stage.push(snapshot({"n": 0}))
+        self.stage.push(messages("1"))
+        self.stage.push(messages("1", "2"))
+        self.stage.push(snapshot({"n": 1}))
+        finished = RunFinishedEvent(type=EventType.RUN_FINISHED, thread_id="t", run_id="r")
+        self.assertEqual(self.stage.push(finished), [messages("1", "2"), snapshot({"n": 1}), finished])
+
+    def test_invalid_rate(self):
+        """Test that the rate must be positive"""
+        with self.assertRaises(ValueError):
+            SnapshotThrottle(max_rate=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+from unittest import mock
+
+from ag_ui.core import EventType, Tool, ToolCallArgsEvent, ToolCallEndEvent, ToolCallStartEvent
+from ag_ui.server import (
+    ToolArgumentsError,
+    ToolCallValidator,
+    compile_schema,
+    validate_tool_arguments,
+)
+
+WEATHER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "city": {"type": "string", "minLength": 1},
+        "days": {"type": "integer", "minimum": 1, "maximum": 7},
+        "unit": {"enum": ["C", "F"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "uniqueItems": True},
+    },
+    "required": ["city"],
+    "additionalProperties": False,
+}
+
+
+def tool_call(tool_call_id, name, deltas):
+    """Creates the events of a streamed tool call"""
+    return [
+        ToolCallStartEvent(type=EventType.TOOL_CALL_START, tool_call_id=tool_call_id, tool_call_name=name),
+        *[
+            ToolCallArgsEvent(type=EventType.TOOL_CALL_ARGS, tool_call_id=tool_call_id, delta=delta)
+            for delta in deltas
+        ],
+        ToolCallEndEvent(type=EventType.TOOL_CALL_END, tool_call_id=tool_call_id),
+    ]
+
+
+class TestSchemaValidator(unittest.TestCase):
+    """Test suite for compiled JSON Schemas"""
+
+    def test_valid_and_invalid_values(self):
+        """Test common keywords"""
+        validator = compile_schema(WEATHER_SCHEMA)
+        self.assertTrue(validator.is_valid({"city": "Oslo", "days": 3.0, "unit": "C", "tags": ["a", "b"]}))
+        cases = {
+            "/: expected object": [],
+            "/: missing required property 'city'": {},
+            "/city: expected string": {"city": 1},
+            "/days: must be at most 7": {"city": "x", "days": 8},
+            "/days: expected integer": {"city": "x", "days": True},
+            '/unit: must be one of ["C", "F"]': {"city": "x", "unit": "K"},
+            "/tags: items must be unique": {"city": "x", "tags": ["a", "a"]},
+            "/tags/1: expected string": {"city": "x", "tags": ["a", 2]},
+            "/extra: not allowed": {"city": "x", "extra": 1},
+        }
+        for message, value in cases.items():
+            with self.subTest(message=message):
+                self.assertEqual(validator.errors(value), [message])
+
+    def test_combinators_and_refs(self):
+        """Test anyOf, oneOf, not and recursive local references"""
+        validator = compile_schema({
+            "$defs": {
+                "node": {
+                    "type": "object",
+                    "properties": {"children": {"type": "array", "items": {"$ref": "#/$defs/node"}}},
+                    "required": ["name"],
+                },
+            },
+            "properties": {
+                "tree": {"$ref": "#/$defs/node"},
+                "id": {"anyOf": [{"type": "string"}, {"type": "integer"}]},
+                "size": {"oneOf": [{"multipleOf": 2}, {"multipleOf": 3}]},
+                "name": {"not": {"const": "root"}},
+            },
+        })
+        self.assertTrue(validator.is_valid({"tree": {"name": "a", "children": [{"name": "b"}]}, "id": 1, "size": 4}))
+        self.assertEqual(
+            validator.errors({"tree": {"name": "a", "children": [{}]}}),
+            ["/tree/children/0: missing required property 'name'"]
+        )
+        self.assertEqual(len(validator.errors({"id": 1.5})), 1)
+        self.assertEqual(len(validator.errors({"size": 6})), 1)
+        self.assertEqual(len(validator.errors({"name": "root"})), 1)
+
+    def test_cached_by_hash(self):
+        """Test that equal schemas share a compiled validator"""
+        first = compile_schema({"type": "object", "required": ["a"]})
+        second = compile_schema({"required": ["a"], "type": "object"})
+        self.assertIs(first, second)
+
+    def test_invalid_schema(self):
+        """Test that unsupported schemas are rejected when compiled"""
+        for schema in ({"type": "thing"}, {"$ref": "http://example.com/schema"}, 1):
+            with self.assertRaises(ValueError):
+                compile_schema(schema)
+
+
+class TestToolCallValidator(unittest.TestCase):
+    """Test suite for ToolCallValidator"""
+
+    def setUp(self):
+        self.tools = [Tool(name="weather", description="Get the weather", parameters=WEATHER_SCHEMA)]
+
+    def test_valid_call(self):
+        """Test that events pass through and arguments are parsed at the end"""
+        events = tool_call("c1", "weather", ['{"ci', 'ty": "Os', 'lo", "days": 2}'])
+        stage = ToolCallValidator(self.tools)
+        self.assertEqual(list(stage.process(events)), events)
+        self.assertEqual(stage.arguments, {"city": "Oslo", "days": 2})
+
+    def test_invalid_call(self):
+        """Test that invalid arguments raise when the call ends"""
+        events = tool_call("c1", "weather", ['{"days": ', "9}"])
+        stage = ToolCallValidator(self.tools)
+        for event in events[:-1]:
+            self.assertEqual(stage.push(event), [event])
+        with self.assertRaises(ToolArgumentsError) as context:
+            stage.push(events[-1])
+        self.assertEqual(context.exception.tool_name, "weather")
+        self.assertEqual(len(context.exception.errors), 2)
+
+    def test_schemas_are_compiled_once(self):
+        """Test that tool calls do not look up the schema cache"""
+        stage = ToolCallValidator(self.tools)
+        with mock.patch("ag_ui.server.tools.compile_schema") as compile_schema:
+            for index in range(3):
+                list(stage.process(tool_call(f"c{index}", "weather", ['{"city": "Oslo"}'])))
+        compile_schema.assert_not_called()
+        self.assertEqual(stage.arguments, {"city": "Oslo"})
+
+    def test_unknown_tools_are_not_validated(self):
+        """Test that calls of tools without a schema pass"""
+        events = tool_call("c1", "other", ["not json"])
+        self.assertEqual(list(ToolCallValidator(self.tools).process(events)), events)
+
+    def test_invalid_json(self):
+        """Test that malformed JSON arguments are reported"""
+        with self.assertRaises(ToolArgumentsError):
+            validate_tool_arguments(self.tools[0], '{"city":')
+
+
+if __name__ == "__main__":
+    unittest.main()